@@ -0,0 +1,104 @@
+use crate::core::game::{state::InProgress, Board, GameplayError, TurnResult};
+
+/// N independent games stepped in lockstep. Finished games restart from the
+/// empty board, so every slot always holds a game in progress.
+#[derive(Debug, Clone)]
+pub struct BoardBatch<const R: usize, const C: usize> {
+    boards: Vec<Board<R, C, InProgress>>,
+}
+
+impl<const R: usize, const C: usize> BoardBatch<R, C> {
+    pub fn new(n: usize) -> Self {
+        Self {
+            boards: vec![Board::default(); n],
+        }
+    }
+
+    #[inline]
+    pub fn len(&self) -> usize {
+        self.boards.len()
+    }
+
+    #[inline]
+    pub fn boards(&self) -> &[Board<R, C, InProgress>] {
+        &self.boards
+    }
+
+    pub fn reset(&mut self) {
+        self.boards.fill(Board::default());
+    }
+
+    /// Check every action before any game is touched, so a bad action leaves
+    /// the whole batch unchanged. Errors carry the offending game's index.
+    pub fn validate(&self, actions: &[i64]) -> Result<(), (usize, GameplayError)> {
+        for (idx, (board, &action)) in self.boards.iter().zip(actions).enumerate() {
+            if action < 0 || action as usize >= C {
+                return Err((idx, GameplayError::ColumnOutOfBounds));
+            }
+            if board.get_column_height(action as usize) >= R {
+                return Err((idx, GameplayError::ColumnFull));
+            }
+        }
+        Ok(())
+    }
+
+    /// Play `actions[i]` in game `i`. The mover's reward is 1 for a win and 0
+    /// otherwise; games that end are flagged in `dones` and reset.
+    pub fn step(
+        &mut self,
+        actions: &[i64],
+        rewards: &mut [f32],
+        dones: &mut [bool],
+    ) -> Result<(), (usize, GameplayError)> {
+        self.validate(actions)?;
+
+        let slots = self.boards.iter_mut().zip(rewards).zip(dones);
+        for (idx, ((board, reward), done)) in slots.enumerate() {
+            let result = board
+                .make_move(actions[idx] as usize)
+                .map_err(|e| (idx, e))?;
+
+            (*reward, *done) = match result {
+                TurnResult::InProgress(next) => {
+                    *board = next;
+                    (0.0, false)
+                }
+                TurnResult::Victory(_) => {
+                    *board = Board::default();
+                    (1.0, true)
+                }
+                TurnResult::Draw(_) => {
+                    *board = Board::default();
+                    (0.0, true)
+                }
+            };
+        }
+        Ok(())
+    }
+
+    /// Fill `obs` (`[n, C, R]`, row-major) from the perspective of the player
+    /// to move: 1 for their pieces, -1 for the opponent's, 0 for empty.
+    pub fn write_observations(&self, obs: &mut [i8]) {
+        for (board, block) in self.boards.iter().zip(obs.chunks_exact_mut(C * R)) {
+            let player = board.player();
+            for (column, cells) in board.cell_states().iter().zip(block.chunks_exact_mut(R)) {
+                for (cell, out) in column.iter().zip(cells) {
+                    *out = match cell {
+                        None => 0,
+                        Some(owner) if *owner == player => 1,
+                        Some(_) => -1,
+                    };
+                }
+            }
+        }
+    }
+
+    /// Fill `mask` (`[n, C]`, row-major) with the legal columns of each game.
+    pub fn write_legal_mask(&self, mask: &mut [bool]) {
+        for (board, row) in self.boards.iter().zip(mask.chunks_exact_mut(C)) {
+            for (height, legal) in board.column_heights().iter().zip(row) {
+                *legal = *height < R;
+            }
+        }
+    }
+}
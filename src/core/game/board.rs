@@ -41,6 +41,35 @@ impl<const R: usize, const C: usize, S: GameState> Board<R, C, S> {
     pub const fn hash(&self) -> u64 {
         self.hash
     }
+
+    #[inline]
+    pub fn num_moves(&self) -> usize {
+        self.column_heights.iter().sum()
+    }
+
+    /// Bitboard of `player`'s pieces, bit `col * (R + 1) + row`. The spare
+    /// bit above each column keeps shifted lines from wrapping into the next
+    /// column. Needs `(R + 1) * C <= 64`.
+    pub fn player_mask(&self, player: CellState) -> u64 {
+        let mut mask = 0;
+        for (col_idx, column) in self.cell_states.iter().enumerate() {
+            for (row_idx, cell) in column[..self.column_heights[col_idx]].iter().enumerate() {
+                if *cell == Some(player) {
+                    mask |= 1 << (col_idx * (R + 1) + row_idx);
+                }
+            }
+        }
+        mask
+    }
+
+    /// Bitboard of every piece, laid out like `player_mask`.
+    pub fn occupied_mask(&self) -> u64 {
+        let mut mask = 0;
+        for (col_idx, &height) in self.column_heights.iter().enumerate() {
+            mask |= ((1 << height) - 1) << (col_idx * (R + 1));
+        }
+        mask
+    }
 }
 
 impl<const R: usize, const C: usize> Board<R, C, Victory> {
@@ -84,7 +113,18 @@ impl<const R: usize, const C: usize> Board<R, C, InProgress> {
         let mut new_column_heights = self.column_heights.clone();
         new_column_heights[col_idx] += 1;
 
-        let hash = compute_board_hash(&new_cell_states, &new_column_heights);
+        // Placing a piece at height h raises the column's `bits + 2^h - 1`
+        // hash by 2^h, plus the piece's own bit 2^h if it is Red
+        let piece_value: u64 = match current_player {
+            CellState::Red => 2,
+            CellState::Yellow => 1,
+        };
+        let hash = self.hash
+            + (piece_value << current_col_height) * RadixWeights::<R, C>::WEIGHTS[C - col_idx - 1];
+        debug_assert_eq!(
+            hash,
+            compute_board_hash(&new_cell_states, &new_column_heights)
+        );
 
         // victory
         let row_idx = current_col_height;
@@ -123,7 +163,26 @@ impl<const R: usize, const C: usize> Board<R, C, InProgress> {
         Ok(TurnResult::InProgress(in_progress_board))
     }
 
-    const fn check_win(
+    /// Count the move sequences of length `depth` from this position (perft).
+    /// Sequences stop at a finished game, so a win or draw only counts on the
+    /// last ply.
+    pub fn perft(&self, depth: u32) -> u64 {
+        if depth == 0 {
+            return 1;
+        }
+
+        let mut nodes = 0;
+        for col_idx in 0..C {
+            match self.make_move(col_idx) {
+                Ok(TurnResult::InProgress(board)) => nodes += board.perft(depth - 1),
+                Ok(_) => nodes += u64::from(depth == 1),
+                Err(_) => {}
+            }
+        }
+        nodes
+    }
+
+    pub(super) const fn check_win(
         &self,
         cell_states: &[[Option<CellState>; R]; C],
         row_idx: usize,
@@ -269,11 +328,18 @@ const fn make_radix_weights<const R: usize, const C: usize>() -> [u64; C] {
     powers
 }
 
-const fn compute_board_hash<const R: usize, const C: usize>(
+struct RadixWeights<const R: usize, const C: usize>;
+
+impl<const R: usize, const C: usize> RadixWeights<R, C> {
+    // evaluated once per board size at compile time
+    const WEIGHTS: [u64; C] = make_radix_weights::<R, C>();
+}
+
+pub(super) const fn compute_board_hash<const R: usize, const C: usize>(
     cell_states: &[[Option<CellState>; R]; C],
     column_heights: &[usize; C],
 ) -> u64 {
-    let radix_weights: [u64; C] = make_radix_weights::<R, C>();
+    let radix_weights: [u64; C] = RadixWeights::<R, C>::WEIGHTS;
 
     let mut hash = 0u64;
     let mut col_idx = 0;
@@ -0,0 +1,102 @@
+use crate::core::game::CellState;
+
+/// Columns of `window_features`, all from the perspective of the player to
+/// move: windows of four holding four, three and two of their pieces and
+/// nothing of the opponent's, the same three counts for the opponent, and
+/// their center-column pieces minus the opponent's.
+pub const NUM_FEATURES: usize = 7;
+
+/// Rebuild the cells and column heights of the board with hash `hash`.
+/// Returns `None` if `hash` is not the hash of a board with a legal piece
+/// count.
+pub fn decode_hash<const R: usize, const C: usize>(
+    hash: u64,
+) -> Option<([[Option<CellState>; R]; C], [usize; C])> {
+    // the hash is a mixed-radix number with one `bits + 2^h - 1` digit per
+    // column, in base 2^(R+1)-1 and with the last column least significant
+    let base = (1u64 << (R + 1)) - 1;
+    let mut rest = hash;
+    let mut cell_states = [[None; R]; C];
+    let mut column_heights = [0; C];
+    let (mut reds, mut yellows) = (0, 0);
+
+    for col_idx in (0..C).rev() {
+        let digit = rest % base;
+        rest /= base;
+
+        // 2^h - 1 <= digit < 2^(h+1) - 1, with the pieces in the low h bits
+        let height = (u64::BITS - 1 - (digit + 1).leading_zeros()) as usize;
+        let bits = digit + 1 - (1 << height);
+        for row_idx in 0..height {
+            cell_states[col_idx][row_idx] = if (bits >> row_idx) & 1 == 1 {
+                reds += 1;
+                Some(CellState::Red)
+            } else {
+                yellows += 1;
+                Some(CellState::Yellow)
+            };
+        }
+        column_heights[col_idx] = height;
+    }
+
+    // Red moves first, so it has as many pieces as Yellow or one more
+    if rest != 0 || !(reds == yellows || reds == yellows + 1) {
+        return None;
+    }
+    Some((cell_states, column_heights))
+}
+
+/// Count the evaluation features of the board with hash `hash` (see
+/// `NUM_FEATURES`). Returns `None` if `hash` is not a board.
+pub fn window_features<const R: usize, const C: usize>(hash: u64) -> Option<[i32; NUM_FEATURES]> {
+    let (cell_states, column_heights) = decode_hash::<R, C>(hash)?;
+    let pieces: usize = column_heights.iter().sum();
+    let player = if pieces % 2 == 0 {
+        CellState::Red
+    } else {
+        CellState::Yellow
+    };
+
+    let mut features = [0; NUM_FEATURES];
+
+    // horizontal, vertical and both diagonals
+    for (dc, dr) in [(1isize, 0isize), (0, 1), (1, 1), (1, -1)] {
+        for col_idx in 0..C as isize {
+            for row_idx in 0..R as isize {
+                let (end_col, end_row) = (col_idx + 3 * dc, row_idx + 3 * dr);
+                if end_col >= C as isize || end_row < 0 || end_row >= R as isize {
+                    continue;
+                }
+
+                let (mut own, mut opponent) = (0, 0);
+                for i in 0..4 {
+                    match cell_states[(col_idx + i * dc) as usize][(row_idx + i * dr) as usize] {
+                        Some(owner) if owner == player => own += 1,
+                        Some(_) => opponent += 1,
+                        None => {}
+                    }
+                }
+
+                match (own, opponent) {
+                    (4, 0) => features[0] += 1,
+                    (3, 0) => features[1] += 1,
+                    (2, 0) => features[2] += 1,
+                    (0, 4) => features[3] += 1,
+                    (0, 3) => features[4] += 1,
+                    (0, 2) => features[5] += 1,
+                    _ => {}
+                }
+            }
+        }
+    }
+
+    for cell in &cell_states[C / 2] {
+        match cell {
+            Some(owner) if *owner == player => features[6] += 1,
+            Some(_) => features[6] -= 1,
+            None => {}
+        }
+    }
+
+    Some(features)
+}
@@ -2,12 +2,24 @@ mod board;
 #[allow(unused_imports)]
 pub use board::{Board, TurnResult};
 
+mod batch;
+#[allow(unused_imports)]
+pub use batch::BoardBatch;
+
 mod cell;
 pub use cell::CellState;
 
 mod error;
 pub use error::GameplayError;
 
+mod features;
+#[allow(unused_imports)]
+pub use features::{decode_hash, window_features, NUM_FEATURES};
+
+mod playout;
+#[allow(unused_imports)]
+pub use playout::{PlayoutStats, SplitMix64};
+
 pub mod state;
 
 #[cfg(test)]
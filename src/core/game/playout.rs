@@ -0,0 +1,137 @@
+use std::ops::AddAssign;
+
+use crate::core::game::{state::InProgress, Board, CellState};
+
+// splitmix64: tiny state, fast, and plenty random for picking playout moves
+#[derive(Debug, Clone)]
+pub struct SplitMix64 {
+    state: u64,
+}
+
+impl SplitMix64 {
+    #[inline]
+    pub const fn new(seed: u64) -> Self {
+        Self { state: seed }
+    }
+
+    #[inline]
+    pub fn next_u64(&mut self) -> u64 {
+        self.state = self.state.wrapping_add(0x9E37_79B9_7F4A_7C15);
+        let mut z = self.state;
+        z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+        z ^ (z >> 31)
+    }
+
+    // uniform in 0..n without a modulo (Lemire's multiply-shift)
+    #[inline]
+    pub fn below(&mut self, n: usize) -> usize {
+        ((self.next_u64() as u128 * n as u128) >> 64) as usize
+    }
+}
+
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct PlayoutStats {
+    pub red_wins: u64,
+    pub yellow_wins: u64,
+    pub draws: u64,
+}
+
+impl PlayoutStats {
+    #[inline]
+    pub fn record(&mut self, winner: Option<CellState>) {
+        match winner {
+            Some(CellState::Red) => self.red_wins += 1,
+            Some(CellState::Yellow) => self.yellow_wins += 1,
+            None => self.draws += 1,
+        }
+    }
+}
+
+impl AddAssign for PlayoutStats {
+    #[inline]
+    fn add_assign(&mut self, rhs: Self) {
+        self.red_wins += rhs.red_wins;
+        self.yellow_wins += rhs.yellow_wins;
+        self.draws += rhs.draws;
+    }
+}
+
+impl<const R: usize, const C: usize> Board<R, C, InProgress> {
+    /// Play uniformly random moves until the game ends. Returns the winner,
+    /// or None for a draw.
+    ///
+    /// Works on a stack copy of the cells instead of going through
+    /// `make_move`, so no boards are built and no hashes are computed.
+    pub fn random_playout(&self, rng: &mut SplitMix64) -> Option<CellState> {
+        let mut cell_states = *self.cell_states();
+        let mut column_heights = *self.column_heights();
+        let mut player = self.player();
+        let mut valid_moves = [0usize; C];
+
+        loop {
+            let mut num_valid = 0;
+            let mut col_idx = 0;
+            while col_idx < C {
+                if column_heights[col_idx] < R {
+                    valid_moves[num_valid] = col_idx;
+                    num_valid += 1;
+                }
+                col_idx += 1;
+            }
+
+            if num_valid == 0 {
+                return None;
+            }
+
+            let col_idx = valid_moves[rng.below(num_valid)];
+            let row_idx = column_heights[col_idx];
+            cell_states[col_idx][row_idx] = Some(player);
+            column_heights[col_idx] += 1;
+
+            if self.check_win(&cell_states, row_idx, col_idx, player) {
+                return Some(player);
+            }
+
+            player = player.other();
+        }
+    }
+
+    pub fn random_playouts(&self, n: u64, seed: u64) -> PlayoutStats {
+        let mut rng = SplitMix64::new(seed);
+        let mut stats = PlayoutStats::default();
+
+        for _ in 0..n {
+            stats.record(self.random_playout(&mut rng));
+        }
+
+        stats
+    }
+
+    /// Split `n` playouts across `threads` scoped threads. Each thread gets
+    /// its own seed derived from `seed`, so results are reproducible for a
+    /// given `(n, seed, threads)`.
+    pub fn random_playouts_parallel(&self, n: u64, seed: u64, threads: usize) -> PlayoutStats {
+        let threads = threads.max(1) as u64;
+        if threads == 1 || n < threads {
+            return self.random_playouts(n, seed);
+        }
+
+        let mut seeds = SplitMix64::new(seed);
+        std::thread::scope(|s| {
+            let handles: Vec<_> = (0..threads)
+                .map(|thread_idx| {
+                    let count = n / threads + u64::from(thread_idx < n % threads);
+                    let thread_seed = seeds.next_u64();
+                    s.spawn(move || self.random_playouts(count, thread_seed))
+                })
+                .collect();
+
+            let mut stats = PlayoutStats::default();
+            for handle in handles {
+                stats += handle.join().expect("playout thread panicked");
+            }
+            stats
+        })
+    }
+}
@@ -1,6 +1,11 @@
 use std::collections::HashSet;
 
-use crate::core::game::{board::compute_column_hash, CellState};
+use crate::core::game::{
+    board::{compute_board_hash, compute_column_hash},
+    decode_hash,
+    state::InProgress,
+    window_features, Board, BoardBatch, CellState, SplitMix64, TurnResult,
+};
 
 #[test]
 fn ensure_perfect_column_hashing() {
@@ -50,3 +55,197 @@ fn ensure_perfect_column_hashing() {
         seen.len()
     );
 }
+
+#[test]
+fn random_playouts_are_reproducible() {
+    let board = Board::<6, 7, InProgress>::default();
+
+    let stats = board.random_playouts(1000, 42);
+    assert_eq!(stats.red_wins + stats.yellow_wins + stats.draws, 1000);
+    assert_eq!(stats, board.random_playouts(1000, 42));
+    assert_ne!(stats, board.random_playouts(1000, 43));
+
+    let parallel = board.random_playouts_parallel(1001, 42, 4);
+    assert_eq!(
+        parallel.red_wins + parallel.yellow_wins + parallel.draws,
+        1001
+    );
+    assert_eq!(parallel, board.random_playouts_parallel(1001, 42, 4));
+}
+
+#[test]
+fn random_playouts_reach_both_results() {
+    // Red owns cols 0-2 on the bottom row and Yellow owns them on row 1, so
+    // both players are one move from a win and random play must produce
+    // wins for each side
+    let mut board = Board::<6, 7, InProgress>::default();
+    for col in [0, 0, 1, 1, 2, 2] {
+        board = match board.make_move(col).unwrap() {
+            TurnResult::InProgress(b) => b,
+            _ => panic!("game ended early"),
+        };
+    }
+
+    let stats = board.random_playouts(2000, 7);
+    assert!(stats.red_wins > 0);
+    assert!(stats.yellow_wins > 0);
+}
+
+#[test]
+fn board_batch_steps_and_resets() {
+    const R: usize = 6;
+    const C: usize = 7;
+
+    let mut batch = BoardBatch::<R, C>::new(2);
+    let mut rewards = [0.0f32; 2];
+    let mut dones = [false; 2];
+
+    // game 0: Red wins vertically in column 0, game 1 shuffles along
+    let moves = [[0, 0], [1, 1], [0, 2], [1, 3], [0, 4], [1, 5]];
+    for actions in moves {
+        batch.step(&actions, &mut rewards, &mut dones).unwrap();
+        assert!(!dones[0] && !dones[1]);
+    }
+    batch.step(&[0, 6], &mut rewards, &mut dones).unwrap();
+    assert_eq!(rewards, [1.0, 0.0]);
+    assert_eq!(dones, [true, false]);
+
+    // the finished game restarted, the other kept its 7 pieces
+    assert_eq!(batch.boards()[0].hash(), 0);
+    assert_eq!(batch.boards()[1].column_heights().iter().sum::<usize>(), 7);
+
+    // observations are relative to the player to move (Yellow in game 1)
+    let mut obs = [0i8; 2 * C * R];
+    batch.write_observations(&mut obs);
+    assert!(obs[..C * R].iter().all(|&v| v == 0));
+    assert_eq!(obs[C * R], -1);
+    assert_eq!(obs[C * R + R], 1);
+
+    // illegal actions are rejected without touching any game
+    let before = batch.boards()[1].hash();
+    assert!(batch.step(&[0, 7], &mut rewards, &mut dones).is_err());
+    assert_eq!(batch.boards()[1].hash(), before);
+
+    let mut mask = [false; 2 * C];
+    batch.write_legal_mask(&mut mask);
+    assert!(mask.iter().all(|&legal| legal));
+}
+
+#[test]
+fn perft_counts_move_sequences() {
+    let board = Board::<6, 7, InProgress>::default();
+
+    // no game can end before the 7th ply, so every sequence is legal
+    for depth in 0..=5 {
+        assert_eq!(board.perft(depth), 7u64.pow(depth));
+    }
+
+    // a full column drops out of the count
+    let mut board = board;
+    for _ in 0..6 {
+        match board.make_move(0).unwrap() {
+            TurnResult::InProgress(next) => board = next,
+            _ => unreachable!(),
+        }
+    }
+    assert_eq!(board.perft(1), 6);
+}
+
+#[test]
+fn incremental_hash_matches_full_recompute() {
+    const R: usize = 6;
+    const C: usize = 7;
+
+    let mut rng = SplitMix64::new(2024);
+    for _ in 0..500 {
+        let mut board = Board::<R, C, InProgress>::default();
+        loop {
+            let moves = board.get_valid_moves();
+            let col = moves[rng.below(moves.len())];
+
+            // every result kind must carry the same hash as a full rebuild
+            let (hash, cells, heights, next) = match board.make_move(col).unwrap() {
+                TurnResult::InProgress(b) => {
+                    (b.hash(), *b.cell_states(), *b.column_heights(), Some(b))
+                }
+                TurnResult::Victory(b) => (b.hash(), *b.cell_states(), *b.column_heights(), None),
+                TurnResult::Draw(b) => (b.hash(), *b.cell_states(), *b.column_heights(), None),
+            };
+            assert_eq!(hash, compute_board_hash::<R, C>(&cells, &heights));
+
+            match next {
+                Some(b) => board = b,
+                None => break,
+            }
+        }
+    }
+}
+
+#[test]
+fn bitboards_match_cells() {
+    let mut board = Board::<6, 7, InProgress>::default();
+    for col in [3, 3, 4] {
+        board = match board.make_move(col).unwrap() {
+            TurnResult::InProgress(b) => b,
+            _ => unreachable!(),
+        };
+    }
+
+    // bit col * 7 + row, Red on (3, 0) and (4, 0), Yellow on (3, 1)
+    let red = board.player_mask(CellState::Red);
+    let yellow = board.player_mask(CellState::Yellow);
+    assert_eq!(red, (1 << 21) | (1 << 28));
+    assert_eq!(yellow, 1 << 22);
+    assert_eq!(board.occupied_mask(), red | yellow);
+    assert_eq!(board.num_moves(), 3);
+}
+
+#[test]
+fn decode_hash_rebuilds_boards() {
+    const R: usize = 6;
+    const C: usize = 7;
+
+    let mut rng = SplitMix64::new(11);
+    for _ in 0..200 {
+        let mut board = Board::<R, C, InProgress>::default();
+        loop {
+            let (cells, heights) = decode_hash::<R, C>(board.hash()).unwrap();
+            assert_eq!(&cells, board.cell_states());
+            assert_eq!(&heights, board.column_heights());
+
+            let moves = board.get_valid_moves();
+            match board.make_move(moves[rng.below(moves.len())]).unwrap() {
+                TurnResult::InProgress(b) => board = b,
+                _ => break,
+            }
+        }
+    }
+
+    // a column digit of the base itself, and two Red pieces with no Yellow
+    assert!(decode_hash::<R, C>(127).is_none());
+    assert!(decode_hash::<R, C>(3 + 3 * 127).is_none());
+}
+
+#[test]
+fn window_features_count_from_the_player_to_move() {
+    const R: usize = 6;
+    const C: usize = 7;
+
+    assert_eq!(window_features::<R, C>(0), Some([0; 7]));
+
+    // Red on 2, 3, 4 of the bottom row, Yellow stacked on 2 and 3; Yellow
+    // to move
+    let mut board = Board::<R, C, InProgress>::default();
+    for col in [2, 2, 3, 3, 4] {
+        board = match board.make_move(col).unwrap() {
+            TurnResult::InProgress(b) => b,
+            _ => unreachable!(),
+        };
+    }
+    let features = window_features::<R, C>(board.hash()).unwrap();
+
+    // Yellow twos: row 1 windows from columns 0, 1 and 2. Red threes: bottom
+    // row windows from columns 1 and 2. Red twos: from columns 0 and 3. The
+    // center column holds one piece each.
+    assert_eq!(features, [0, 0, 3, 0, 2, 2, 0]);
+}
@@ -6,9 +6,13 @@ mod wrapper;
 
 use pyo3::prelude::*;
 
-#[pymodule]
+// Every pyclass is either immutable (ConnectFourBoard, CellState) or guarded by
+// pyo3's borrow checking (BoardBatch), so the module is safe without the GIL.
+#[pymodule(gil_used = false)]
 fn _core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<wrapper::ConnectFourBoard>()?;
     m.add_class::<wrapper::PyCellState>()?;
+    m.add_class::<wrapper::BoardBatch>()?;
+    m.add_function(wrap_pyfunction!(wrapper::window_features, m)?)?;
     Ok(())
 }
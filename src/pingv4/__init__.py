@@ -1,10 +1,17 @@
-from pingv4._core import ConnectFourBoard, CellState
-from pingv4.bot import AbstractBot, RandomBot, MinimaxBot
-from pingv4.game import Connect4Game, ManualPlayer, GameConfig, PlayerConfig
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from pingv4._core import BoardBatch, ConnectFourBoard, CellState
+
+if TYPE_CHECKING:
+    from pingv4.bot import AbstractBot, RandomBot, MinimaxBot, MCTSBot, PNSBot
+    from pingv4.cli import main
+    from pingv4.game import Connect4Game, ManualPlayer, GameConfig, PlayerConfig
 
 __all__ = [
     "ConnectFourBoard",
     "CellState",
+    "BoardBatch",
     "AbstractBot",
     "Connect4Game",
     "GameConfig",
@@ -12,4 +19,36 @@ __all__ = [
     "ManualPlayer",
     "RandomBot",
     "MinimaxBot",
+    "MCTSBot",
+    "PNSBot",
+    "main",
 ]
+
+# Everything but the native board is imported on first access, so headless
+# workers that only need ConnectFourBoard never load pygame or pydantic.
+_LAZY_ATTRS: Dict[str, str] = {
+    "AbstractBot": "pingv4.bot.base",
+    "RandomBot": "pingv4.bot.base",
+    "MinimaxBot": "pingv4.bot.minimax",
+    "MCTSBot": "pingv4.bot.mcts",
+    "PNSBot": "pingv4.bot.pns",
+    "Connect4Game": "pingv4.game",
+    "GameConfig": "pingv4.game",
+    "PlayerConfig": "pingv4.game",
+    "ManualPlayer": "pingv4.game",
+    "main": "pingv4.cli",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
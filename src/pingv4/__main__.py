@@ -0,0 +1,3 @@
+from pingv4.cli import main
+
+raise SystemExit(main())
@@ -1,20 +1,35 @@
-from typing import List, Tuple, Optional
-from enum import IntEnum
+from typing import ClassVar, List, Tuple, Optional
 
-class CellState(IntEnum):
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+class CellState:
     """
     Enumeration representing the state of a cell on a Connect Four board.
 
     Each value corresponds to the player occupying a cell.
 
+    This is a native enum, not an ``enum.IntEnum``: members compare equal to
+    their integer values, convert with ``int()`` and can key dicts, but
+    there is no ``.name``, ``.value`` or iteration over the members.
+
     :cvar Yellow: Indicates a cell occupied by the yellow player.
     :cvar Red: Indicates a cell occupied by the red player.
     """
 
-    Yellow = 0
-    Red = 1
+    Yellow: ClassVar[CellState]
+    Red: ClassVar[CellState]
+
+    def __int__(self) -> int: ...
+    def __eq__(self, other: object) -> bool: ...
+    def __hash__(self) -> int: ...
 
 class ConnectFourBoard:
+    """
+    An immutable Connect Four position. Boards are safe to share between
+    threads, including on free-threaded Python builds.
+    """
+
     def __init__(self) -> None:
         """
         Initializes an empty Connect Four Board.
@@ -51,15 +66,24 @@ class ConnectFourBoard:
         ...
 
     @property
-    def column_heights(self) -> List[int]:
+    def column_heights(self) -> Tuple[int, ...]:
         """
         Return the current heights of all columns.
 
         Each element represents the number of pieces currently placed
-        in the corresponding column.
+        in the corresponding column. The tuple is built once per board and
+        the same object is returned on every access.
 
-        :return: A list of column heights indexed by column.
-        :rtype: List[int]
+        :return: A tuple of column heights indexed by column.
+        :rtype: Tuple[int, ...]
+        """
+        ...
+
+    @property
+    def num_moves(self) -> int:
+        """
+        :return: The number of pieces on the board.
+        :rtype: int
         """
         ...
 
@@ -114,17 +138,71 @@ class ConnectFourBoard:
         ...
 
     @property
-    def cell_states(self) -> List[List[Optional[CellState]]]:
+    def cell_states(self) -> Tuple[Tuple[Optional[CellState], ...], ...]:
         """
         Return the state of all cells on the board.
 
+        The tuples are built once per board and the same object is returned
+        on every access, so reading it once per evaluation is cheap.
+
         .. warning::
             Cell states are stored in **column-major** order. Access as
             ``cell_states[col_idx][row_idx]`` where ``col_idx`` is the column
             index (0-6) and ``row_idx`` is the row index (0-5, bottom to top).
 
-        :return: A nested list of cell states indexed by [column][row].
-        :rtype: List[List[Optional[CellState]]]
+        :return: Nested tuples of cell states indexed by [column][row].
+        :rtype: Tuple[Tuple[Optional[CellState], ...], ...]
+        """
+        ...
+
+    def column(self, col_idx: int) -> bytes:
+        """
+        Return one column as one byte per cell, bottom to top: 0 for empty,
+        1 for Red and 2 for Yellow.
+
+        :param col_idx: The zero-indexed column.
+        :type col_idx: int
+        :return: ``num_rows`` bytes.
+        :rtype: bytes
+        :raises IndexError: If the column index is out of range.
+        """
+        ...
+
+    def row(self, row_idx: int) -> bytes:
+        """
+        Return one row as one byte per cell, left to right, coded like
+        ``column``.
+
+        :param row_idx: The zero-indexed row (0 is the bottom).
+        :type row_idx: int
+        :return: ``num_cols`` bytes.
+        :rtype: bytes
+        :raises IndexError: If the row index is out of range.
+        """
+        ...
+
+    def mask(self, player: Optional[CellState] = None) -> int:
+        """
+        Return a bitboard of one player's pieces, or of all pieces.
+
+        Cell ``(col, row)`` is bit ``col * 7 + row``; the spare bit above each
+        column keeps shifted lines from wrapping. Four in a row along a
+        direction ``d`` (1 vertical, 7 horizontal, 6 and 8 diagonal) exists
+        if ``m & (m >> d) & (m >> 2 * d) & (m >> 3 * d)`` is non-zero.
+
+        :param player: Whose pieces to include. None includes both players.
+        :type player: Optional[CellState]
+        :return: The bitboard as an int.
+        :rtype: int
+        """
+        ...
+
+    def count(self, player: CellState) -> int:
+        """
+        :param player: The player whose pieces to count.
+        :type player: CellState
+        :return: The number of pieces ``player`` has on the board.
+        :rtype: int
         """
         ...
 
@@ -139,6 +217,45 @@ class ConnectFourBoard:
         """
         ...
 
+    def random_playouts(
+        self, n: int, seed: int, threads: int = 1
+    ) -> Tuple[int, int, int]:
+        """
+        Play ``n`` games to completion from this position with uniformly
+        random moves.
+
+        Runs natively with the GIL released. With ``threads > 1`` the playouts
+        are split across that many native threads. Results are reproducible
+        for a given ``(n, seed, threads)``.
+
+        If the game is already over, every playout ends with its result.
+
+        :param n: Number of playouts.
+        :type n: int
+        :param seed: Seed for the playout random number generator.
+        :type seed: int
+        :param threads: Number of native threads to use.
+        :type threads: int
+        :return: ``(red_wins, yellow_wins, draws)``
+        :rtype: Tuple[int, int, int]
+        """
+        ...
+
+    def perft(self, depth: int) -> int:
+        """
+        Count the move sequences of length ``depth`` from this position.
+
+        A sequence stops when the game ends, so a finished game only counts
+        on the last ply. Runs natively with the GIL released, which makes it
+        a convenient benchmark for move generation across threads.
+
+        :param depth: Number of plies.
+        :type depth: int
+        :return: The number of move sequences.
+        :rtype: int
+        """
+        ...
+
     def make_move(self, col_idx: int) -> "ConnectFourBoard":
         """
         Make a move in the specified column.
@@ -167,6 +284,7 @@ class ConnectFourBoard:
         :param idx: A zero-indexed ``(col_idx, row_idx)`` tuple identifying the cell.
         :type idx: Tuple[int, int]
         :return: The cell state if occupied, or None if the cell is empty.
+            Every board returns the same two ``CellState`` objects.
         :rtype: Optional[CellState]
         """
         ...
@@ -201,3 +319,117 @@ class ConnectFourBoard:
         :rtype: str
         """
         ...
+
+class BoardBatch:
+    """
+    ``n`` independent games stepped in lockstep, for reinforcement learning.
+
+    Every slot always holds a game in progress: a game that ends is reset to
+    the empty board within the same ``step``. Requires numpy.
+
+    .. warning::
+        The arrays returned by ``obs``, ``step`` and ``legal_mask`` are
+        allocated once and overwritten in place by later calls. Copy them
+        to keep a result.
+
+    ``step`` releases the GIL while it plays the games. A batch can only be
+    stepped by one thread at a time (others get a ``RuntimeError``), so use
+    one batch per thread.
+    """
+
+    def __init__(self, n: int) -> None:
+        """
+        Create ``n`` games at the empty board.
+
+        :param n: Number of games.
+        :type n: int
+        :raises ValueError: If ``n`` is 0.
+        """
+        ...
+
+    def __len__(self) -> int: ...
+    @property
+    def obs(self) -> NDArray[np.int8]:
+        """
+        The current observations, shaped ``[n, 7, 6]`` (column-major like
+        ``board[col, row]``).
+
+        Cells are 1 for the pieces of the player to move, -1 for the
+        opponent's and 0 for empty.
+
+        :return: The shared observation array.
+        :rtype: NDArray[np.int8]
+        """
+        ...
+
+    def reset(self) -> NDArray[np.int8]:
+        """
+        Reset every game to the empty board.
+
+        :return: The shared observation array.
+        :rtype: NDArray[np.int8]
+        """
+        ...
+
+    def step(
+        self, actions: ArrayLike
+    ) -> Tuple[NDArray[np.int8], NDArray[np.float32], NDArray[np.bool_]]:
+        """
+        Play one move in every game.
+
+        ``rewards[i]`` is 1.0 if the move won game ``i`` for the player who
+        made it and 0.0 otherwise. ``dones[i]`` is True if game ``i`` ended;
+        it has already been reset, so ``obs[i]`` shows the empty board.
+
+        :param actions: One column per game, shaped ``[n]``.
+        :type actions: ArrayLike
+        :return: ``(obs, rewards, dones)``
+        :rtype: Tuple[NDArray[np.int8], NDArray[np.float32], NDArray[np.bool_]]
+        :raises ValueError: If the number of actions is wrong or any action is
+            illegal. No game is changed in that case.
+        """
+        ...
+
+    def legal_mask(self) -> NDArray[np.bool_]:
+        """
+        :return: The legal columns of every game, shaped ``[n, 7]``.
+        :rtype: NDArray[np.bool_]
+        """
+        ...
+
+    def hashes(self) -> NDArray[np.uint64]:
+        """
+        :return: ``board.hash`` of every game, in a new array.
+        :rtype: NDArray[np.uint64]
+        """
+        ...
+
+    def board(self, idx: int) -> ConnectFourBoard:
+        """
+        Copy one game out of the batch.
+
+        :param idx: Index of the game.
+        :type idx: int
+        :return: The game's current board.
+        :rtype: ConnectFourBoard
+        :raises IndexError: If ``idx`` is out of range.
+        """
+        ...
+
+def window_features(hashes: ArrayLike) -> NDArray[np.int16]:
+    """
+    Count the evaluation features of many positions in one native pass.
+
+    Each position is rebuilt from its ``board.hash``. The columns are, from
+    the perspective of the player to move: windows of four cells holding
+    four, three and two of their pieces and none of the opponent's; the same
+    three counts for the opponent; and their center-column pieces minus the
+    opponent's. The work runs without the GIL. Requires numpy.
+
+    :param hashes: ``board.hash`` values, shaped ``[n]``.
+    :type hashes: ArrayLike
+    :return: Feature counts, shaped ``[n, 7]``.
+    :rtype: NDArray[np.int16]
+    :raises ValueError: If a value is not the hash of a board.
+    """
+    ...
@@ -0,0 +1,99 @@
+"""
+Shared file handling for read-only tables keyed by ``board.hash``.
+
+A table is a flat file: a fixed-size header that starts with a magic string
+and a version and ends with the record count, followed by the records sorted
+by hash, in a layout of the subclass's choosing with a fixed size per record. Tables are written to a temporary file that is renamed into
+place, and read through ``mmap`` so lookups never load the whole file.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import ClassVar, Iterable, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T", bound="MappedTable")
+
+
+def write_table(path: str, header: bytes, chunks: Iterable[bytes]) -> None:
+    """
+    Write ``header`` followed by ``chunks`` to ``path`` atomically.
+
+    Readers of an existing file at ``path`` never see a partial table.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+class MappedTable:
+    """
+    Base class for memory-mapped tables.
+
+    Subclasses set the class attributes below; ``HEADER`` must start with
+    the magic (``4s``) and version (``H``) and end with the record count
+    (``Q``). The unpacked header is available as ``_fields``.
+    """
+
+    MAGIC: ClassVar[bytes]
+    VERSION: ClassVar[int]
+    HEADER: ClassVar[struct.Struct]
+    RECORD_SIZE: ClassVar[int]
+    # What the file is, for error messages, e.g. "endgame table"
+    KIND: ClassVar[str]
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+
+        if len(self._mmap) < self.HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not an {self.KIND}")
+
+        self._fields: Tuple = self.HEADER.unpack_from(self._mmap, 0)
+        magic, version, count = self._fields[0], self._fields[1], self._fields[-1]
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} {self.KIND}")
+        if len(self._mmap) != self.HEADER.size + count * self.RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+        self._count: int = count
+        self._digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def digest(self) -> str:
+        """
+        Hex digest of the whole file, computed on first use.
+
+        Two tables with the same digest hold the same records, wherever
+        they were built.
+        """
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self._mmap, digest_size=8).hexdigest()
+        return self._digest
+
+    def close(self) -> None:
+        """Unmap the table and close the underlying file."""
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self: _T) -> _T:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,8 +1,12 @@
 from pingv4.bot.base import AbstractBot, RandomBot
+from pingv4.bot.mcts import MCTSBot
 from pingv4.bot.minimax import MinimaxBot
+from pingv4.bot.pns import PNSBot
 
 __all__ = [
     "AbstractBot",
     "RandomBot",
     "MinimaxBot",
+    "MCTSBot",
+    "PNSBot",
 ]
@@ -1,6 +1,6 @@
 import random
 from abc import ABC, abstractmethod
-from typing import Final
+from typing import ClassVar, Final, List, Sequence
 
 from pingv4._core import CellState, ConnectFourBoard
 
@@ -8,8 +8,25 @@ from pingv4._core import CellState, ConnectFourBoard
 class AbstractBot(ABC):
     """
     Abstract base class for all ConnectFour bots
+
+    A bot instance belongs to one game thread. The only other thread that
+    may touch it is its own ``ponder`` call, which the game loop stops and
+    joins before calling ``get_move``. To play on several threads at once,
+    give each thread its own bot instances; boards can be shared freely.
+
+    Game runners create a bot once per match and color, call ``prepare``
+    once, and then ``on_new_game`` before each of the match's games. The
+    lockstep runner (``pingv4.runner.play_games``) is the exception: one
+    instance per color plays all of its games at once, with ``on_new_game``
+    called once before they start, so such bots must not keep state that
+    belongs to a single game.
     """
 
+    # True if get_move always returns the same move for the same position,
+    # color and configuration, once reset_search_state has been called. Only
+    # deterministic bots can be memoized (see pingv4.bot.memo).
+    deterministic: ClassVar[bool] = False
+
     def __init__(self, player: CellState) -> None:
         """
         :param player: The CellState (Red or Yellow) this bot is playing as
@@ -53,6 +70,92 @@ class AbstractBot(ABC):
         """
         raise NotImplementedError
 
+    def get_moves(self, boards: Sequence[ConnectFourBoard]) -> List[int]:
+        """
+        Decide the next move in several positions at once
+
+        Runners that play many games in lockstep (see
+        ``pingv4.runner.play_games``) call this with every position where
+        this bot is to move. Bots with a fixed cost per call, such as a
+        neural network or vectorized NumPy evaluation, can override it to
+        amortize that cost over the batch. The default calls ``get_move``
+        on each board in turn.
+
+        :param boards: Positions with this bot to move, possibly from
+            different games
+        :type boards: Sequence[ConnectFourBoard]
+        :return: One column per board, in the same order
+        :rtype: List[int]
+        """
+        return [self.get_move(board) for board in boards]
+
+    def config_fingerprint(self) -> str:
+        """
+        Describe every setting that can change the bot's choice of move.
+
+        Cached moves are keyed on this string, so a deterministic bot with
+        settings must override it; two bots with equal fingerprints must
+        play the same moves. The default is for bots without settings.
+
+        :return: A stable string, e.g. ``"max_depth=6,search=pvs"``
+        :rtype: str
+        """
+        return ""
+
+    def reset_search_state(self) -> None:
+        """
+        Forget whatever earlier searches left behind.
+
+        Memoized bots (see ``pingv4.bot.memo``) call this before every move
+        they compute, so a deterministic bot whose caches can change its
+        choice of move, such as a transposition table that breaks ties,
+        must drop them here. The default does nothing.
+        """
+
+    def prepare(self, time_budget: float) -> None:
+        """
+        Optionally do expensive setup before the first game.
+
+        Called once per instance, before any game starts and outside every
+        move's clock, e.g. to load tables or warm caches. Bot instances are
+        reused for all the games of a match, so whatever is built here is
+        available from the first move of every game. The default does
+        nothing.
+
+        :param time_budget: Seconds the bot may spend; it should return in time
+        :type time_budget: float
+        """
+
+    def on_new_game(self) -> None:
+        """
+        Reset per-game state before a game starts.
+
+        Called before every game, including the first. Keep state that is
+        valid across games, such as a transposition table, and drop state
+        that belongs to the previous game. The default does nothing.
+        """
+
+    def ponder(self, board: ConnectFourBoard) -> None:
+        """
+        Optionally think on the opponent's time.
+
+        Called on a background thread with the board after this bot's move,
+        while the opponent decides on a reply. Implementations should keep
+        working (e.g. filling caches) until ``stop_pondering`` is called,
+        then return promptly. The default does nothing.
+
+        :param board: The board with the opponent to move
+        :type board: ConnectFourBoard
+        """
+
+    def stop_pondering(self) -> None:
+        """
+        Ask a running ``ponder`` call to return as soon as possible.
+
+        Called from the game loop before ``get_move``; the loop waits for
+        ``ponder`` to return before asking for a move.
+        """
+
 
 class RandomBot(AbstractBot):
     """A simple bot that plays random valid moves."""
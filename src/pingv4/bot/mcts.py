@@ -0,0 +1,177 @@
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+
+
+class _Node:
+    """
+    A node in the search tree.
+
+    ``wins`` is counted from the perspective of the player who made the move
+    leading into this node, which is what its parent wants to maximize. Each
+    visit is one expansion below the node and adds the mean result of that
+    expansion's playout batch, so ``wins / visits`` is in [0, 1] and the
+    exploration constant keeps its usual UCT scale.
+    """
+
+    __slots__ = ("board", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, board: ConnectFourBoard, parent: Optional["_Node"]) -> None:
+        self.board = board
+        self.parent = parent
+        self.children: Dict[int, "_Node"] = {}
+        self.untried: List[int] = board.get_valid_moves()
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MCTSBot(AbstractBot):
+    """
+    Monte Carlo Tree Search (UCT) bot.
+
+    Features:
+    - Batched random playouts run natively via ``board.random_playouts``
+    - Tree reuse between moves
+    - Time-limited search
+    """
+
+    def __init__(
+        self,
+        player: CellState,
+        time_limit_ms: int = 1000,
+        playouts_per_leaf: int = 64,
+        exploration: float = 1.4,
+        threads: int = 1,
+        max_iterations: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param player: The CellState (Red or Yellow) this bot is playing as
+        :type player: CellState
+        :param time_limit_ms: Search time per move
+        :type time_limit_ms: int
+        :param playouts_per_leaf: Random playouts run for each expanded node;
+            their mean result counts as one visit
+        :type playouts_per_leaf: int
+        :param exploration: UCT exploration constant
+        :type exploration: float
+        :param threads: Native threads used for each playout batch
+        :type threads: int
+        :param max_iterations: Optional cap on tree iterations per move
+        :type max_iterations: Optional[int]
+        :param seed: Seed for reproducible playouts
+        :type seed: Optional[int]
+        """
+        super().__init__(player)
+        if playouts_per_leaf < 1:
+            raise ValueError("playouts_per_leaf must be positive")
+        if threads < 1:
+            raise ValueError("threads must be positive")
+
+        self.time_limit_ms = time_limit_ms
+        self.playouts_per_leaf = playouts_per_leaf
+        self.exploration = exploration
+        self.threads = threads
+        self.max_iterations = max_iterations
+        self._rng = random.Random(seed)
+        self._root: Optional[_Node] = None
+
+    @property
+    def strategy_name(self) -> str:
+        return f"MCTSBot ({self.time_limit_ms}ms)"
+
+    @property
+    def author_name(self) -> str:
+        return "Pingv4"
+
+    @property
+    def author_netid(self) -> str:
+        return "pingv4"
+
+    def get_move(self, board: ConnectFourBoard) -> int:
+        """Run UCT until the time or iteration budget is spent."""
+        if not board.get_valid_moves():
+            raise ValueError("No valid moves available")
+
+        root = self._reuse_root(board)
+        deadline = time.perf_counter() + self.time_limit_ms / 1000
+        iterations = 0
+
+        while time.perf_counter() < deadline:
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            self._iterate(root)
+            iterations += 1
+
+        # Guarantee at least one child even with a zero time budget
+        if not root.children:
+            self._iterate(root)
+
+        move, _ = max(root.children.items(), key=lambda item: item[1].visits)
+        self._root = root.children[move]
+        return move
+
+    def on_new_game(self) -> None:
+        # The old tree can't contain positions of the new game
+        self._root = None
+
+    def _reuse_root(self, board: ConnectFourBoard) -> _Node:
+        """Find ``board`` two plies below the previous root, if it was explored."""
+        board_hash = board.hash
+        if self._root is not None:
+            for child in self._root.children.values():
+                if child.board.hash == board_hash:
+                    child.parent = None
+                    return child
+                for grandchild in child.children.values():
+                    if grandchild.board.hash == board_hash:
+                        grandchild.parent = None
+                        return grandchild
+        return _Node(board, None)
+
+    def _iterate(self, root: _Node) -> None:
+        """One selection / expansion / simulation / backpropagation pass."""
+        node = root
+
+        # Selection
+        while not node.untried and node.children:
+            node = self._select_child(node)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(self._rng.randrange(len(node.untried)))
+            child = _Node(node.board.make_move(move), node)
+            node.children[move] = child
+            node = child
+
+        # Simulation, scored for the player who moved into ``node``. The root
+        # always has an untried move or a child, so ``node`` has a parent here.
+        assert node.parent is not None
+        mover = node.parent.board.current_player
+        n = self.playouts_per_leaf
+        red_wins, yellow_wins, draws = node.board.random_playouts(
+            n, self._rng.getrandbits(64), self.threads
+        )
+        wins = red_wins if mover == CellState.Red else yellow_wins
+        value = (wins + 0.5 * draws) / n
+
+        # Backpropagation of one visit, flipping perspective at each ply
+        current: Optional[_Node] = node
+        while current is not None:
+            current.visits += 1
+            current.wins += value
+            value = 1 - value
+            current = current.parent
+
+    def _select_child(self, node: _Node) -> _Node:
+        log_visits = math.log(node.visits)
+        c = self.exploration
+
+        def uct(child: _Node) -> float:
+            return child.wins / child.visits + c * math.sqrt(log_visits / child.visits)
+
+        return max(node.children.values(), key=uct)
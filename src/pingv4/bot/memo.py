@@ -0,0 +1,340 @@
+"""
+Cross-game move memoization for deterministic bots.
+
+A deterministic bot (see ``AbstractBot.deterministic``) always plays the
+same move in the same position, so a tournament that keeps reaching the
+same openings can reuse its earlier answers. ``memoize`` wraps a bot class
+so that every ``get_move`` first consults a ``MoveCache`` keyed on::
+
+    (bot class, bot.config_fingerprint(), board.hash, color)
+
+The cache keeps recent moves in an in-memory LRU and can also write them to
+a SQLite file shared by several processes. Changing a bot's settings
+changes its fingerprint, so moves cached under the old settings are never
+returned again.
+"""
+
+import copyreg
+import os
+import sqlite3
+import threading
+from abc import ABCMeta
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+
+# (bot class, config fingerprint, board hash, color)
+MemoKey = Tuple[str, str, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    bot TEXT NOT NULL,
+    config TEXT NOT NULL,
+    hash INTEGER NOT NULL,
+    color INTEGER NOT NULL,
+    move INTEGER NOT NULL,
+    PRIMARY KEY (bot, config, hash, color)
+) WITHOUT ROWID
+"""
+
+
+class CacheStats(NamedTuple):
+    """Lookup counts of a ``MoveCache``."""
+
+    hits: int
+    # Misses in memory that were found in the SQLite file
+    disk_hits: int
+    misses: int
+    # Moves currently held in memory
+    entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class MoveCache:
+    """
+    Moves chosen by deterministic bots, shared by every bot that uses it.
+
+    Safe to share between threads. With ``path`` set, each process opens its
+    own connection to the file, so a cache can also be handed to worker
+    processes; SQLite's write-ahead log lets them read and write concurrently.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: Optional[str] = None) -> None:
+        """
+        Args:
+            max_entries: Moves kept in memory; the least recently used are
+                dropped first.
+            path: SQLite file for a persistent tier, created if missing.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[MemoKey, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def get(self, key: MemoKey) -> Optional[int]:
+        """Cached move for ``key``, or None. Counts a hit or a miss."""
+        with self._lock:
+            move = self._entries.get(key)
+            if move is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return move
+
+            if self.path is not None:
+                row = (
+                    self._db()
+                    .execute(
+                        "SELECT move FROM moves "
+                        "WHERE bot = ? AND config = ? AND hash = ? AND color = ?",
+                        key,
+                    )
+                    .fetchone()
+                )
+                if row is not None:
+                    self._disk_hits += 1
+                    self._remember(key, row[0])
+                    return row[0]
+
+            self._misses += 1
+            return None
+
+    def put(self, key: MemoKey, move: int) -> None:
+        """Store a move in memory and, if enabled, in the SQLite file."""
+        with self._lock:
+            self._remember(key, move)
+            if self.path is not None:
+                db = self._db()
+                with db:
+                    db.execute(
+                        "INSERT OR IGNORE INTO moves VALUES (?, ?, ?, ?, ?)",
+                        (*key, move),
+                    )
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._disk_hits, self._misses, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset the statistics. The file is kept."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = 0
+
+    def close(self) -> None:
+        """Close this process's connection to the SQLite file."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers get their own lock and connection
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_conn"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _remember(self, key: MemoKey, move: int) -> None:
+        self._entries[key] = move
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _db(self) -> sqlite3.Connection:
+        # A forked child must not reuse its parent's connection
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = pid
+        return self._conn
+
+
+class MemoizedBot(AbstractBot):
+    """
+    Plays like the wrapped bot, answering repeated positions from a cache.
+
+    Only moves the bot actually computed are cached, and only legal ones;
+    a bot that raises is not cached either, so errors surface as usual.
+    The bot's ``reset_search_state`` runs before every move it computes,
+    so state left by ``prepare``, ``ponder`` or earlier searches never
+    decides a cached move.
+    """
+
+    deterministic = True
+
+    def __init__(self, bot: AbstractBot, cache: MoveCache) -> None:
+        if not type(bot).deterministic:
+            raise ValueError(
+                f"{type(bot).__name__} is not deterministic and cannot be memoized"
+            )
+        super().__init__(bot.player)
+        self.bot = bot
+        self.cache = cache
+
+        bot_cls = type(bot)
+        self._identity = f"{bot_cls.__module__}.{bot_cls.__qualname__}"
+        self._color = 0 if bot.player == CellState.Red else 1
+
+    @property
+    def strategy_name(self) -> str:
+        return self.bot.strategy_name
+
+    @property
+    def author_name(self) -> str:
+        return self.bot.author_name
+
+    @property
+    def author_netid(self) -> str:
+        return self.bot.author_netid
+
+    def config_fingerprint(self) -> str:
+        return self.bot.config_fingerprint()
+
+    def get_move(self, board: ConnectFourBoard) -> int:
+        # Read the fingerprint on every call so changed settings take effect
+        key = (self._identity, self.bot.config_fingerprint(), board.hash, self._color)
+        move = self.cache.get(key)
+        if move is not None:
+            return move
+
+        move = self._compute([board])[0]
+        if move in board.get_valid_moves():
+            self.cache.put(key, move)
+        return move
+
+    def get_moves(self, boards: Sequence[ConnectFourBoard]) -> List[int]:
+        # Only the positions missing from the cache go to the bot, in one batch
+        fingerprint = self.bot.config_fingerprint()
+        keys = [(self._identity, fingerprint, b.hash, self._color) for b in boards]
+        moves: List[Optional[int]] = [self.cache.get(key) for key in keys]
+        misses = [idx for idx, move in enumerate(moves) if move is None]
+        if misses:
+            computed = self._compute([boards[idx] for idx in misses])
+            for idx, move in zip(misses, computed):
+                moves[idx] = move
+                if move in boards[idx].get_valid_moves():
+                    self.cache.put(keys[idx], move)
+        return moves
+
+    def _compute(self, boards: Sequence[ConnectFourBoard]) -> List[int]:
+        """Ask the bot for moves, each searched from a clean slate."""
+        # A cached move must not depend on the positions searched before it
+        if type(self.bot).get_moves is AbstractBot.get_moves:
+            moves = []
+            for board in boards:
+                self.bot.reset_search_state()
+                moves.append(self.bot.get_move(board))
+            return moves
+        self.bot.reset_search_state()
+        return self.bot.get_moves(boards)
+
+    def prepare(self, time_budget: float) -> None:
+        self.bot.prepare(time_budget)
+
+    def on_new_game(self) -> None:
+        self.bot.on_new_game()
+
+    def ponder(self, board: ConnectFourBoard) -> None:
+        self.bot.ponder(board)
+
+    def stop_pondering(self) -> None:
+        self.bot.stop_pondering()
+
+
+class _MemoizedClass(ABCMeta):
+    """
+    Metaclass of the classes built by ``memoize``.
+
+    They are created at run time, so pickle can't find them by name; they
+    pickle as the ``memoize`` call that built them instead, which lets them
+    be sent to worker processes like any other bot class.
+    """
+
+    _memoize_args: Tuple[Type[AbstractBot], MoveCache, Dict[str, Any]]
+
+
+def _rebuild_memoized(
+    bot_cls: Type[AbstractBot], cache: MoveCache, bot_kwargs: Dict[str, Any]
+) -> Type[MemoizedBot]:
+    return memoize(bot_cls, cache, **bot_kwargs)
+
+
+def _reduce_memoized(cls: _MemoizedClass) -> Tuple[Any, ...]:
+    return _rebuild_memoized, cls._memoize_args
+
+
+copyreg.pickle(_MemoizedClass, _reduce_memoized)
+
+
+def memoize(
+    bot_cls: Type[AbstractBot],
+    cache: Optional[MoveCache] = None,
+    **bot_kwargs: Any,
+) -> Type[MemoizedBot]:
+    """
+    Create a bot class that plays like ``bot_cls`` through a shared cache.
+
+    The result can be passed anywhere a bot class is expected, e.g.
+    ``Connect4Game`` or ``play_game``; every instance shares ``cache``.
+    It can be pickled, so it also works in a ``Pairing``; an unpickled
+    class gets a copy of the cache, which shares only its SQLite file.
+
+    Example::
+
+        cache = MoveCache(path="moves.sqlite")
+        Bot = memoize(MinimaxBot, cache, max_depth=8)
+        play_game(Bot(CellState.Red), Bot(CellState.Yellow))
+        print(cache.stats().hit_rate)
+
+    Args:
+        bot_cls: A bot class with ``deterministic = True``.
+        cache: Cache to use. Defaults to a new in-memory cache.
+        **bot_kwargs: Extra constructor arguments for ``bot_cls``.
+
+    Raises:
+        ValueError: If ``bot_cls`` is not deterministic.
+    """
+    if not bot_cls.deterministic:
+        raise ValueError(
+            f"{bot_cls.__name__} is not deterministic and cannot be memoized"
+        )
+    shared_cache = cache if cache is not None else MoveCache()
+
+    def __init__(self: MemoizedBot, player: CellState) -> None:
+        MemoizedBot.__init__(self, bot_cls(player, **bot_kwargs), shared_cache)
+
+    memoized_cls = _MemoizedClass(
+        f"Memoized{bot_cls.__name__}",
+        (MemoizedBot,),
+        {"__init__": __init__, "__module__": __name__},
+    )
+    memoized_cls._memoize_args = (bot_cls, shared_cache, bot_kwargs)
+    return memoized_cls
@@ -1,14 +1,80 @@
-from typing import Dict, Optional, Tuple
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from pingv4._core import CellState, ConnectFourBoard
 from pingv4.bot.base import AbstractBot
 
+if TYPE_CHECKING:
+    from pingv4.endgame import EndgameEntry, EndgameTable
+    from pingv4.explorer import ExplorerIndex
+
 
 # Transposition table entry types
 EXACT = 0
 LOWERBOUND = 1
 UPPERBOUND = 2
 
+# Root search drivers
+SEARCH_ALPHABETA = "alphabeta"
+SEARCH_PVS = "pvs"
+
+
+class _SearchAborted(Exception):
+    """Raised inside the search tree to unwind a search that was stopped."""
+
+
+class MoveAnalysis(NamedTuple):
+    """Search result for one root move, from the perspective of the mover."""
+
+    move: int
+    score: float
+    # Depth of the deepest completed search of this move, counting the move
+    depth: int
+    # Principal variation, starting with the move itself
+    pv: List[int]
+
+
+@dataclass(frozen=True)
+class EvalWeights:
+    """
+    Weights of ``MinimaxBot``'s positional evaluation, in the units where a
+    win scores 100000. ``pingv4.tuning`` fits them to game results.
+    """
+
+    # A window of four with three of the player's pieces and one empty cell
+    three: float = 50.0
+    # A window with two of the player's pieces and two empty cells
+    two: float = 5.0
+    # Multiplier on the opponent's threes, so blocking them comes first
+    block: float = 1.1
+    # Per piece in the center column more than the opponent has
+    center: float = 3.0
+
+    def save(self, path: str) -> None:
+        """Write the weights to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "EvalWeights":
+        """Read weights written by ``save``."""
+        with open(path) as f:
+            return cls(**json.load(f))
+
 
 class MinimaxBot(AbstractBot):
     """
@@ -16,15 +82,51 @@ class MinimaxBot(AbstractBot):
 
     Features:
     - Alpha-beta pruning for efficient search
+    - Optional principal variation search with aspiration windows
     - Transposition table using board.hash for caching
     - Move ordering (center-first) for better pruning
     - Iterative deepening for time management
-    - Sophisticated positional evaluation
+    - Sophisticated positional evaluation, with tunable weights
+    - Optional exact endgame table lookups
+    - Optional opening move ordering from a position explorer index
+    - Pondering on the opponent's time
     """
 
-    def __init__(self, player: CellState, max_depth: int = 6) -> None:
+    deterministic = True
+
+    # on_new_game empties a transposition table that has grown past this size
+    tt_max_entries: ClassVar[int] = 2_000_000
+
+    def __init__(
+        self,
+        player: CellState,
+        max_depth: int = 6,
+        endgame_table: Optional["EndgameTable"] = None,
+        search: str = SEARCH_ALPHABETA,
+        aspiration_window: float = 50.0,
+        explorer: Optional["ExplorerIndex"] = None,
+        weights: Union[EvalWeights, str, None] = None,
+    ) -> None:
         super().__init__(player)
+        if search not in (SEARCH_ALPHABETA, SEARCH_PVS):
+            raise ValueError(f"Unknown search driver: {search}")
+
         self.max_depth = max_depth
+        self.endgame_table = endgame_table
+        self.search = search
+        self.aspiration_window = aspiration_window
+        # Positions covered by the index search their most played moves first
+        self.explorer = explorer
+
+        # Nodes visited by the last get_move call
+        self.nodes = 0
+
+        # Pondering: set from another thread to unwind a running search, and
+        # (position hash, move) for a ponder search that ran to max_depth
+        self._abort = False
+        self._ponder_result: Optional[Tuple[int, int]] = None
+        # perf_counter() deadline for analyze and prepare; checked every 256 nodes
+        self._deadline: Optional[float] = None
         self.opponent = CellState.Yellow if player == CellState.Red else CellState.Red
 
         # Transposition table: hash -> (depth, score, flag, best_move)
@@ -37,12 +139,21 @@ class MinimaxBot(AbstractBot):
         # Center columns are more valuable
         self._col_weights = [1, 2, 3, 4, 3, 2, 1]
 
+        # Evaluation weights, or the path of a file written by EvalWeights.save
+        if isinstance(weights, str):
+            weights = EvalWeights.load(weights)
+        self.weights = weights if weights is not None else EvalWeights()
+
         # Window scoring weights
         self._window_scores = {
             4: 100000,  # Four in a row (win)
-            3: 50,  # Three with open space
-            2: 5,  # Two with open spaces
+            3: self.weights.three,  # Three with open space
+            2: self.weights.two,  # Two with open spaces
         }
+        # Opponent threes count this much more than our own
+        self.block_weight = self.weights.block
+        # Score per center-column piece more than the opponent
+        self.center_weight = self.weights.center
 
     @property
     def strategy_name(self) -> str:
@@ -56,8 +167,30 @@ class MinimaxBot(AbstractBot):
     def author_netid(self) -> str:
         return "pingv4"
 
+    def config_fingerprint(self) -> str:
+        table = self.endgame_table
+        explorer = self.explorer
+        return ",".join(
+            [
+                f"max_depth={self.max_depth}",
+                f"search={self.search}",
+                f"aspiration_window={self.aspiration_window}",
+                f"col_weights={self._col_weights}",
+                f"window_scores={sorted(self._window_scores.items())}",
+                f"block_weight={self.block_weight}",
+                f"center_weight={self.center_weight}",
+                # Tables are identified by content, wherever they were built
+                "endgame=" + ("none" if table is None else table.digest),
+                # Move order breaks ties between equal scores
+                "explorer=" + ("none" if explorer is None else explorer.digest),
+            ]
+        )
+
     def get_move(self, board: ConnectFourBoard) -> int:
         """Select the best move using iterative deepening minimax."""
+        # The game loop has stopped any ponder search before asking for a move
+        self._abort = False
+        ponder_result, self._ponder_result = self._ponder_result, None
         valid_moves = board.get_valid_moves()
 
         if not valid_moves:
@@ -82,15 +215,173 @@ class MinimaxBot(AbstractBot):
             ):
                 return move
 
-        # Iterative deepening
+        # The opponent played the predicted reply and we already searched it
+        if ponder_result is not None and ponder_result[0] == board.hash:
+            self.nodes = 0
+            return ponder_result[1]
+
+        # Iterative deepening, each iteration seeded with the previous score
+        self.nodes = 0
         best_move = valid_moves[0]
+        score = 0.0
         for depth in range(1, self.max_depth + 1):
-            move, _ = self._search_root(board, depth)
+            move, score = self._search_iteration(board, depth, score)
             if move is not None:
                 best_move = move
 
         return best_move
 
+    def reset_search_state(self) -> None:
+        # Table entries and the ponder result steer move order and cutoffs,
+        # which decide between moves with equal scores
+        self._tt.clear()
+        self._ponder_result = None
+
+    def prepare(self, time_budget: float) -> None:
+        """
+        Search the positions this bot can face first until ``time_budget``
+        runs out: the empty board as Red, each of Red's first moves as
+        Yellow. The transposition table is kept across games, so the
+        opening moves of every game start from these results.
+        """
+        start = ConnectFourBoard()
+        if self.player == CellState.Red:
+            positions = [start]
+        else:
+            positions = [start.make_move(col) for col in self._move_order]
+
+        scores = [0.0] * len(positions)
+        self._abort = False
+        self._deadline = time.perf_counter() + time_budget
+        try:
+            for depth in range(1, self.max_depth + 1):
+                for idx, board in enumerate(positions):
+                    _, scores[idx] = self._search_iteration(board, depth, scores[idx])
+        except _SearchAborted:
+            pass
+        finally:
+            self._deadline = None
+            self.nodes = 0
+
+    def on_new_game(self) -> None:
+        # A ponder result belongs to the last game; table entries stay valid
+        self._ponder_result = None
+        if len(self._tt) > self.tt_max_entries:
+            self._tt.clear()
+
+    def ponder(self, board: ConnectFourBoard) -> None:
+        """
+        Search the position after the opponent's most likely reply.
+
+        The reply is the transposition table's best move for ``board`` (left
+        there by our own search), so the work lands in the shared table and
+        speeds up the next get_move even on a miss. If the opponent plays the
+        predicted move and the search reached max_depth, get_move returns
+        its result without searching again.
+        """
+        if not board.is_in_progress:
+            return
+
+        reply = self._order_moves(board.get_valid_moves(), board)[0]
+        predicted = board.make_move(reply)
+        if not predicted.is_in_progress:
+            return
+
+        best_move: Optional[int] = None
+        score = 0.0
+        try:
+            for depth in range(1, self.max_depth + 1):
+                move, score = self._search_iteration(predicted, depth, score)
+                if move is not None:
+                    best_move = move
+        except _SearchAborted:
+            return
+
+        if best_move is not None:
+            self._ponder_result = (predicted.hash, best_move)
+
+    def stop_pondering(self) -> None:
+        self._abort = True
+
+    def analyze(
+        self,
+        board: ConnectFourBoard,
+        time_limit_ms: int = 1000,
+        on_update: Optional[Callable[[List[MoveAnalysis]], None]] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[MoveAnalysis]:
+        """
+        Score every legal move in a position (multi-PV analysis).
+
+        Each root move gets its own full-window search at every iterative
+        deepening depth, all sharing this bot's transposition table, until
+        the time limit or ``max_depth`` is reached. Works for either side to
+        move; scores are from the perspective of ``board.current_player``.
+
+        Args:
+            board: Position to analyze.
+            time_limit_ms: Wall-clock budget for the whole analysis.
+            on_update: Called with the current ranking every time a root
+                move finishes a deeper search, e.g. to refresh a UI.
+            max_depth: Deepest iteration to run. Defaults to the number of
+                empty cells, where every score is exact.
+
+        Returns:
+            All legal moves, best first, from the deepest completed searches.
+        """
+        if not board.is_in_progress:
+            return []
+
+        empty = board.num_rows * board.num_cols - board.num_moves
+        max_depth = min(max_depth or empty, empty)
+        child_color = -1 if board.current_player == self.player else 1
+
+        results: Dict[int, MoveAnalysis] = {}
+        moves = self._order_moves(board.get_valid_moves(), board)
+
+        def ranking() -> List[MoveAnalysis]:
+            return sorted(
+                results.values(),
+                key=lambda a: (-a.score, self._move_order.index(a.move)),
+            )
+
+        self.nodes = 0
+        self._abort = False
+        deadline = time.perf_counter() + time_limit_ms / 1000
+        try:
+            for depth in range(1, max_depth + 1):
+                for move in moves:
+                    child = board.make_move(move)
+                    score = -self._negamax(
+                        child, depth - 1, float("-inf"), float("inf"), child_color
+                    )
+                    pv = [move] + self._principal_variation(child, depth - 1)
+                    results[move] = MoveAnalysis(move, score, depth, pv)
+                    if on_update is not None:
+                        on_update(ranking())
+
+                # Search the best moves first at the next depth. The deadline
+                # only applies from depth 2, so every move gets a score.
+                moves = [analysis.move for analysis in ranking()]
+                self._deadline = deadline
+        except _SearchAborted:
+            pass
+        finally:
+            self._deadline = None
+
+        return ranking()
+
+    def _principal_variation(self, board: ConnectFourBoard, depth: int) -> List[int]:
+        """Follow transposition table best moves from ``board`` for ``depth`` plies."""
+        pv: List[int] = []
+        while len(pv) < depth and board.is_in_progress:
+            entry = self._tt.get(board.hash)
+            if entry is None or entry[3] is None:
+                break
+            pv.append(entry[3])
+            board = board.make_move(entry[3])
+        return pv
+
     def _simulate_opponent_move(
         self, board: ConnectFourBoard, col: int
     ) -> Optional[ConnectFourBoard]:
@@ -106,8 +397,31 @@ class MinimaxBot(AbstractBot):
                 return None
         return None
 
+    def _search_iteration(
+        self, board: ConnectFourBoard, depth: int, guess: float
+    ) -> Tuple[Optional[int], float]:
+        """
+        Run one iterative-deepening iteration with the configured driver.
+
+        PVS first tries an aspiration window around ``guess`` (the previous
+        iteration's score) and falls back to a full window if the result
+        lands outside it.
+        """
+        if self.search == SEARCH_PVS and depth > 1 and self.aspiration_window > 0:
+            alpha = guess - self.aspiration_window
+            beta = guess + self.aspiration_window
+            move, score = self._search_root(board, depth, alpha, beta)
+            if alpha < score < beta:
+                return move, score
+
+        return self._search_root(board, depth)
+
     def _search_root(
-        self, board: ConnectFourBoard, depth: int
+        self,
+        board: ConnectFourBoard,
+        depth: int,
+        alpha: float = float("-inf"),
+        beta: float = float("inf"),
     ) -> Tuple[Optional[int], float]:
         """Root-level search with move ordering from transposition table."""
         valid_moves = board.get_valid_moves()
@@ -115,25 +429,49 @@ class MinimaxBot(AbstractBot):
             return None, 0.0
 
         # Order moves: TT best move first, then center-preference
-        ordered_moves = self._order_moves(valid_moves, board.hash)
+        ordered_moves = self._order_moves(valid_moves, board)
 
         best_move = ordered_moves[0]
         best_score = float("-inf")
-        alpha = float("-inf")
-        beta = float("inf")
 
-        for move in ordered_moves:
+        for i, move in enumerate(ordered_moves):
             next_board = board.make_move(move)
-            score = -self._negamax(next_board, depth - 1, -beta, -alpha, -1)
+            score = self._search_child(next_board, depth - 1, alpha, beta, -1, i)
 
             if score > best_score:
                 best_score = score
                 best_move = move
 
             alpha = max(alpha, score)
+            if alpha >= beta:
+                break
 
         return best_move, best_score
 
+    def _search_child(
+        self,
+        child: ConnectFourBoard,
+        depth: int,
+        alpha: float,
+        beta: float,
+        child_color: int,
+        move_idx: int,
+    ) -> float:
+        """
+        Score a child from the parent's perspective.
+
+        With PVS, only the first move gets the full window. The rest are
+        probed with a null window and only re-searched if the probe shows they
+        might beat the current best.
+        """
+        if move_idx == 0 or self.search == SEARCH_ALPHABETA or beta - alpha <= 1:
+            return -self._negamax(child, depth, -beta, -alpha, child_color)
+
+        score = -self._negamax(child, depth, -alpha - 1, -alpha, child_color)
+        if alpha < score < beta:
+            score = -self._negamax(child, depth, -beta, -alpha, child_color)
+        return score
+
     def _negamax(
         self,
         board: ConnectFourBoard,
@@ -155,6 +493,13 @@ class MinimaxBot(AbstractBot):
         Returns:
             Evaluation score from the perspective of the current player
         """
+        if self._abort or (
+            self._deadline is not None
+            and self.nodes & 255 == 0
+            and time.perf_counter() > self._deadline
+        ):
+            raise _SearchAborted
+        self.nodes += 1
         alpha_orig = alpha
         board_hash = board.hash
 
@@ -180,19 +525,25 @@ class MinimaxBot(AbstractBot):
             else:
                 return 0  # Draw
 
+        # Exact result from the endgame table, if the position is covered
+        if self.endgame_table is not None:
+            entry = self.endgame_table.probe(board)
+            if entry is not None:
+                return self._endgame_score(entry, depth)
+
         # Depth limit - evaluate position
         if depth <= 0:
             return color * self._evaluate(board)
 
         valid_moves = board.get_valid_moves()
-        ordered_moves = self._order_moves(valid_moves, board_hash)
+        ordered_moves = self._order_moves(valid_moves, board)
 
         best_score = float("-inf")
         best_move = ordered_moves[0] if ordered_moves else None
 
-        for move in ordered_moves:
+        for i, move in enumerate(ordered_moves):
             next_board = board.make_move(move)
-            score = -self._negamax(next_board, depth - 1, -beta, -alpha, -color)
+            score = self._search_child(next_board, depth - 1, alpha, beta, -color, i)
 
             if score > best_score:
                 best_score = score
@@ -214,21 +565,46 @@ class MinimaxBot(AbstractBot):
 
         return best_score
 
-    def _order_moves(self, moves: list, board_hash: int) -> list:
+    def _endgame_score(self, entry: "EndgameEntry", depth: int) -> float:
+        """
+        Convert an endgame table entry into a negamax score on the same scale
+        as terminal positions, so table wins found at different distances
+        still prefer the faster win.
+        """
+        if entry.outcome == 0:
+            return 0
+        score = 100000 + depth - entry.distance
+        return score if entry.outcome > 0 else -score
+
+    def _order_moves(self, moves: list, board: ConnectFourBoard) -> list:
         """Order moves for better alpha-beta pruning."""
+        board_hash = board.hash
         # Check if we have a best move from transposition table
         tt_best = None
         if board_hash in self._tt:
             tt_best = self._tt[board_hash][3]
 
+        # In the opening, TT best move first, then the most played moves of
+        # the archived games, then center preference
+        explorer = self.explorer
+        if explorer is not None and board.num_moves <= explorer.max_plies:
+            stats = explorer.probe_hash(board_hash)
+            if stats is not None:
+                counts = stats.move_counts
+                return sorted(
+                    moves,
+                    key=lambda move: (
+                        move != tt_best,
+                        -counts[move],
+                        self._move_order.index(move),
+                    ),
+                )
+
         # Sort by: TT best move first, then center preference
         def move_priority(move: int) -> int:
             if move == tt_best:
-                return -100  # Highest priority
-            try:
-                return -self._move_order.index(move)
-            except ValueError:
-                return 0
+                return -1  # Highest priority
+            return self._move_order.index(move)
 
         return sorted(moves, key=move_priority)
 
@@ -266,34 +642,36 @@ class MinimaxBot(AbstractBot):
         score = 0.0
         num_rows = board.num_rows
         num_cols = board.num_cols
+        # One cached tuple instead of a native call per cell
+        cells = board.cell_states
 
         # Horizontal windows
         for row in range(num_rows):
             for col in range(num_cols - 3):
-                window = [board[col + i, row] for i in range(4)]
+                window = [cells[col + i][row] for i in range(4)]
                 score += self._score_window(window)
 
         # Vertical windows
         for col in range(num_cols):
+            column = cells[col]
             for row in range(num_rows - 3):
-                window = [board[col, row + i] for i in range(4)]
-                score += self._score_window(window)
+                score += self._score_window(column[row : row + 4])
 
         # Positive diagonal (bottom-left to top-right)
         for row in range(num_rows - 3):
             for col in range(num_cols - 3):
-                window = [board[col + i, row + i] for i in range(4)]
+                window = [cells[col + i][row + i] for i in range(4)]
                 score += self._score_window(window)
 
         # Negative diagonal (top-left to bottom-right)
         for row in range(3, num_rows):
             for col in range(num_cols - 3):
-                window = [board[col + i, row - i] for i in range(4)]
+                window = [cells[col + i][row - i] for i in range(4)]
                 score += self._score_window(window)
 
         return score
 
-    def _score_window(self, window: list) -> float:
+    def _score_window(self, window: Sequence[Optional[CellState]]) -> float:
         """Score a window of 4 cells."""
         player_count = sum(1 for cell in window if cell == self.player)
         opponent_count = sum(1 for cell in window if cell == self.opponent)
@@ -312,7 +690,7 @@ class MinimaxBot(AbstractBot):
         elif opponent_count == 4:
             return -self._window_scores[4]
         elif opponent_count == 3 and empty_count == 1:
-            return -self._window_scores[3] * 1.1  # Slightly prioritize blocking
+            return -self._window_scores[3] * self.block_weight  # Prioritize blocking
         elif opponent_count == 2 and empty_count == 2:
             return -self._window_scores[2]
 
@@ -324,11 +702,10 @@ class MinimaxBot(AbstractBot):
         center_count = 0
         opponent_center = 0
 
-        for row in range(board.num_rows):
-            cell = board[center_col, row]
+        for cell in board.cell_states[center_col]:
             if cell == self.player:
                 center_count += 1
             elif cell == self.opponent:
                 opponent_center += 1
 
-        return (center_count - opponent_center) * 3
+        return (center_count - opponent_center) * self.center_weight
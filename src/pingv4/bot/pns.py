@@ -0,0 +1,315 @@
+from typing import Dict, List, Optional, Tuple
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+from pingv4.bot.minimax import MinimaxBot
+
+# Proof and disproof numbers are capped here; a number this large means
+# the node is solved the other way
+INFINITY = 1 << 40
+
+# 1+epsilon trick (Pawlewicz & Lew): a child may run until its delta exceeds
+# the second-best sibling's by this fraction, which saves many re-expansions
+# when two siblings have similar numbers
+EPSILON = 0.25
+
+# Children are searched center-first when their numbers tie
+_CENTER_ORDER = {col: i for i, col in enumerate([3, 2, 4, 1, 5, 0, 6])}
+
+
+class _BudgetExhausted(Exception):
+    """Raised inside the search to unwind once the node budget is spent."""
+
+
+class PNSBot(AbstractBot):
+    """
+    Proves forced wins with depth-first proof-number search (df-pn).
+
+    Proof-number search grows the tree towards the moves that are cheapest
+    to prove or refute instead of searching every line to a fixed depth, so
+    it finds long forced wins on narrow, nearly full boards that a
+    depth-limited alpha-beta search misses. Once at most ``max_empty`` cells
+    are empty, each move first tries to prove a win for the bot; if the win
+    is disproved or the node budget runs out, the move comes from a
+    ``MinimaxBot`` instead.
+
+    Features:
+    - df-pn with the 1+epsilon trick, plus immediate-win and forced-block
+      detection on bitboards
+    - Bounded proof table, pruned of its cheapest subtrees when full
+    - Proofs kept across moves and games
+    - Alpha-beta fallback (with pondering) for everything it can't prove
+    """
+
+    def __init__(
+        self,
+        player: CellState,
+        max_empty: int = 24,
+        node_budget: int = 200_000,
+        max_table_entries: int = 1_000_000,
+        fallback_depth: int = 6,
+    ) -> None:
+        """
+        :param player: The CellState (Red or Yellow) this bot is playing as
+        :type player: CellState
+        :param max_empty: Try to prove a win once at most this many cells are empty
+        :type max_empty: int
+        :param node_budget: Nodes one proof attempt may expand
+        :type node_budget: int
+        :param max_table_entries: Size at which the proof table is pruned
+        :type max_table_entries: int
+        :param fallback_depth: ``max_depth`` of the fallback ``MinimaxBot``
+        :type fallback_depth: int
+        """
+        super().__init__(player)
+        self.max_empty = max_empty
+        self.node_budget = node_budget
+        self.max_table_entries = max_table_entries
+        self.fallback = MinimaxBot(player, max_depth=fallback_depth)
+
+        # Nodes visited by the last get_move call, fallback search included
+        self.nodes = 0
+        # Result of the last proof attempt: True if the side to move wins,
+        # False if it doesn't, None if the budget ran out
+        self.proved: Optional[bool] = None
+
+        # hash -> (phi, delta, work) from the point of view of the side to
+        # move: phi is its proof number if it is the attacker, otherwise its
+        # disproof number, and delta is the other one. work is the number of
+        # nodes spent on the position, used to decide what to prune.
+        self._table: Dict[int, Tuple[int, int, int]] = {}
+        # Player the table entries try to prove a win for
+        self._attacker: Optional[CellState] = None
+
+    @property
+    def strategy_name(self) -> str:
+        return f"PNSBot (empty<={self.max_empty})"
+
+    @property
+    def author_name(self) -> str:
+        return "Pingv4"
+
+    @property
+    def author_netid(self) -> str:
+        return "pingv4"
+
+    def get_move(self, board: ConnectFourBoard) -> int:
+        """Play a proven win if one is found, otherwise the fallback's move."""
+        empty = board.num_rows * board.num_cols - board.num_moves
+        self.proved = None
+        self.nodes = 0
+        if empty <= self.max_empty:
+            move = self._proven_move(board)
+            pns_nodes = self.nodes
+            if move is not None:
+                return move
+        else:
+            pns_nodes = 0
+
+        move = self.fallback.get_move(board)
+        self.nodes = pns_nodes + self.fallback.nodes
+        return move
+
+    def prove(self, board: ConnectFourBoard) -> Optional[bool]:
+        """
+        Decide whether the player to move can force a win.
+
+        :param board: The position to solve
+        :type board: ConnectFourBoard
+        :return: True if the player to move wins with best play, False if the
+            opponent wins or the game is drawn, None if the node budget ran out
+        :rtype: Optional[bool]
+        """
+        if not board.is_in_progress:
+            return False
+
+        attacker = board.current_player
+        if attacker != self._attacker:
+            # Entries are only valid for the attacker they were computed for
+            self._table.clear()
+            self._attacker = attacker
+
+        self.nodes = 0
+        try:
+            phi, _ = self._mid(board, True, INFINITY, INFINITY)
+        except _BudgetExhausted:
+            self.proved = None
+        else:
+            self.proved = phi == 0
+        return self.proved
+
+    def prepare(self, time_budget: float) -> None:
+        self.fallback.prepare(time_budget)
+
+    def on_new_game(self) -> None:
+        # Proofs are exact, so the table stays valid across games
+        self.fallback.on_new_game()
+
+    def ponder(self, board: ConnectFourBoard) -> None:
+        self.fallback.ponder(board)
+
+    def stop_pondering(self) -> None:
+        self.fallback.stop_pondering()
+
+    def _proven_move(self, board: ConnectFourBoard) -> Optional[int]:
+        """A move that keeps a proven win, or None if none was proven."""
+        if not self.prove(board):
+            return None
+
+        for col in _center_first(board.get_valid_moves()):
+            child = board.make_move(col)
+            if child.is_victory:
+                return col
+            # A won child is a disproved node for the defender to move there
+            entry = self._table.get(child.hash)
+            if entry is not None and entry[1] == 0:
+                return col
+        # The proof was pruned from the table before it could be read back
+        return None
+
+    def _mid(
+        self, board: ConnectFourBoard, or_node: bool, phi_t: int, delta_t: int
+    ) -> Tuple[int, int]:
+        """
+        Expand ``board`` until its (phi, delta) reaches either threshold.
+
+        :param board: A position in progress
+        :type board: ConnectFourBoard
+        :param or_node: True if the attacker is to move
+        :type or_node: bool
+        :param phi_t: Threshold for phi
+        :type phi_t: int
+        :param delta_t: Threshold for delta
+        :type delta_t: int
+        :return: The new (phi, delta) of ``board``
+        :rtype: Tuple[int, int]
+        """
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            raise _BudgetExhausted
+        start_nodes = self.nodes
+        board_hash = board.hash
+
+        moves = _candidate_moves(board)
+        if moves is None:
+            # The player to move wins on the spot
+            return self._store(board_hash, 0, INFINITY, 1)
+        if not moves:
+            # The opponent has two threats the player to move can't both block
+            return self._store(board_hash, INFINITY, 0, 1)
+
+        # A draw is a failed proof: phi is INFINITY at an OR node (the
+        # attacker can't win) and 0 at an AND node (the defender has held)
+        draw = (0, INFINITY) if or_node else (INFINITY, 0)
+        children: List[ConnectFourBoard] = []
+        fixed: List[Optional[Tuple[int, int]]] = []
+        for col in moves:
+            child = board.make_move(col)
+            children.append(child)
+            fixed.append(None if child.is_in_progress else draw)
+        hashes = [child.hash for child in children]
+
+        table = self._table
+        while True:
+            # phi is the cheapest child delta, delta the sum of child phis
+            phi = INFINITY
+            delta = 0
+            second = INFINITY
+            best = 0
+            best_phi = 0
+            for i, child_hash in enumerate(hashes):
+                value = fixed[i]
+                if value is None:
+                    value = table.get(child_hash, (1, 1, 0))
+                child_phi, child_delta = value[0], value[1]
+                delta += child_phi
+                if child_delta < phi:
+                    second = phi
+                    phi = child_delta
+                    best = i
+                    best_phi = child_phi
+                elif child_delta < second:
+                    second = child_delta
+            delta = min(delta, INFINITY)
+
+            if phi >= phi_t or delta >= delta_t:
+                break
+            self._mid(
+                children[best],
+                not or_node,
+                min(delta_t + best_phi - delta, INFINITY),
+                min(phi_t, int(second * (1 + EPSILON)) + 1),
+            )
+            # The recursive call may have pruned the table
+            table = self._table
+
+        return self._store(board_hash, phi, delta, self.nodes - start_nodes + 1)
+
+    def _store(
+        self, board_hash: int, phi: int, delta: int, work: int
+    ) -> Tuple[int, int]:
+        if len(self._table) >= self.max_table_entries:
+            self._prune_table()
+        self._table[board_hash] = (phi, delta, work)
+        return phi, delta
+
+    def _prune_table(self) -> None:
+        """
+        Drop the half of the table with the least work behind it.
+
+        Small subtrees are cheap to search again, while the entries near the
+        root of a long proof stand for most of the work done so far.
+        """
+        works = sorted(entry[2] for entry in self._table.values())
+        cutoff = works[len(works) // 2]
+        self._table = {
+            board_hash: entry
+            for board_hash, entry in self._table.items()
+            if entry[2] > cutoff
+        }
+
+
+def _center_first(moves: List[int]) -> List[int]:
+    return sorted(moves, key=lambda col: _CENTER_ORDER.get(col, len(_CENTER_ORDER)))
+
+
+def _candidate_moves(board: ConnectFourBoard) -> Optional[List[int]]:
+    """
+    Moves worth searching in ``board``.
+
+    :return: None if the player to move can win immediately, the single
+        blocking move if the opponent threatens to win in one playable cell,
+        an empty list if it threatens more than one, and otherwise every legal
+        move center-first
+    :rtype: Optional[List[int]]
+    """
+    player = board.current_player
+    opponent = CellState.Yellow if player == CellState.Red else CellState.Red
+    own = board.mask(player)
+    theirs = board.mask(opponent)
+    stride = board.num_rows + 1
+
+    moves = _center_first(board.get_valid_moves())
+    heights = board.column_heights
+    blocks: List[int] = []
+    for col in moves:
+        cell = 1 << (col * stride + heights[col])
+        if _has_four(own | cell, stride):
+            return None
+        if _has_four(theirs | cell, stride):
+            blocks.append(col)
+
+    if blocks:
+        return blocks if len(blocks) == 1 else []
+    return moves
+
+
+def _has_four(mask: int, stride: int) -> bool:
+    """True if the bitboard ``mask`` contains four in a row."""
+    # Vertical, horizontal and both diagonals; the spare bit at the top of
+    # every column keeps runs from wrapping into the next column
+    for shift in (1, stride, stride - 1, stride + 1):
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
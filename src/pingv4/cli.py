@@ -0,0 +1,798 @@
+"""
+Command-line interface: ``pingv4 play | match | watch | bench | solve |
+regress | results | explore | tune | engine``.
+
+Each subcommand imports what it needs when it runs, so headless commands
+never load pygame or pydantic.
+"""
+
+import argparse
+import ast
+import importlib
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+
+if TYPE_CHECKING:
+    from pingv4.explorer import ArchivedGame, PositionStats
+    from pingv4.runner import GameRecord
+    from pingv4.telemetry import Telemetry
+
+BUILTIN_BOTS: Dict[str, str] = {
+    "random": "pingv4.bot.base:RandomBot",
+    "minimax": "pingv4.bot.minimax:MinimaxBot",
+    "mcts": "pingv4.bot.mcts:MCTSBot",
+    "pns": "pingv4.bot.pns:PNSBot",
+}
+
+
+ENGINE_PREFIX = "engine:"
+
+
+def resolve_bot(spec: str) -> Type[AbstractBot]:
+    """
+    Resolve a bot name or import path to an ``AbstractBot`` subclass.
+
+    Args:
+        spec: A built-in name (``random``, ``minimax``, ``mcts``, ``pns``), an
+            import path such as ``my_bots.greedy:GreedyBot``, or
+            ``engine:<command>`` for an external engine process.
+
+    Raises:
+        ValueError: If the spec cannot be imported or is not a bot class.
+    """
+    if spec.startswith(ENGINE_PREFIX):
+        from pingv4.engine import EngineBot
+
+        command = spec[len(ENGINE_PREFIX) :]
+        if not command.strip():
+            raise ValueError(f"invalid bot {spec!r}: missing engine command")
+        return EngineBot.for_command(command)
+
+    path = BUILTIN_BOTS.get(spec.lower(), spec)
+    module_name, sep, attr = path.partition(":")
+    if not sep:
+        module_name, _, attr = path.rpartition(".")
+    if not module_name or not attr:
+        raise ValueError(
+            f"invalid bot {spec!r}: expected one of {sorted(BUILTIN_BOTS)} "
+            "or 'module:Class'"
+        )
+
+    try:
+        bot_cls = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"cannot import bot {spec!r}: {e}") from e
+
+    if not (isinstance(bot_cls, type) and issubclass(bot_cls, AbstractBot)):
+        raise ValueError(f"{spec!r} is not an AbstractBot subclass")
+    return bot_cls
+
+
+def _random_positions(rng: random.Random, count: int) -> List[ConnectFourBoard]:
+    """In-progress positions reached by 0-20 random plies."""
+    positions = []
+    while len(positions) < count:
+        board = ConnectFourBoard()
+        for _ in range(rng.randint(0, 20)):
+            board = board.make_move(rng.choice(board.get_valid_moves()))
+            if not board.is_in_progress:
+                break
+        if board.is_in_progress:
+            positions.append(board)
+    return positions
+
+
+def _write_telemetry(telemetry: "Telemetry", path: str) -> None:
+    """Append JSON lines, or overwrite with Prometheus text for ``.prom``."""
+    if path.endswith(".prom"):
+        with open(path, "w") as f:
+            f.write(telemetry.to_prometheus())
+    else:
+        with open(path, "a") as f:
+            telemetry.write_json_lines(f)
+
+
+def _cmd_play(args: argparse.Namespace) -> int:
+    from pingv4.game import Connect4Game, GameConfig
+    from pingv4.telemetry import Telemetry
+
+    player1 = None if args.player1 == "human" else resolve_bot(args.player1)
+    player2 = None if args.player2 == "human" else resolve_bot(args.player2)
+    config = GameConfig(
+        bot_delay_seconds=args.bot_delay, show_telemetry=args.show_telemetry
+    )
+    telemetry = Telemetry()
+    Connect4Game(
+        player1=player1, player2=player2, config=config, telemetry=telemetry
+    ).run()
+    if args.telemetry:
+        _write_telemetry(telemetry, args.telemetry)
+    return 0
+
+
+def _cmd_match(args: argparse.Namespace) -> int:
+    from pingv4.notation import format_moves
+    from pingv4.runner import BotRoster, play_game, play_games
+    from pingv4.telemetry import Telemetry
+
+    if args.batch_size is not None and args.ponder:
+        raise ValueError("--ponder cannot be combined with --batch-size")
+
+    telemetry = Telemetry() if args.telemetry else None
+    bot1 = resolve_bot(args.bot1)
+    bot2 = resolve_bot(args.bot2)
+
+    cache = None
+    if args.memo is not None:
+        from pingv4.bot.memo import MoveCache, memoize
+
+        # Only deterministic bots are wrapped; the others play as usual
+        cache = MoveCache(path=args.memo or None)
+        bot1 = memoize(bot1, cache) if bot1.deterministic else bot1
+        bot2 = memoize(bot2, cache) if bot2.deterministic else bot2
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    store = None
+    if args.results is not None:
+        from pingv4.results import ResultsStore
+
+        store = ResultsStore(args.results)
+
+    # Create and prepare every bot the games will use before the clock starts
+    roster = BotRoster(args.prepare_time)
+    for game_idx in range(min(args.games, 2)):
+        red_cls, yellow_cls = (bot1, bot2) if game_idx % 2 == 0 else (bot2, bot1)
+        roster.get(red_cls, CellState.Red)
+        roster.get(yellow_cls, CellState.Yellow)
+
+    wins = [0, 0]
+    draws = 0
+    start = time.perf_counter()
+
+    def bots(bot1_is_red: bool) -> Tuple[AbstractBot, AbstractBot]:
+        red_cls, yellow_cls = (bot1, bot2) if bot1_is_red else (bot2, bot1)
+        red = roster.get(red_cls, CellState.Red)
+        return red, roster.get(yellow_cls, CellState.Yellow)
+
+    def play_all() -> Iterator["GameRecord"]:
+        # Alternate colors so neither bot always moves first
+        if args.batch_size is None:
+            for game_idx in range(args.games):
+                red, yellow = bots(game_idx % 2 == 0)
+                yield play_game(red, yellow, ponder=args.ponder, telemetry=telemetry)
+            return
+
+        # All games of each coloring at once, with moves batched per bot
+        cohorts = [
+            play_games(
+                *bots(bot1_is_red),
+                num_games,
+                max_batch_size=args.batch_size,
+                max_wait_ms=args.max_wait_ms,
+                telemetry=telemetry,
+            )
+            for bot1_is_red, num_games in (
+                (True, (args.games + 1) // 2),
+                (False, args.games // 2),
+            )
+        ]
+        for game_idx in range(args.games):
+            yield cohorts[game_idx % 2][game_idx // 2]
+
+    for game_idx, record in enumerate(play_all()):
+        bot1_is_red = game_idx % 2 == 0
+        if record.winner is None:
+            draws += 1
+            outcome = "draw"
+        else:
+            bot1_won = (record.winner == CellState.Red) == bot1_is_red
+            wins[0 if bot1_won else 1] += 1
+            outcome = f"{'bot1' if bot1_won else 'bot2'} wins"
+            if record.forfeited_by is not None:
+                outcome += " (forfeit)"
+        if store is not None:
+            # Bots are recorded under their command-line names
+            red_name, yellow_name = (
+                (args.bot1, args.bot2) if bot1_is_red else (args.bot2, args.bot1)
+            )
+            store.add(red_name, yellow_name, record, args.tournament)
+
+        if args.verbose:
+            colors = "bot1=Red" if bot1_is_red else "bot1=Yellow"
+            print(
+                f"game {game_idx + 1}: {colors} {outcome} {format_moves(record.moves)}"
+            )
+
+    elapsed = time.perf_counter() - start
+    print(f"bot1 {args.bot1}: {wins[0]} wins")
+    print(f"bot2 {args.bot2}: {wins[1]} wins")
+    print(f"draws: {draws}")
+    print(f"{args.games} games in {elapsed:.2f}s")
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"memo: {stats.hits} hits, {stats.disk_hits} disk hits, "
+            f"{stats.misses} misses ({stats.hit_rate:.1%})"
+        )
+    if telemetry is not None:
+        _write_telemetry(telemetry, args.telemetry)
+    if store is not None:
+        store.close()
+    return 0
+
+
+def _cmd_watch(args: argparse.Namespace) -> int:
+    from pingv4.selfplay import Pairing
+    from pingv4.spectator import Spectator, SpectatorConfig
+
+    bot1 = resolve_bot(args.bot1)
+    bot2 = resolve_bot(args.bot2)
+    # Alternate colors across boards, as in match
+    pairings = [
+        Pairing(bot1, bot2) if idx % 2 == 0 else Pairing(bot2, bot1)
+        for idx in range(args.boards)
+    ]
+    config = SpectatorConfig(
+        move_delay_seconds=args.move_delay,
+        animation_frames=0 if args.no_animation else SpectatorConfig().animation_frames,
+    )
+    Spectator(pairings, config=config, workers=args.workers).run()
+    return 0
+
+
+def _thread_scaling(
+    label: str, task: Callable[[ConnectFourBoard], object], jobs: list, max_threads: int
+) -> None:
+    """Time ``task`` over ``jobs`` on thread pools of doubling size."""
+    threads = 1
+    base_rate = None
+    while threads <= max_threads:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(task, jobs))
+        rate = len(jobs) / (time.perf_counter() - start)
+        base_rate = base_rate or rate
+        print(
+            f"{label} threads={threads:<3} {rate:>10,.1f} jobs/s "
+            f"x{rate / base_rate:.2f}"
+        )
+        threads *= 2
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    positions = _random_positions(rng, args.positions)
+
+    start = time.perf_counter()
+    moves = 0
+    for board in positions:
+        for col in board.get_valid_moves():
+            board.make_move(col)
+            moves += 1
+    elapsed = time.perf_counter() - start
+    print(f"make_move:        {moves / elapsed:>12,.0f} moves/s")
+
+    board = ConnectFourBoard()
+    start = time.perf_counter()
+    board.random_playouts(args.playouts, args.seed, args.threads)
+    elapsed = time.perf_counter() - start
+    print(f"random_playouts:  {args.playouts / elapsed:>12,.0f} playouts/s")
+
+    if args.bot:
+        bot_cls = resolve_bot(args.bot)
+        latencies = []
+        nodes = 0
+        for board in positions:
+            bot = bot_cls(board.current_player)
+            start = time.perf_counter()
+            bot.get_move(board)
+            latencies.append((time.perf_counter() - start) * 1000)
+            # Searching bots such as MinimaxBot report nodes per get_move
+            nodes += getattr(bot, "nodes", 0)
+
+        print(
+            f"{args.bot} get_move: mean {statistics.mean(latencies):.1f}ms, "
+            f"median {statistics.median(latencies):.1f}ms, "
+            f"max {max(latencies):.1f}ms over {len(latencies)} positions"
+        )
+        if nodes:
+            print(f"{args.bot} nodes: {nodes:,} total")
+
+    if args.scaling:
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print(f"thread scaling ({'GIL enabled' if gil else 'free-threaded'})")
+        _thread_scaling(
+            "perft(5)", lambda board: board.perft(5), positions, args.scaling
+        )
+
+        bot_cls = resolve_bot(args.bot or "minimax")
+
+        def search(board: ConnectFourBoard) -> int:
+            # Bots aren't shared between threads: one per job
+            return bot_cls(board.current_player).get_move(board)
+
+        _thread_scaling(f"{bot_cls.__name__}.get_move", search, positions, args.scaling)
+    return 0
+
+
+def _format_entry(outcome: int, distance: int) -> str:
+    if outcome > 0:
+        return f"win in {distance}"
+    if outcome < 0:
+        return f"loss in {distance}"
+    return "draw"
+
+
+def _cmd_solve(args: argparse.Namespace) -> int:
+    from pingv4.endgame import EndgameTable, count_empty, solve_position
+    from pingv4.notation import board_from_moves
+
+    board = board_from_moves(args.moves)
+    print(board)
+
+    if not board.is_in_progress:
+        if board.is_victory:
+            print("winner:", "red" if board.winner == CellState.Red else "yellow")
+        else:
+            print("winner: draw")
+        return 0
+
+    table = EndgameTable(args.table) if args.table else None
+    empty = count_empty(board)
+
+    if table is None and empty > args.exact_limit:
+        from pingv4.bot.minimax import MinimaxBot
+
+        bot = MinimaxBot(board.current_player, max_depth=args.depth)
+        move = bot.get_move(board)
+        print(f"{empty} empty cells: heuristic search at depth {args.depth}")
+        print(f"best move: {move}")
+        return 0
+
+    # Score every move for the player to move
+    for col in board.get_valid_moves():
+        child = board.make_move(col)
+        if child.is_victory:
+            result = "win in 1"
+        elif child.is_draw:
+            result = "draw"
+        else:
+            entry = table.probe(child) if table is not None else None
+            if entry is None and count_empty(child) <= args.exact_limit:
+                entry = solve_position(child)
+            if entry is None:
+                result = "unknown"
+            else:
+                result = _format_entry(-entry.outcome, entry.distance + 1)
+        print(f"{col}: {result}")
+
+    if table is not None:
+        table.close()
+    return 0
+
+
+def _parse_bot_options(options: List[str]) -> Dict[str, object]:
+    """Parse ``key=value`` constructor arguments; values are Python literals."""
+    kwargs: Dict[str, object] = {}
+    for option in options:
+        key, sep, value = option.partition("=")
+        if not sep or not key:
+            raise ValueError(f"invalid --set {option!r}: expected key=value")
+        try:
+            kwargs[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            kwargs[key] = value  # bare strings such as search=pvs
+    return kwargs
+
+
+def _cmd_regress(args: argparse.Namespace) -> int:
+    from pingv4.regression import (
+        ALL_PHASES,
+        compare,
+        load_baseline,
+        load_suite,
+        run_suite,
+        save_baseline,
+        summarize,
+    )
+
+    bot_cls = resolve_bot(args.bot)
+    bot_kwargs = _parse_bot_options(args.set)
+    positions = load_suite(args.suite)
+    results = run_suite(bot_cls, positions, args.workers, bot_kwargs)
+    summary = summarize(results)
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    print(f"{'phase':<12}{'positions':>10}{'accuracy':>10}{'mean ms':>10}{'nodes':>12}")
+    for phase, stats in summary.items():
+        nodes = stats["mean_nodes"]
+        line = (
+            f"{phase:<12}{stats['positions']:>10}{stats['accuracy']:>10.1%}"
+            f"{stats['mean_ms']:>10.1f}{'-' if nodes is None else f'{nodes:,.0f}':>12}"
+        )
+        if baseline is not None and phase in baseline:
+            base = baseline[phase]
+            line += (
+                f"   ({stats['accuracy'] - base['accuracy']:+.1%}, "
+                f"{stats['mean_ms'] - base['mean_ms']:+.1f}ms)"
+            )
+        print(line)
+
+    if baseline is not None:
+        print(f"vs baseline: {compare(summary, baseline)}")
+    if args.save:
+        save_baseline(summary, args.save, bot=args.bot)
+
+    # Non-zero exit on a clear regression, for CI
+    return 1 if baseline is not None and compare(summary, baseline) == "worse" else 0
+
+
+def _cmd_results(args: argparse.Namespace) -> int:
+    from pingv4.results import ResultsStore
+
+    with ResultsStore(args.path) as store:
+        if args.pgn:
+            with open(args.pgn, "w") as f:
+                count = store.export_pgn(f, args.tournament)
+            print(f"wrote {count} games to {args.pgn}")
+            return 0
+
+        print(
+            f"{'bot':<24}{'games':>8}{'wins':>8}{'draws':>8}{'losses':>8}"
+            f"{'forfeits':>10}{'score':>8}"
+        )
+        for s in store.standings(args.tournament):
+            print(
+                f"{s.bot:<24}{s.games:>8}{s.wins:>8}{s.draws:>8}{s.losses:>8}"
+                f"{s.forfeits:>10}{s.score:>8.1%}"
+            )
+
+        if args.head_to_head:
+            print()
+            print(
+                f"{'bot':<24}{'opponent':<24}{'color':<8}{'games':>8}"
+                f"{'wins':>8}{'draws':>8}{'losses':>8}"
+            )
+            for h in store.head_to_head(args.head_to_head, args.tournament):
+                print(
+                    f"{h.bot:<24}{h.opponent:<24}{h.color:<8}{h.games:>8}"
+                    f"{h.wins:>8}{h.draws:>8}{h.losses:>8}"
+                )
+
+        if args.openings:
+            print()
+            print(
+                f"{'opening':<10}{'games':>8}{'red':>8}{'draw':>8}{'yellow':>8}"
+                f"{'red score':>11}"
+            )
+            for o in store.openings(tournament=args.tournament)[: args.openings]:
+                print(
+                    f"{o.opening or '-':<10}{o.games:>8}{o.red_wins:>8}{o.draws:>8}"
+                    f"{o.yellow_wins:>8}{o.red_score:>11.1%}"
+                )
+
+        if args.phases:
+            print()
+            print(
+                f"{'bot':<24}{'phase':<12}{'moves':>8}{'mean ms':>10}"
+                f"{'max ms':>10}{'forfeits':>10}"
+            )
+            for p in store.phase_latency(tournament=args.tournament):
+                print(
+                    f"{p.bot:<24}{p.phase:<12}{p.moves:>8}{p.mean_ms:>10.1f}"
+                    f"{p.max_ms:>10.1f}{p.forfeits:>10}"
+                )
+    return 0
+
+
+def _archived_games(sources: Sequence[str]) -> Iterator["ArchivedGame"]:
+    """Games of results stores and of text files with one move string per line."""
+    from pingv4.results import ResultsStore
+
+    for source in sources:
+        with open(source, "rb") as f:
+            is_sqlite = f.read(16) == b"SQLite format 3\x00"
+        if is_sqlite:
+            with ResultsStore(source) as store:
+                yield from store.games()
+        else:
+            with open(source) as f:
+                yield from (line.strip() for line in f if line.strip())
+
+
+def _cmd_explore(args: argparse.Namespace) -> int:
+    from pingv4.explorer import ExplorerIndex, build_explorer_index
+    from pingv4.notation import board_from_moves
+
+    if args.build:
+        count = build_explorer_index(
+            args.index, _archived_games(args.build), max_plies=args.max_plies
+        )
+        print(f"indexed {count:,} positions")
+
+    board = board_from_moves(args.moves)
+    print(board)
+    with ExplorerIndex(args.index) as index:
+        stats = index.probe(board)
+        if stats is None:
+            print(f"not reached in any of the {index.num_games:,} games")
+            return 0
+
+        def results(s: "PositionStats") -> str:
+            return (
+                f"{s.red_wins / s.games:>8.1%}{s.draws / s.games:>8.1%}"
+                f"{s.yellow_wins / s.games:>8.1%}"
+            )
+
+        print(f"{'move':<6}{'games':>10}{'red':>8}{'draw':>8}{'yellow':>8}")
+        print(f"{'-':<6}{stats.games:>10,}{results(stats)}")
+        for col, games in stats.top_moves(args.top):
+            # Counts after the move include games that transposed into it
+            child = index.probe(board.make_move(col))
+            line = f"{col:<6}{games:>10,}"
+            print(line + results(child) if child is not None else line)
+    return 0
+
+
+def _cmd_tune(args: argparse.Namespace) -> int:
+    from pingv4.bot.minimax import EvalWeights
+    from pingv4.tuning import load_positions, tune
+
+    initial = EvalWeights.load(args.initial) if args.initial else EvalWeights()
+    hashes, results = load_positions(args.shards)
+    tuned = tune(hashes, results, initial=initial, epochs=args.epochs)
+    print(
+        f"{tuned.train_positions:,} positions, "
+        f"{tuned.validation_positions:,} held out, k = {tuned.k:.5f}"
+    )
+    print(f"validation loss {tuned.loss_before:.5f} -> {tuned.loss_after:.5f}")
+    print(f"{'weight':<8}{'before':>10}{'after':>10}")
+    for name in ("three", "two", "block", "center"):
+        before, after = getattr(initial, name), getattr(tuned.weights, name)
+        print(f"{name:<8}{before:>10.3f}{after:>10.3f}")
+    tuned.weights.save(args.out)
+    print(f"wrote {args.out}")
+    return 0
+
+
+def _cmd_engine(args: argparse.Namespace) -> int:
+    from pingv4.engine import serve
+
+    serve(resolve_bot(args.bot))
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pingv4", description="Connect Four engine and bot framework."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bot_help = (
+        "built-in bot (random, minimax, mcts, pns), module:Class or engine:COMMAND"
+    )
+    telemetry_help = "write metrics on exit: JSON lines, or Prometheus text for .prom"
+
+    play = subparsers.add_parser("play", help="play in the graphical interface")
+    play.add_argument(
+        "player1", nargs="?", default="human", help=f"'human' or {bot_help}"
+    )
+    play.add_argument(
+        "player2", nargs="?", default="minimax", help=f"'human' or {bot_help}"
+    )
+    play.add_argument("--bot-delay", type=float, default=1.0, metavar="SECONDS")
+    play.add_argument(
+        "--show-telemetry", action="store_true", help="start with the overlay on"
+    )
+    play.add_argument("--telemetry", default=None, metavar="PATH", help=telemetry_help)
+    play.set_defaults(func=_cmd_play)
+
+    match = subparsers.add_parser("match", help="play headless games between bots")
+    match.add_argument("bot1", help=bot_help)
+    match.add_argument("bot2", help=bot_help)
+    match.add_argument("-n", "--games", type=int, default=10)
+    match.add_argument("--seed", type=int, default=None)
+    match.add_argument(
+        "--ponder", action="store_true", help="let bots think on the opponent's time"
+    )
+    match.add_argument(
+        "--prepare-time",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="setup time each bot gets before the first game (default: 2)",
+    )
+    match.add_argument("-v", "--verbose", action="store_true")
+    match.add_argument(
+        "--memo",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="reuse moves of deterministic bots across games; "
+        "PATH adds a persistent SQLite cache",
+    )
+    match.add_argument("--telemetry", default=None, metavar="PATH", help=telemetry_help)
+    match.add_argument(
+        "--results",
+        default=None,
+        metavar="PATH",
+        help="record the games in a SQLite results store",
+    )
+    match.add_argument("--tournament", default="", help="label for the recorded games")
+    match.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="play all games at once, passing bots up to N positions per get_moves",
+    )
+    match.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=50.0,
+        help="with --batch-size, longest a position waits for its batch to fill",
+    )
+    match.set_defaults(func=_cmd_match)
+
+    watch = subparsers.add_parser("watch", help="watch many bot games at once")
+    watch.add_argument("bot1", help=bot_help)
+    watch.add_argument("bot2", help=bot_help)
+    watch.add_argument(
+        "-n", "--boards", type=int, default=16, help="games shown at once"
+    )
+    watch.add_argument(
+        "-j", "--workers", type=int, default=None, help="worker processes"
+    )
+    watch.add_argument(
+        "--move-delay",
+        type=float,
+        default=0.3,
+        help="minimum seconds between moves on a board (0 for full speed)",
+    )
+    watch.add_argument(
+        "--no-animation", action="store_true", help="place pieces without dropping"
+    )
+    watch.set_defaults(func=_cmd_watch)
+
+    bench = subparsers.add_parser("bench", help="benchmark the board and a bot")
+    bench.add_argument("--bot", default=None, help=bot_help)
+    bench.add_argument("--positions", type=int, default=50)
+    bench.add_argument("--playouts", type=int, default=100_000)
+    bench.add_argument("--threads", type=int, default=1)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument(
+        "--scaling",
+        type=int,
+        default=0,
+        metavar="MAX_THREADS",
+        help="measure perft and bot search on 1, 2, 4, ... MAX_THREADS threads",
+    )
+    bench.set_defaults(func=_cmd_bench)
+
+    solve = subparsers.add_parser("solve", help="evaluate every move in a position")
+    solve.add_argument("moves", nargs="?", default="", help="move string, e.g. 3342")
+    solve.add_argument(
+        "--exact-limit",
+        type=int,
+        default=12,
+        help="solve exactly at or below this many empty cells",
+    )
+    solve.add_argument("--depth", type=int, default=8, help="heuristic search depth")
+    solve.add_argument("--table", default=None, help="endgame table to probe")
+    solve.set_defaults(func=_cmd_solve)
+
+    regress = subparsers.add_parser(
+        "regress", help="score a bot on positions with known best moves"
+    )
+    regress.add_argument("bot", help=bot_help)
+    regress.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="bot constructor argument, e.g. --set max_depth=8 (repeatable)",
+    )
+    regress.add_argument(
+        "-j", "--workers", type=int, default=None, help="worker processes"
+    )
+    regress.add_argument("--suite", default=None, help="suite file (default: bundled)")
+    regress.add_argument("--baseline", default=None, help="JSON baseline to compare")
+    regress.add_argument("--save", default=None, help="write this run as a baseline")
+    regress.set_defaults(func=_cmd_regress)
+
+    results = subparsers.add_parser(
+        "results", help="standings and statistics from a results store"
+    )
+    results.add_argument("path", help="SQLite file written by match --results")
+    results.add_argument("--tournament", default=None, help="only this tournament")
+    results.add_argument(
+        "--head-to-head", default=None, metavar="BOT", help="BOT's record by opponent"
+    )
+    results.add_argument(
+        "--openings", type=int, default=0, metavar="N", help="N most played openings"
+    )
+    results.add_argument(
+        "--phases", action="store_true", help="move times and forfeits by game phase"
+    )
+    results.add_argument(
+        "--pgn",
+        default=None,
+        metavar="PATH",
+        help="export games as PGN for rating tools",
+    )
+    results.set_defaults(func=_cmd_results)
+
+    explore = subparsers.add_parser(
+        "explore", help="results and most played moves of a position in past games"
+    )
+    explore.add_argument("index", help="explorer index file")
+    explore.add_argument("moves", nargs="?", default="", help="move string, e.g. 3342")
+    explore.add_argument(
+        "--top", type=int, default=7, help="most played moves to show (default: 7)"
+    )
+    explore.add_argument(
+        "--build",
+        nargs="+",
+        default=None,
+        metavar="SOURCE",
+        help="first build the index from results stores or files of move strings",
+    )
+    explore.add_argument(
+        "--max-plies",
+        type=int,
+        default=42,
+        help="with --build, index positions with at most this many pieces",
+    )
+    explore.set_defaults(func=_cmd_explore)
+
+    tune = subparsers.add_parser(
+        "tune", help="fit minimax evaluation weights to self-play results"
+    )
+    tune.add_argument("shards", nargs="+", help="self-play shard files")
+    tune.add_argument(
+        "-o",
+        "--out",
+        default="weights.json",
+        help="output file (default: weights.json)",
+    )
+    tune.add_argument(
+        "--initial", default=None, metavar="PATH", help="weights to start from"
+    )
+    tune.add_argument("--epochs", type=int, default=500)
+    tune.set_defaults(func=_cmd_tune)
+
+    engine = subparsers.add_parser(
+        "engine", help="serve a bot over the engine protocol on stdin/stdout"
+    )
+    engine.add_argument("bot", help=bot_help)
+    engine.set_defaults(func=_cmd_engine)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the ``pingv4`` console script."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        parser.exit(2, f"pingv4 {args.command}: error: {e}\n")
@@ -0,0 +1,244 @@
+"""
+Exact endgame tables for positions with few empty cells.
+
+The builder solves every position reachable from a set of seed games once the
+board has at most ``max_empty`` empty cells and writes the results to a flat
+file of fixed-size records sorted by ``board.hash``. ``EndgameTable`` maps that
+file into memory and answers probes with a binary search, so a table of any
+size can be queried without reading it into RAM.
+"""
+
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pingv4._core import ConnectFourBoard
+from pingv4._mapped import MappedTable, write_table
+from pingv4.notation import MoveSequence, board_from_moves, parse_moves
+
+MAGIC = b"PV4E"
+VERSION = 1
+
+# magic, version, max_empty, (pad), record count
+_HEADER = struct.Struct("<4sHBxQ")
+# board hash, outcome, distance
+_RECORD = struct.Struct("<QbB")
+
+
+class Outcome(IntEnum):
+    """Game-theoretic value of a position for the player to move."""
+
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+class EndgameEntry(NamedTuple):
+    """
+    Exact result of a position under perfect play.
+
+    ``distance`` is the number of plies until the game ends when the winner
+    wins as fast as possible and the loser holds out as long as possible.
+    """
+
+    outcome: Outcome
+    distance: int
+
+
+def count_empty(board: ConnectFourBoard) -> int:
+    """Number of empty cells left on the board."""
+    return board.num_rows * board.num_cols - board.num_moves
+
+
+def _preference(outcome: int, distance: int) -> Tuple[int, int]:
+    # Win fast, lose slow. Draws always last until the board is full.
+    return (outcome, -distance if outcome == Outcome.WIN else distance)
+
+
+def _solve(
+    board: ConnectFourBoard, table: Dict[int, Tuple[int, int]]
+) -> Tuple[int, int]:
+    """Full-width negamax that records every in-progress position it visits."""
+    board_hash = board.hash
+    if board_hash in table:
+        return table[board_hash]
+
+    best: Optional[Tuple[int, int]] = None
+    for move in board.get_valid_moves():
+        child = board.make_move(move)
+        if child.is_victory:
+            result = (Outcome.WIN, 1)
+        elif child.is_draw:
+            result = (Outcome.DRAW, 1)
+        else:
+            child_outcome, child_distance = _solve(child, table)
+            result = (-child_outcome, child_distance + 1)
+
+        if best is None or _preference(*result) > _preference(*best):
+            best = result
+
+    assert best is not None  # in-progress boards always have a valid move
+    table[board_hash] = best
+    return best
+
+
+def solve_position(board: ConnectFourBoard) -> EndgameEntry:
+    """
+    Solve an in-progress board exactly by exhaustive search.
+
+    Only practical for boards with roughly a dozen empty cells or fewer.
+
+    :param board: The position to solve
+    :type board: ConnectFourBoard
+    :return: The result for the player to move
+    :rtype: EndgameEntry
+    :raises ValueError: If the game is already over
+    """
+    if not board.is_in_progress:
+        raise ValueError("game is not in progress")
+    outcome, distance = _solve(board, {})
+    return EndgameEntry(Outcome(outcome), distance)
+
+
+def solve_subtree(moves: MoveSequence) -> List[Tuple[int, int, int]]:
+    """
+    Solve the position reached by ``moves`` and every position below it.
+
+    :param moves: Move sequence leading to the subtree root
+    :type moves: MoveSequence
+    :return: ``(hash, outcome, distance)`` for every in-progress position
+    :rtype: List[Tuple[int, int, int]]
+    """
+    table: Dict[int, Tuple[int, int]] = {}
+    board = board_from_moves(moves)
+    if board.is_in_progress:
+        _solve(board, table)
+    return [(h, int(o), d) for h, (o, d) in table.items()]
+
+
+def _frontier(seed: MoveSequence, max_empty: int) -> Optional[Tuple[int, ...]]:
+    """Prefix of ``seed`` that first reaches ``max_empty`` empty cells."""
+    board = ConnectFourBoard()
+    played: List[int] = []
+    for col in parse_moves(seed):
+        if count_empty(board) <= max_empty:
+            break
+        board = board.make_move(col)
+        played.append(col)
+        if not board.is_in_progress:
+            return None
+
+    if count_empty(board) > max_empty:
+        return None
+    return tuple(played)
+
+
+def build_endgame_table(
+    path: str,
+    seeds: Iterable[MoveSequence],
+    max_empty: int = 8,
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Solve the endgames of a collection of games and write them to ``path``.
+
+    Enumerating every position with ``max_empty`` empty cells from the empty
+    board is far out of reach, so the builder is driven by seed games (for
+    example self-play or tournament records). Each seed is cut at the first
+    position with at most ``max_empty`` empty cells, and the complete subtree
+    below that position is solved by a pool of worker processes.
+
+    Args:
+        path: Output file.
+        seeds: Move sequences; seeds that end before reaching the endgame are
+            ignored.
+        max_empty: Largest number of empty cells stored in the table.
+        workers: Worker process count. Defaults to ``os.cpu_count()``.
+
+    Returns:
+        The number of positions written.
+    """
+    if not 0 <= max_empty <= 255:
+        raise ValueError("max_empty must be between 0 and 255")
+
+    roots = set()
+    for seed in seeds:
+        root = _frontier(seed, max_empty)
+        if root is not None:
+            roots.add(root)
+
+    solved: Dict[int, Tuple[int, int]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for records in pool.map(solve_subtree, sorted(roots), chunksize=16):
+            for board_hash, outcome, distance in records:
+                solved[board_hash] = (outcome, distance)
+
+    write_table(
+        path,
+        _HEADER.pack(MAGIC, VERSION, max_empty, len(solved)),
+        (_RECORD.pack(h, *solved[h]) for h in sorted(solved)),
+    )
+
+    return len(solved)
+
+
+class EndgameTable(MappedTable):
+    """
+    Read-only, memory-mapped view of a table written by ``build_endgame_table``.
+
+    Examples:
+        with EndgameTable("endgame.bin") as table:
+            entry = table.probe(board)
+            if entry is not None and entry.outcome == Outcome.WIN:
+                ...
+    """
+
+    MAGIC = MAGIC
+    VERSION = VERSION
+    HEADER = _HEADER
+    RECORD_SIZE = _RECORD.size
+    KIND = "endgame table"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._max_empty: int = self._fields[2]
+
+    @property
+    def max_empty(self) -> int:
+        """Largest number of empty cells covered by the table."""
+        return self._max_empty
+
+    def probe_hash(self, board_hash: int) -> Optional[EndgameEntry]:
+        """
+        Look up a position by its hash in O(log n).
+
+        Args:
+            board_hash: ``board.hash`` of an in-progress position.
+
+        Returns:
+            The exact result, or None if the position is not in the table.
+        """
+        buf = self._mmap
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, outcome, distance = _RECORD.unpack_from(
+                buf, _HEADER.size + mid * _RECORD.size
+            )
+            if key < board_hash:
+                lo = mid + 1
+            elif key > board_hash:
+                hi = mid
+            else:
+                return EndgameEntry(Outcome(outcome), distance)
+        return None
+
+    def probe(self, board: ConnectFourBoard) -> Optional[EndgameEntry]:
+        """
+        Look up a board. Finished games and boards with more than
+        ``max_empty`` empty cells return None without touching the table.
+        """
+        if not board.is_in_progress or count_empty(board) > self._max_empty:
+            return None
+        return self.probe_hash(board.hash)
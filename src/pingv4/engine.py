@@ -0,0 +1,328 @@
+"""
+Line-based protocol for bots that run as separate processes.
+
+An engine is any program that speaks the protocol below on stdin/stdout,
+one command per line. ``EngineBot`` starts an engine once and keeps it
+running for the lifetime of the bot, and ``serve`` turns any
+``AbstractBot`` into an engine.
+
+Protocol (client to engine, then the engine's reply)::
+
+    init <red|yellow>       id name <strategy name>
+                            id author <author name>
+                            id netid <author netid>
+                            ready
+    prepare <time_ms>       ready
+    newgame                 (no reply)
+    go <time_ms> [<moves>]  bestmove <col>
+    quit                    (engine exits)
+
+``moves`` is the move string from the empty board (see ``pingv4.notation``)
+and is omitted for the empty board. ``time_ms`` is the time the engine may
+spend on this move, or for ``prepare`` on setup before the first game. An
+engine that cannot answer replies ``error <message>`` instead. The ``id``
+lines are optional, and an engine without setup work may reply ``ready`` to
+``prepare`` straight away.
+"""
+
+import contextlib
+import os
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import weakref
+from typing import IO, ClassVar, List, Optional, Sequence, Tuple, Type, Union
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+from pingv4.notation import board_from_moves, format_moves, moves_from_board
+
+COLOR_NAMES = {CellState.Red: "red", CellState.Yellow: "yellow"}
+
+
+class EngineError(RuntimeError):
+    """The engine process exited, timed out, or broke the protocol."""
+
+
+class EngineBot(AbstractBot):
+    """
+    Plays by asking an external engine process for each move.
+
+    The process is started when the bot is created and stopped by ``close``
+    (or when the bot is garbage collected). Use ``for_command`` to get a bot
+    class that ``Connect4Game`` and the runner can instantiate by color.
+
+    Example::
+
+        Engine = EngineBot.for_command("./my_engine --level 3")
+        Connect4Game(player1=None, player2=Engine).run()
+    """
+
+    command: ClassVar[Tuple[str, ...]] = ()
+    time_per_move_ms: ClassVar[int] = 1000
+    # Extra time allowed for startup and for each reply beyond its budget
+    timeout_grace_s: ClassVar[float] = 5.0
+
+    def __init__(
+        self,
+        player: CellState,
+        command: Optional[Union[str, Sequence[str]]] = None,
+        time_per_move_ms: Optional[int] = None,
+    ) -> None:
+        super().__init__(player)
+        if command is not None:
+            self.command = _split_command(command)
+        if time_per_move_ms is not None:
+            self.time_per_move_ms = time_per_move_ms
+        if not self.command:
+            raise ValueError("EngineBot needs a command to run")
+
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._finalizer = weakref.finalize(self, _shutdown, self._process)
+
+        # Reading on a helper thread lets every read have a timeout
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(
+            target=_pump_lines,
+            args=(self._process.stdout, self._lines),
+            name="pingv4-engine-reader",
+            daemon=True,
+        ).start()
+
+        self._name = os.path.basename(self.command[0])
+        self._author = "unknown"
+        self._netid = "unknown"
+        self._handshake()
+
+        # Moves of the current game, kept in sync with the boards we are shown
+        self._moves: List[int] = []
+        self._last_board: Optional[ConnectFourBoard] = None
+
+    @classmethod
+    def for_command(
+        cls,
+        command: Union[str, Sequence[str]],
+        time_per_move_ms: int = 1000,
+        name: Optional[str] = None,
+    ) -> Type["EngineBot"]:
+        """
+        Create an ``EngineBot`` subclass bound to a command.
+
+        Args:
+            command: A shell-style command line or an argument list.
+            time_per_move_ms: Time budget sent with every ``go``.
+            name: Name of the generated class.
+        """
+        return type(
+            name or "EngineBot",
+            (cls,),
+            {
+                "command": _split_command(command),
+                "time_per_move_ms": time_per_move_ms,
+            },
+        )
+
+    @property
+    def strategy_name(self) -> str:
+        return self._name
+
+    @property
+    def author_name(self) -> str:
+        return self._author
+
+    @property
+    def author_netid(self) -> str:
+        return self._netid
+
+    def get_move(self, board: ConnectFourBoard) -> int:
+        moves = self._moves_to(board)
+        self._send(f"go {self.time_per_move_ms} {format_moves(moves)}".rstrip())
+        reply = self._expect(
+            "bestmove", self.time_per_move_ms / 1000 + self.timeout_grace_s
+        )
+        try:
+            col = int(reply)
+        except ValueError:
+            raise EngineError(f"invalid bestmove {reply!r}") from None
+
+        # Remember the position after our move so the next call only has to
+        # work out the opponent's reply
+        if col in board.get_valid_moves():
+            self._moves = moves + [col]
+            self._last_board = board.make_move(col)
+        return col
+
+    def prepare(self, time_budget: float) -> None:
+        """Give the engine ``time_budget`` seconds of setup time."""
+        self._send(f"prepare {int(time_budget * 1000)}")
+        while True:
+            keyword = self._read_line(time_budget + self.timeout_grace_s).split()[0]
+            # Engines written before prepare existed reply with an error
+            if keyword in ("ready", "error"):
+                return
+
+    def on_new_game(self) -> None:
+        """Tell the engine a new game is starting."""
+        self._moves = []
+        self._last_board = None
+        self._send("newgame")
+
+    def close(self) -> None:
+        """Ask the engine to quit, killing it if it doesn't."""
+        self._finalizer()
+
+    def __enter__(self) -> "EngineBot":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _moves_to(self, board: ConnectFourBoard) -> List[int]:
+        """Move sequence reaching ``board``, extending the game we know."""
+        last = self._last_board
+        if last is not None:
+            if board.hash == last.hash:
+                return list(self._moves)
+            for col in last.get_valid_moves():
+                if last.make_move(col).hash == board.hash:
+                    return self._moves + [col]
+        return moves_from_board(board)
+
+    def _handshake(self) -> None:
+        self._send(f"init {COLOR_NAMES[self.player]}")
+        while True:
+            line = self._read_line(self.timeout_grace_s)
+            keyword, _, rest = line.partition(" ")
+            if keyword == "ready":
+                return
+            if keyword == "error":
+                raise EngineError(f"engine error: {rest}")
+            if keyword == "id":
+                field, _, value = rest.partition(" ")
+                if field == "name":
+                    self._name = value
+                elif field == "author":
+                    self._author = value
+                elif field == "netid":
+                    self._netid = value
+
+    def _send(self, line: str) -> None:
+        try:
+            self._process.stdin.write(line + "\n")
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise EngineError(f"engine exited: {e}") from e
+
+    def _read_line(self, timeout: float) -> str:
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise EngineError(f"engine did not reply within {timeout:.1f}s") from None
+        if line is None:
+            raise EngineError(f"engine exited with code {self._process.wait()}")
+        return line
+
+    def _expect(self, keyword: str, timeout: float) -> str:
+        """Read lines until one starts with ``keyword`` and return the rest."""
+        while True:
+            found, _, rest = self._read_line(timeout).partition(" ")
+            if found == keyword:
+                return rest
+            if found == "error":
+                raise EngineError(f"engine error: {rest}")
+
+
+def _split_command(command: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    if isinstance(command, str):
+        return tuple(shlex.split(command))
+    return tuple(command)
+
+
+def _pump_lines(stream: IO[str], lines: "queue.Queue[Optional[str]]") -> None:
+    for line in stream:
+        line = line.strip()
+        if line:
+            lines.put(line)
+    lines.put(None)  # EOF
+
+
+def _shutdown(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    try:
+        process.stdin.write("quit\n")
+        process.stdin.flush()
+        process.wait(timeout=1.0)
+    except (OSError, subprocess.TimeoutExpired):
+        process.kill()
+        process.wait()
+
+
+def serve(
+    bot_cls: Type[AbstractBot],
+    stdin: Optional[IO[str]] = None,
+    stdout: Optional[IO[str]] = None,
+) -> None:
+    """
+    Run ``bot_cls`` as an engine until ``quit`` or end of input.
+
+    The bot is created on ``init`` and reused for every game, with
+    ``prepare`` and ``newgame`` passed on to its lifecycle hooks. Anything
+    the bot prints goes to stderr so it cannot corrupt the protocol. The
+    time budget in ``go`` is not passed on; bots use their own limits.
+
+    Args:
+        bot_cls: The bot to serve.
+        stdin: Command stream. Defaults to ``sys.stdin``.
+        stdout: Reply stream. Defaults to ``sys.stdout``.
+    """
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    bot: Optional[AbstractBot] = None
+
+    def reply(*lines: str) -> None:
+        for line in lines:
+            stdout.write(line + "\n")
+        stdout.flush()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        for line in stdin:
+            command, *args = line.split() or [""]
+            try:
+                if command == "init":
+                    player = CellState.Red if args[0] == "red" else CellState.Yellow
+                    bot = bot_cls(player)
+                    reply(
+                        f"id name {bot.strategy_name}",
+                        f"id author {bot.author_name}",
+                        f"id netid {bot.author_netid}",
+                        "ready",
+                    )
+                elif command == "go":
+                    if bot is None:
+                        raise ValueError("go before init")
+                    board = board_from_moves(args[1] if len(args) > 1 else "")
+                    reply(f"bestmove {bot.get_move(board)}")
+                elif command == "prepare":
+                    if bot is None:
+                        raise ValueError("prepare before init")
+                    bot.prepare(int(args[0]) / 1000)
+                    reply("ready")
+                elif command == "newgame":
+                    if bot is not None:
+                        bot.on_new_game()
+                elif command == "quit":
+                    return
+                elif command != "":
+                    raise ValueError(f"unknown command {command!r}")
+            except Exception as e:
+                # Keep the message on one line
+                reply(f"error {type(e).__name__}: {' '.join(str(e).split())}")
@@ -0,0 +1,308 @@
+"""
+Position explorer: how often each position was reached in archived games.
+
+``build_explorer_index`` replays a collection of games once and counts, for
+every position, the games that reached it, how they ended and which move was
+played next. Positions are keyed by ``board.hash``, so transpositions share an
+entry. The counts are written to a memory-mapped file sorted by hash, and
+``ExplorerIndex`` answers a probe with one binary search in C over the hash
+block, in a few microseconds and without reading the file into RAM.
+
+Building streams the games: once ``max_entries_in_memory`` positions are
+being counted, they are written to a sorted run on disk, and the runs are
+merged into the final index at the end.
+"""
+
+import bisect
+import heapq
+import itertools
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4._mapped import MappedTable, write_table
+from pingv4.notation import MoveSequence, parse_moves
+
+if TYPE_CHECKING:
+    from pingv4.results import StoredGame
+    from pingv4.runner import GameRecord
+
+MAGIC = b"PV4X"
+VERSION = 1
+
+NUM_COLS = 7
+
+# magic, version, max_plies, (pad), games indexed, position count
+_HEADER = struct.Struct("<4sHBxQQ")
+# Hashes come first as one block of sorted uint64s, then the counts of each
+# position in the same order: red wins, yellow wins, draws, then the games
+# that continued with each column
+_KEY = struct.Struct("<Q")
+_COUNTS = struct.Struct(f"<{3 + NUM_COLS}I")
+# Sorted runs spilled to disk while building
+_RUN_RECORD = struct.Struct(f"<Q{3 + NUM_COLS}I")
+
+# Slot of each result in the counts
+_RESULT_SLOTS = {CellState.Red: 0, CellState.Yellow: 1, None: 2}
+
+_CHUNK_SIZE = 1 << 20
+
+# Move sequences, or records with ``moves`` and ``winner`` such as runner's
+# GameRecord and results' StoredGame
+ArchivedGame = Union[MoveSequence, "GameRecord", "StoredGame"]
+
+
+class PositionStats(NamedTuple):
+    """Counts of the archived games that reached one position."""
+
+    red_wins: int
+    yellow_wins: int
+    draws: int
+    # Games that continued with each column, indexed by column. Games that
+    # ended in the position have no continuation.
+    move_counts: Tuple[int, ...]
+
+    @property
+    def games(self) -> int:
+        return self.red_wins + self.yellow_wins + self.draws
+
+    def top_moves(self, n: int = 3) -> List[Tuple[int, int]]:
+        """
+        The ``n`` most played continuations, most played first.
+
+        :param n: How many moves to return
+        :type n: int
+        :return: ``(column, games)`` pairs; unplayed columns are left out
+        :rtype: List[Tuple[int, int]]
+        """
+        played = [(col, count) for col, count in enumerate(self.move_counts) if count]
+        played.sort(key=lambda item: -item[1])
+        return played[:n]
+
+
+def build_explorer_index(
+    path: str,
+    games: Iterable[ArchivedGame],
+    max_plies: int = 42,
+    max_entries_in_memory: int = 1_000_000,
+) -> int:
+    """
+    Count every position of ``games`` and write the index to ``path``.
+
+    Args:
+        path: Output file.
+        games: Move sequences, or records with ``moves`` and ``winner``
+            (``GameRecord``, ``StoredGame``). A move sequence is scored by
+            its final position, so a game cut short counts as a draw.
+        max_plies: Only index positions with at most this many pieces, e.g.
+            12 for an opening explorer.
+        max_entries_in_memory: Positions counted in memory before they are
+            spilled to a sorted run on disk.
+
+    Returns:
+        The number of positions written.
+    """
+    if not 0 <= max_plies <= 255:
+        raise ValueError("max_plies must be between 0 and 255")
+
+    counts: Dict[int, List[int]] = {}
+    num_games = 0
+    with tempfile.TemporaryDirectory(prefix="pingv4-explorer-") as tmp_dir:
+        runs: List[str] = []
+        for game in games:
+            _count_game(counts, game, max_plies)
+            num_games += 1
+            if len(counts) >= max_entries_in_memory:
+                runs.append(_spill(counts, tmp_dir, len(runs)))
+                counts.clear()
+
+        if runs:
+            runs.append(_spill(counts, tmp_dir, len(runs)))
+            counts.clear()
+            merged = _merge_runs(runs)
+        else:
+            merged = ((h, counts[h]) for h in sorted(counts))
+
+        # Hashes and counts go to separate files, then are joined behind
+        # the header once the number of positions is known
+        keys_path = os.path.join(tmp_dir, "keys")
+        values_path = os.path.join(tmp_dir, "values")
+        num_positions = 0
+        with open(keys_path, "wb") as keys, open(values_path, "wb") as values:
+            for board_hash, position_counts in merged:
+                keys.write(_KEY.pack(board_hash))
+                values.write(_COUNTS.pack(*position_counts))
+                num_positions += 1
+
+        with open(keys_path, "rb") as keys, open(values_path, "rb") as values:
+            write_table(
+                path,
+                _HEADER.pack(MAGIC, VERSION, max_plies, num_games, num_positions),
+                itertools.chain(_read_chunks(keys), _read_chunks(values)),
+            )
+
+    return num_positions
+
+
+def _count_game(
+    counts: Dict[int, List[int]], game: ArchivedGame, max_plies: int
+) -> None:
+    moves = getattr(game, "moves", None)
+    if moves is None:
+        moves, winner = parse_moves(game), None
+        scored = False
+    else:
+        moves, winner = parse_moves(moves), game.winner
+        scored = True
+
+    # Hashes of the indexed positions, each with the move played from it
+    board = ConnectFourBoard()
+    visited: List[Tuple[int, Optional[int]]] = []
+    for ply, col in enumerate(moves):
+        if ply <= max_plies:
+            visited.append((board.hash, col))
+        elif scored:
+            break
+        board = board.make_move(col)
+    if len(moves) <= max_plies:
+        visited.append((board.hash, None))
+    if not scored:
+        winner = board.winner
+
+    slot = _RESULT_SLOTS[winner]
+    for board_hash, col in visited:
+        position_counts = counts.get(board_hash)
+        if position_counts is None:
+            position_counts = counts[board_hash] = [0] * (3 + NUM_COLS)
+        position_counts[slot] += 1
+        if col is not None:
+            position_counts[3 + col] += 1
+
+
+def _spill(counts: Dict[int, List[int]], tmp_dir: str, run_idx: int) -> str:
+    run_path = os.path.join(tmp_dir, f"run{run_idx}")
+    with open(run_path, "wb") as f:
+        for board_hash in sorted(counts):
+            f.write(_RUN_RECORD.pack(board_hash, *counts[board_hash]))
+    return run_path
+
+
+def _read_run(run_path: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+    with open(run_path, "rb") as f:
+        while True:
+            chunk = f.read(_RUN_RECORD.size * 4096)
+            if not chunk:
+                return
+            for record in _RUN_RECORD.iter_unpack(chunk):
+                yield record[0], record[1:]
+
+
+def _merge_runs(run_paths: List[str]) -> Iterator[Tuple[int, Sequence[int]]]:
+    """Merge sorted runs, adding up the counts of a position found in several."""
+    merged = heapq.merge(*(_read_run(p) for p in run_paths), key=lambda r: r[0])
+    for board_hash, records in itertools.groupby(merged, key=lambda r: r[0]):
+        totals = [sum(column) for column in zip(*(counts for _, counts in records))]
+        yield board_hash, totals
+
+
+def _read_chunks(f: IO[bytes]) -> Iterator[bytes]:
+    return iter(lambda: f.read(_CHUNK_SIZE), b"")
+
+
+class ExplorerIndex(MappedTable):
+    """
+    Read-only, memory-mapped view of an index written by
+    ``build_explorer_index``.
+
+    Examples:
+        with ExplorerIndex("explorer.bin") as index:
+            stats = index.probe(board)
+            if stats is not None:
+                print(stats.games, stats.top_moves(3))
+    """
+
+    MAGIC = MAGIC
+    VERSION = VERSION
+    HEADER = _HEADER
+    RECORD_SIZE = _KEY.size + _COUNTS.size
+    KIND = "explorer index"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._max_plies: int = self._fields[2]
+        self._num_games: int = self._fields[3]
+
+        keys_end = _HEADER.size + self._count * _KEY.size
+        self._values_offset = keys_end
+        # bisect runs over the mapped hashes directly; big-endian machines
+        # need a swapped copy
+        self._keys_view: Optional[memoryview] = None
+        self._keys: Sequence[int]
+        if sys.byteorder == "little":
+            self._keys_view = memoryview(self._mmap)[_HEADER.size : keys_end]
+            self._keys = self._keys_view.cast("Q")
+        else:
+            self._keys = array("Q", self._mmap[_HEADER.size : keys_end])
+            self._keys.byteswap()
+
+    @property
+    def max_plies(self) -> int:
+        """Largest number of pieces of an indexed position."""
+        return self._max_plies
+
+    @property
+    def num_games(self) -> int:
+        """Number of games the index was built from."""
+        return self._num_games
+
+    def probe_hash(self, board_hash: int) -> Optional[PositionStats]:
+        """
+        Look up a position by its hash in O(log n).
+
+        Args:
+            board_hash: ``board.hash`` of the position.
+
+        Returns:
+            The position's counts, or None if no indexed game reached it.
+        """
+        keys = self._keys
+        idx = bisect.bisect_left(keys, board_hash)
+        if idx == self._count or keys[idx] != board_hash:
+            return None
+        counts = _COUNTS.unpack_from(
+            self._mmap, self._values_offset + idx * _COUNTS.size
+        )
+        return PositionStats(counts[0], counts[1], counts[2], counts[3:])
+
+    def probe(self, board: ConnectFourBoard) -> Optional[PositionStats]:
+        """
+        Look up a board. Boards with more than ``max_plies`` pieces return
+        None without touching the index.
+        """
+        if board.num_moves > self._max_plies:
+            return None
+        return self.probe_hash(board.hash)
+
+    def close(self) -> None:
+        # The hash view must be released before the map can be closed
+        if getattr(self, "_keys_view", None) is not None:
+            self._keys.release()
+            self._keys_view.release()
+            self._keys_view = None
+        super().close()
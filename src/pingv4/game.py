@@ -3,7 +3,10 @@ import random
 from pydantic import BaseModel
 from typing import Optional, Tuple, Type, Union
 
-from pingv4 import AbstractBot, CellState, ConnectFourBoard
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+from pingv4.runner import BotRoster, PonderThread
+from pingv4.telemetry import Telemetry
 
 
 class GameConfig(BaseModel, frozen=True):
@@ -12,6 +15,15 @@ class GameConfig(BaseModel, frozen=True):
     # Bot timing
     bot_delay_seconds: float = 1.0
 
+    # Let bots think on the opponent's time (see AbstractBot.ponder)
+    enable_pondering: bool = False
+
+    # Setup time each bot gets once, before its first game (see AbstractBot.prepare)
+    prepare_time_seconds: float = 2.0
+
+    # Frame-time and bot-latency overlay (toggle with T)
+    show_telemetry: bool = False
+
     # Animation
     animation_speed: int = 25
 
@@ -59,7 +71,7 @@ class ManualPlayer:
 
 # Player can be specified as:
 # - None (manual player)
-# - AbstractBot subclass (will be instantiated with the assigned color)
+# - AbstractBot subclass (instantiated once per color and reused across games)
 # - ManualPlayer instance
 PlayerConfig = Union[None, Type[AbstractBot], ManualPlayer]
 
@@ -90,6 +102,7 @@ class Connect4Game:
         player1: PlayerConfig = None,
         player2: PlayerConfig = None,
         config: Optional[GameConfig] = None,
+        telemetry: Optional[Telemetry] = None,
     ) -> None:
         """
         Initialize a Connect Four game.
@@ -98,10 +111,15 @@ class Connect4Game:
             player1: First player - None for manual, or an AbstractBot subclass.
             player2: Second player - None for manual, or an AbstractBot subclass.
             config: Game configuration options. Uses defaults if not provided.
+            telemetry: Metrics sink shared with the caller. A private one is
+                created if not provided.
         """
         self.config = config or GameConfig()
+        self.telemetry = telemetry or Telemetry()
+        self.show_telemetry = self.config.show_telemetry
         self._player1_config = player1
         self._player2_config = player2
+        self._roster = BotRoster(self.config.prepare_time_seconds)
 
         pygame.init()
         self.screen = pygame.display.set_mode(
@@ -111,6 +129,7 @@ class Connect4Game:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 28)
+        self.overlay_font = pygame.font.Font(None, 20)
 
         # Randomly assign colors to players
         self.player1_is_red = random.choice([True, False])
@@ -124,6 +143,7 @@ class Connect4Game:
 
         self.red_player = self._resolve_player(red_config, CellState.Red)
         self.yellow_player = self._resolve_player(yellow_config, CellState.Yellow)
+        self._start_bots()
 
         self.board = ConnectFourBoard()
         self.hover_col: Optional[int] = None
@@ -137,6 +157,7 @@ class Connect4Game:
         self.animation_color: Optional[Tuple[int, int, int]] = None
         self.error_player_1: bool = False
         self.error_player_2: bool = False
+        self._ponderer = PonderThread()
 
         print("=" * 50)
         print("COIN FLIP RESULT")
@@ -155,6 +176,9 @@ class Connect4Game:
         """
         Convert PlayerConfig to a player instance.
 
+        Bot classes get one instance per color for the whole session, which
+        is prepared when it is created (see BotRoster).
+
         Args:
             player_config: The player configuration.
             color: The CellState color to assign.
@@ -170,11 +194,17 @@ class Connect4Game:
         elif isinstance(player_config, ManualPlayer):
             return player_config
         elif isinstance(player_config, type) and issubclass(player_config, AbstractBot):
-            # Bot class provided - instantiate with color
-            return player_config(color)
+            # Bot class provided - reuse its instance for this color
+            return self._roster.get(player_config, color)
         else:
             raise TypeError(f"Invalid player config type: {type(player_config)}")
 
+    def _start_bots(self) -> None:
+        """Tell the bots of the coming game that it is a new game."""
+        for player in (self.red_player, self.yellow_player):
+            if isinstance(player, AbstractBot):
+                player.on_new_game()
+
     def get_current_player(self) -> Union[ManualPlayer, AbstractBot]:
         """Get the player whose turn it currently is."""
         if self.board.current_player == CellState.Red:
@@ -224,6 +254,7 @@ class Connect4Game:
     def finish_move(self) -> None:
         """Complete the current move after animation finishes."""
         if self.animation_col is not None:
+            mover = self.get_current_player()
             self.board = self.board.make_move(self.animation_col)
 
             if not self.board.is_in_progress:
@@ -241,6 +272,8 @@ class Connect4Game:
                 else:
                     self.winner_name = "Draw"
                     self.winner = 0
+            elif self.config.enable_pondering and isinstance(mover, AbstractBot):
+                self._ponderer.start(mover, self.board)
 
         self.animating = False
         self.animation_col = None
@@ -384,6 +417,36 @@ class Connect4Game:
             )
             self.screen.blit(restart_surface, restart_rect)
 
+    def draw_telemetry(self) -> None:
+        """Draw frame rate and per-bot move latency in the top-left corner."""
+        telemetry = self.telemetry
+        lines = [
+            f"{self.clock.get_fps():.0f} fps  "
+            f"frame p95 {telemetry.frames.quantile(0.95):.1f}ms  "
+            f"dropped {telemetry.dropped_frames}"
+        ]
+        for bot in telemetry.bots:
+            latency = telemetry.bot_latency(bot)
+            lines.append(
+                f"{bot}: p50 {latency.quantile(0.5):.0f}ms  "
+                f"p95 {latency.quantile(0.95):.0f}ms  max {latency.max:.0f}ms"
+            )
+
+        surfaces = [
+            self.overlay_font.render(line, True, self.config.text_color)
+            for line in lines
+        ]
+        width = max(surface.get_width() for surface in surfaces) + 8
+        height = sum(surface.get_height() for surface in surfaces) + 8
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 160))
+        self.screen.blit(background, (0, 0))
+
+        y = 4
+        for surface in surfaces:
+            self.screen.blit(surface, (4, y))
+            y += surface.get_height()
+
     def handle_bot_turn(self) -> None:
         """Handle the bot's turn by getting and executing its move."""
         if self.game_over or self.animating or self.is_manual_turn():
@@ -391,8 +454,9 @@ class Connect4Game:
 
         current_player = self.get_current_player()
         if isinstance(current_player, AbstractBot):
+            self._ponderer.stop()
             try:
-                col = current_player.get_move(self.board)
+                col = self.telemetry.timed_get_move(current_player, self.board)
                 if col in self.board.get_valid_moves():
                     self.make_move(col)
                 else:
@@ -423,6 +487,7 @@ class Connect4Game:
 
     def reset_game(self) -> None:
         """Reset the game to initial state with new color assignment."""
+        self._ponderer.stop()
         self.player1_is_red = random.choice([True, False])
 
         if self.player1_is_red:
@@ -434,6 +499,7 @@ class Connect4Game:
 
         self.red_player = self._resolve_player(red_config, CellState.Red)
         self.yellow_player = self._resolve_player(yellow_config, CellState.Yellow)
+        self._start_bots()
 
         self.board = ConnectFourBoard()
         self.hover_col = None
@@ -468,6 +534,8 @@ class Connect4Game:
                         running = False
                     elif event.key == pygame.K_r:
                         self.reset_game()
+                    elif event.key == pygame.K_t:
+                        self.show_telemetry = not self.show_telemetry
 
                 elif event.type == pygame.MOUSEMOTION:
                     mouse_x, _ = event.pos
@@ -499,10 +567,13 @@ class Connect4Game:
             self.draw_board()
             self.draw_hover_indicator()
             self.draw_status()
+            if self.show_telemetry:
+                self.draw_telemetry()
 
             pygame.display.flip()
-            self.clock.tick(60)
+            self.telemetry.record_frame(self.clock.tick(60))
 
+        self._ponderer.stop()
         pygame.quit()
 
 
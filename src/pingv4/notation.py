@@ -0,0 +1,136 @@
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from pingv4._core import CellState, ConnectFourBoard
+
+# A move string lists the columns played from the empty board, one digit per ply.
+# ex: "3342" -> Red 3, Yellow 3, Red 4, Yellow 2
+MoveSequence = Union[str, Sequence[int]]
+
+
+def parse_moves(moves: MoveSequence) -> List[int]:
+    """
+    Convert a move string (or an existing sequence of columns) into a list of
+    column indices.
+
+    :param moves: A move string such as ``"3342"`` or a sequence of ints
+    :type moves: MoveSequence
+    :return: The columns played, in order
+    :rtype: List[int]
+    :raises ValueError: If the move string contains a non-digit character
+    """
+    if isinstance(moves, str):
+        moves = moves.strip()
+        if moves and not moves.isdigit():
+            raise ValueError(f"invalid move string: {moves!r}")
+        return [int(ch) for ch in moves]
+    return [int(col) for col in moves]
+
+
+def format_moves(moves: Iterable[int]) -> str:
+    """
+    Convert a sequence of column indices into a move string.
+
+    :param moves: The columns played, in order
+    :type moves: Iterable[int]
+    :return: The move string, one digit per ply
+    :rtype: str
+    """
+    return "".join(map(str, moves))
+
+
+def board_from_moves(moves: MoveSequence) -> ConnectFourBoard:
+    """
+    Replay a move sequence from the empty board.
+
+    :param moves: A move string or a sequence of column indices
+    :type moves: MoveSequence
+    :return: The board reached after playing every move
+    :rtype: ConnectFourBoard
+    :raises ValueError: If any move is illegal in the position it is played in
+    """
+    board = ConnectFourBoard()
+    for col in parse_moves(moves):
+        board = board.make_move(col)
+    return board
+
+
+def moves_from_board(board: ConnectFourBoard) -> List[int]:
+    """
+    Recover a move sequence that reaches a board from the empty board.
+
+    Boards don't record their history, so this works backwards, removing top
+    pieces in alternating colors. When several orders reach the board, any
+    one of them is returned; they all replay to the same position.
+
+    :param board: The board to reconstruct
+    :type board: ConnectFourBoard
+    :return: The columns played, in order
+    :rtype: List[int]
+    :raises ValueError: If no legal game reaches the board
+    """
+    cells = board.cell_states
+    heights = list(board.column_heights)
+    total = sum(heights)
+    moves: List[int] = []
+    # Column heights identify a prefix of the game, since the pieces are fixed
+    failed: Set[Tuple[int, ...]] = set()
+
+    def unwind(remaining: int) -> bool:
+        if remaining == 0:
+            return True
+        key = tuple(heights)
+        if key in failed:
+            return False
+
+        # Red moves first, so it placed the last piece when the count is odd
+        color = CellState.Red if remaining % 2 else CellState.Yellow
+        for col, height in enumerate(heights):
+            if height and cells[col][height - 1] == color:
+                heights[col] -= 1
+                if unwind(remaining - 1):
+                    moves.append(col)
+                    return True
+                heights[col] += 1
+
+        failed.add(key)
+        return False
+
+    if not board.is_victory:
+        found = unwind(total)
+    else:
+        # The winning piece was placed last: removing it must undo every four
+        found = False
+        color = CellState.Red if total % 2 else CellState.Yellow
+        for col, height in enumerate(heights):
+            if not height or cells[col][height - 1] != color:
+                continue
+            heights[col] -= 1
+            if _find_four(cells, heights) is None and unwind(total - 1):
+                moves.append(col)
+                found = True
+                break
+            heights[col] += 1
+
+    if not found:
+        raise ValueError("board is not reachable by a legal game")
+    return moves
+
+
+def _find_four(
+    cells: List[List[Optional[CellState]]], heights: List[int]
+) -> Optional[CellState]:
+    """Return the owner of any four-in-a-row within the given column heights."""
+    num_cols = len(heights)
+
+    def cell(col: int, row: int) -> Optional[CellState]:
+        if 0 <= col < num_cols and 0 <= row < heights[col]:
+            return cells[col][row]
+        return None
+
+    for col in range(num_cols):
+        for row in range(heights[col]):
+            owner = cells[col][row]
+            for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                if all(cell(col + dc * i, row + dr * i) == owner for i in range(1, 4)):
+                    return owner
+    return None
@@ -0,0 +1,233 @@
+"""
+Strength-and-speed regression suite on solved positions.
+
+The suite is a list of positions with known game-theoretic values and the
+moves that keep them. A bot is scored on how often it finds one of those
+moves, broken down by game phase, alongside its time and nodes per move.
+Summaries can be saved as a JSON baseline and compared against later runs.
+"""
+
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import resources
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from pingv4.bot.base import AbstractBot
+from pingv4.endgame import Outcome
+from pingv4.notation import board_from_moves
+from pingv4.telemetry import PHASE_ENDGAME, PHASE_MIDDLEGAME, PHASE_OPENING, game_phase
+
+PHASES = (PHASE_OPENING, PHASE_MIDDLEGAME, PHASE_ENDGAME)
+ALL_PHASES = "all"
+
+_VALUES = {"W": Outcome.WIN, "D": Outcome.DRAW, "L": Outcome.LOSS}
+
+
+class SolvedPosition(NamedTuple):
+    """A position and its value for the player to move under perfect play."""
+
+    moves: str
+    value: Outcome
+    # Moves that keep the value; for lost positions, the ones that lose slowest
+    best_moves: Tuple[int, ...]
+
+
+class PositionResult(NamedTuple):
+    """How a bot did on one solved position."""
+
+    moves: str
+    phase: str
+    move: int
+    correct: bool
+    time_ms: float
+    # Nodes searched, for bots that report them (e.g. MinimaxBot.nodes)
+    nodes: Optional[int]
+
+
+def load_suite(path: Optional[str] = None) -> List[SolvedPosition]:
+    """
+    Load solved positions.
+
+    Args:
+        path: Suite file in the format of ``pingv4/data/regression.txt``.
+            Defaults to the bundled suite.
+    """
+    if path is None:
+        text = (resources.files("pingv4") / "data" / "regression.txt").read_text()
+    else:
+        with open(path) as f:
+            text = f.read()
+
+    positions = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            moves, value, best = line.split()
+            positions.append(
+                SolvedPosition(
+                    "" if moves == "-" else moves,
+                    _VALUES[value],
+                    tuple(int(col) for col in best.split(",")),
+                )
+            )
+        except (KeyError, ValueError):
+            raise ValueError(f"line {line_no}: invalid solved position {line!r}")
+    return positions
+
+
+def _check_positions(
+    bot_cls: Type[AbstractBot],
+    bot_kwargs: Dict[str, Any],
+    positions: Sequence[SolvedPosition],
+) -> List[PositionResult]:
+    """Worker entry point: a fresh bot per position, so no caches carry over."""
+    results = []
+    for position in positions:
+        board = board_from_moves(position.moves)
+        bot = bot_cls(board.current_player, **bot_kwargs)
+
+        start = time.perf_counter()
+        move = bot.get_move(board)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        results.append(
+            PositionResult(
+                position.moves,
+                game_phase(board),
+                move,
+                move in position.best_moves,
+                elapsed_ms,
+                getattr(bot, "nodes", None),
+            )
+        )
+    return results
+
+
+def run_suite(
+    bot_cls: Type[AbstractBot],
+    positions: Optional[Sequence[SolvedPosition]] = None,
+    workers: Optional[int] = None,
+    bot_kwargs: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 4,
+) -> List[PositionResult]:
+    """
+    Ask a bot for its move in every solved position.
+
+    Args:
+        bot_cls: Bot to test. With more than one worker it must be importable
+            by the worker processes.
+        positions: Positions to check. Defaults to the bundled suite.
+        workers: Worker processes. Defaults to the CPU count; 1 runs in this
+            process, which gives the steadiest timings.
+        bot_kwargs: Extra constructor arguments, e.g. ``{"max_depth": 8}``.
+        chunk_size: Positions per task.
+
+    Returns:
+        One result per position, in suite order.
+    """
+    positions = list(positions) if positions is not None else load_suite()
+    bot_kwargs = bot_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        return _check_positions(bot_cls, bot_kwargs, positions)
+
+    chunks = [
+        positions[i : i + chunk_size] for i in range(0, len(positions), chunk_size)
+    ]
+    results: List[PositionResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results in pool.map(
+            _check_positions,
+            [bot_cls] * len(chunks),
+            [bot_kwargs] * len(chunks),
+            chunks,
+        ):
+            results.extend(chunk_results)
+    return results
+
+
+def summarize(results: Iterable[PositionResult]) -> Dict[str, Dict[str, Any]]:
+    """
+    Accuracy, time and nodes per phase, plus ``"all"``.
+
+    Each entry has ``positions``, ``accuracy`` (0-1), ``mean_ms``,
+    ``median_ms`` and ``mean_nodes`` (None if the bot reports no nodes).
+    """
+    results = list(results)
+    summary = {}
+    for phase in PHASES + (ALL_PHASES,):
+        selected = [r for r in results if phase in (ALL_PHASES, r.phase)]
+        if not selected:
+            continue
+        times = [r.time_ms for r in selected]
+        nodes = [r.nodes for r in selected if r.nodes is not None]
+        summary[phase] = {
+            "positions": len(selected),
+            "accuracy": sum(r.correct for r in selected) / len(selected),
+            "mean_ms": statistics.mean(times),
+            "median_ms": statistics.median(times),
+            "mean_nodes": statistics.mean(nodes) if nodes else None,
+        }
+    return summary
+
+
+def save_baseline(summary: Dict[str, Dict[str, Any]], path: str, bot: str = "") -> None:
+    """Write a summary as a JSON baseline."""
+    with open(path, "w") as f:
+        json.dump({"bot": bot, "summary": summary}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read the summary from a JSON baseline written by ``save_baseline``."""
+    with open(path) as f:
+        return json.load(f)["summary"]
+
+
+def compare(
+    summary: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]
+) -> str:
+    """
+    Judge a run against a baseline on the whole suite.
+
+    Returns:
+        ``"better"`` if accuracy is no lower and time no higher (and one of
+        them improved), ``"worse"`` for the opposite, ``"same"`` if neither
+        changed, and ``"tradeoff"`` if one improved at the other's expense.
+    """
+    current, base = summary[ALL_PHASES], baseline[ALL_PHASES]
+    accuracy = _sign(current["accuracy"] - base["accuracy"])
+    # Timing noise below 2% is treated as no change
+    speed = _sign(base["mean_ms"] - current["mean_ms"], base["mean_ms"] * 0.02)
+
+    if accuracy == speed == 0:
+        return "same"
+    if accuracy >= 0 and speed >= 0:
+        return "better"
+    if accuracy <= 0 and speed <= 0:
+        return "worse"
+    return "tradeoff"
+
+
+def _sign(delta: float, tolerance: float = 1e-9) -> int:
+    if delta > tolerance:
+        return 1
+    if delta < -tolerance:
+        return -1
+    return 0
@@ -0,0 +1,657 @@
+"""
+Indexed store of tournament results.
+
+``ResultsStore`` keeps bots and games, with every move and its
+``get_move`` latency, in one local SQLite file. Games are buffered and
+written in batches, one transaction per batch, so several worker processes
+can record into the same file while others query it; SQLite's write-ahead
+log lets readers and a writer work at the same time.
+
+A game is one row, holding its moves as a move string and their latencies
+as a packed float32 array; one row per move would make bulk loads several
+times slower. For the same reason the games table is only indexed by
+tournament: questions by pairing, opening or phase go to small stat tables.
+
+Totals per pairing, per opening and per bot and game phase are updated in
+the same transaction as the games they count. The aggregate views built on
+them answer the usual questions without scanning the games::
+
+    standings       tournament, bot, games, wins, draws, losses, forfeits
+    head_to_head    tournament, bot, opponent, color, games, wins, draws,
+                    losses, forfeits
+    openings        tournament, opening, games, red_wins, draws, yellow_wins
+    phase_latency   tournament, bot, phase, moves, total_ms, max_ms, forfeits
+
+``export_pgn`` writes the games as PGN tag pairs, which rating calculators
+such as BayesElo and Ordo read.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import defaultdict
+from itertools import groupby
+from typing import (
+    IO,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pingv4._core import CellState
+from pingv4.bot.base import AbstractBot
+from pingv4.notation import format_moves
+from pingv4.runner import GameRecord
+from pingv4.telemetry import phase_of_ply
+
+# Bots are named by a string, or by their strategy name
+BotLike = Union[str, AbstractBot]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bots (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    author TEXT NOT NULL DEFAULT '',
+    netid TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    tournament TEXT NOT NULL,
+    red INTEGER NOT NULL REFERENCES bots (id),
+    yellow INTEGER NOT NULL REFERENCES bots (id),
+    -- 1 if Red won, 0 for a draw, -1 if Yellow won
+    result INTEGER NOT NULL,
+    -- 0 for Red, 1 for Yellow, NULL if the game was played out
+    forfeited_by INTEGER,
+    opening TEXT NOT NULL,
+    moves TEXT NOT NULL,
+    num_moves INTEGER NOT NULL,
+    -- get_move latency of each move in ms, little-endian float32; NULL if untimed
+    move_times BLOB,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_tournament ON games (tournament);
+
+CREATE TABLE IF NOT EXISTS pairing_stats (
+    tournament TEXT NOT NULL,
+    red INTEGER NOT NULL,
+    yellow INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    red_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    yellow_wins INTEGER NOT NULL,
+    red_forfeits INTEGER NOT NULL,
+    yellow_forfeits INTEGER NOT NULL,
+    PRIMARY KEY (tournament, red, yellow)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS opening_stats (
+    tournament TEXT NOT NULL,
+    opening TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    red_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    yellow_wins INTEGER NOT NULL,
+    PRIMARY KEY (tournament, opening)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS phase_stats (
+    tournament TEXT NOT NULL,
+    bot INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    moves INTEGER NOT NULL,
+    total_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    forfeits INTEGER NOT NULL,
+    PRIMARY KEY (tournament, bot, phase)
+) WITHOUT ROWID;
+
+CREATE VIEW IF NOT EXISTS head_to_head AS
+SELECT p.tournament, r.name AS bot, y.name AS opponent, 'red' AS color,
+       p.games, p.red_wins AS wins, p.draws, p.yellow_wins AS losses,
+       p.red_forfeits AS forfeits
+FROM pairing_stats p
+JOIN bots r ON r.id = p.red
+JOIN bots y ON y.id = p.yellow
+UNION ALL
+SELECT p.tournament, y.name, r.name, 'yellow',
+       p.games, p.yellow_wins, p.draws, p.red_wins, p.yellow_forfeits
+FROM pairing_stats p
+JOIN bots r ON r.id = p.red
+JOIN bots y ON y.id = p.yellow;
+
+CREATE VIEW IF NOT EXISTS standings AS
+SELECT tournament, bot, SUM(games) AS games, SUM(wins) AS wins,
+       SUM(draws) AS draws, SUM(losses) AS losses, SUM(forfeits) AS forfeits
+FROM head_to_head
+GROUP BY tournament, bot;
+
+CREATE VIEW IF NOT EXISTS openings AS
+SELECT tournament, opening, games, red_wins, draws, yellow_wins
+FROM opening_stats;
+
+CREATE VIEW IF NOT EXISTS phase_latency AS
+SELECT s.tournament, b.name AS bot, s.phase, s.moves, s.total_ms, s.max_ms,
+       s.forfeits
+FROM phase_stats s
+JOIN bots b ON b.id = s.bot;
+"""
+
+_UPSERT_PAIRING = """
+INSERT INTO pairing_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tournament, red, yellow) DO UPDATE SET
+    games = games + excluded.games,
+    red_wins = red_wins + excluded.red_wins,
+    draws = draws + excluded.draws,
+    yellow_wins = yellow_wins + excluded.yellow_wins,
+    red_forfeits = red_forfeits + excluded.red_forfeits,
+    yellow_forfeits = yellow_forfeits + excluded.yellow_forfeits
+"""
+
+_UPSERT_OPENING = """
+INSERT INTO opening_stats VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (tournament, opening) DO UPDATE SET
+    games = games + excluded.games,
+    red_wins = red_wins + excluded.red_wins,
+    draws = draws + excluded.draws,
+    yellow_wins = yellow_wins + excluded.yellow_wins
+"""
+
+_UPSERT_PHASE = """
+INSERT INTO phase_stats VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tournament, bot, phase) DO UPDATE SET
+    moves = moves + excluded.moves,
+    total_ms = total_ms + excluded.total_ms,
+    max_ms = MAX(max_ms, excluded.max_ms),
+    forfeits = forfeits + excluded.forfeits
+"""
+
+
+def _phase_spans(cells: int = 42) -> List[Tuple[str, int, int]]:
+    """(phase, first ply, last ply + 1) for each game phase."""
+    spans = []
+    for phase, plies in groupby(range(cells), phase_of_ply):
+        plies_list = list(plies)
+        spans.append((phase, plies_list[0], plies_list[-1] + 1))
+    return spans
+
+
+_PHASE_SPANS = _phase_spans()
+
+# games.result and games.forfeited_by codes
+_WINNERS = {1: CellState.Red, 0: None, -1: CellState.Yellow}
+_COLORS = (CellState.Red, CellState.Yellow)
+
+_PGN_RESULTS = {1: "1-0", 0: "1/2-1/2", -1: "0-1"}
+
+
+class Standing(NamedTuple):
+    """A bot's record over all its games."""
+
+    bot: str
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    forfeits: int
+
+    @property
+    def score(self) -> float:
+        """Points per game: 1 for a win, 0.5 for a draw."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+
+class HeadToHead(NamedTuple):
+    """A bot's record against one opponent while playing one color."""
+
+    bot: str
+    opponent: str
+    color: str
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    forfeits: int
+
+
+class OpeningStats(NamedTuple):
+    """Results of the games that started with one opening."""
+
+    opening: str
+    games: int
+    red_wins: int
+    draws: int
+    yellow_wins: int
+
+    @property
+    def red_score(self) -> float:
+        return (self.red_wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+
+class PhaseLatency(NamedTuple):
+    """A bot's move times and forfeits in one game phase."""
+
+    bot: str
+    phase: str
+    moves: int
+    mean_ms: float
+    max_ms: float
+    forfeits: int
+
+
+class StoredGame(NamedTuple):
+    """One game as read back from a store."""
+
+    id: int
+    tournament: str
+    red: str
+    yellow: str
+    winner: Optional[CellState]
+    forfeited_by: Optional[CellState]
+    moves: str
+    move_times_ms: Optional[List[float]]
+    played_at: float
+
+
+class _PendingGame(NamedTuple):
+    red: BotLike
+    yellow: BotLike
+    record: GameRecord
+    tournament: str
+    played_at: float
+
+
+class ResultsStore:
+    """
+    Games, moves and bots in a SQLite file, with precomputed aggregates.
+
+    ``add`` buffers a game; every ``batch_size`` games, and on ``flush`` or
+    ``close``, the buffer is written in one transaction. Safe to share
+    between threads. Each process opens its own connection, so a store can
+    be handed to worker processes as long as each one closes it when done.
+
+    Example::
+
+        with ResultsStore("results.sqlite") as store:
+            record = play_game(red, yellow)
+            store.add("minimax", "mcts", record, tournament="week-1")
+        for standing in store.standings("week-1"):
+            print(standing.bot, f"{standing.score:.1%}")
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 10_000,
+        opening_plies: int = 4,
+    ) -> None:
+        """
+        Args:
+            path: SQLite file, created if missing.
+            batch_size: Games buffered before they are written.
+            opening_plies: Moves that make up a game's opening. Use the same
+                value for every run that writes to one file.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.opening_plies = opening_plies
+        self._pending: List[_PendingGame] = []
+        self._bot_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def add(
+        self,
+        red: BotLike,
+        yellow: BotLike,
+        record: GameRecord,
+        tournament: str = "",
+    ) -> None:
+        """
+        Record a finished game.
+
+        Args:
+            red: The Red bot, or its name.
+            yellow: The Yellow bot, or its name.
+            record: The game, e.g. from ``play_game``.
+            tournament: Label to group and filter games by.
+        """
+        with self._lock:
+            self._pending.append(
+                _PendingGame(red, yellow, record, tournament, time.time())
+            )
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def flush(self) -> None:
+        """Write buffered games."""
+        with self._lock:
+            self._write_pending()
+
+    def close(self) -> None:
+        """Write buffered games and close this process's connection."""
+        with self._lock:
+            self._write_pending()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers get their own lock, connection and buffer
+        state = self.__dict__.copy()
+        state["_pending"] = []
+        state["_lock"] = None
+        state["_conn"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def num_games(self, tournament: Optional[str] = None) -> int:
+        """Games written so far, not counting buffered ones."""
+        return self._query(
+            "SELECT COUNT(*) FROM games WHERE ?1 IS NULL OR tournament = ?1",
+            (tournament,),
+        )[0][0]
+
+    def standings(self, tournament: Optional[str] = None) -> List[Standing]:
+        """Every bot's record, best score first."""
+        rows = self._query(
+            "SELECT bot, SUM(games), SUM(wins), SUM(draws), SUM(losses), "
+            "SUM(forfeits) FROM standings "
+            "WHERE ?1 IS NULL OR tournament = ?1 GROUP BY bot",
+            (tournament,),
+        )
+        return sorted((Standing(*row) for row in rows), key=lambda s: (-s.score, s.bot))
+
+    def head_to_head(
+        self, bot: Optional[str] = None, tournament: Optional[str] = None
+    ) -> List[HeadToHead]:
+        """Records by opponent and color, for one bot or all of them."""
+        rows = self._query(
+            "SELECT bot, opponent, color, SUM(games), SUM(wins), SUM(draws), "
+            "SUM(losses), SUM(forfeits) FROM head_to_head "
+            "WHERE (?1 IS NULL OR bot = ?1) AND (?2 IS NULL OR tournament = ?2) "
+            "GROUP BY bot, opponent, color ORDER BY bot, opponent, color",
+            (bot, tournament),
+        )
+        return [HeadToHead(*row) for row in rows]
+
+    def openings(
+        self, min_games: int = 1, tournament: Optional[str] = None
+    ) -> List[OpeningStats]:
+        """Results by opening, most played first."""
+        rows = self._query(
+            "SELECT opening, SUM(games) AS total, SUM(red_wins), SUM(draws), "
+            "SUM(yellow_wins) FROM openings WHERE ?2 IS NULL OR tournament = ?2 "
+            "GROUP BY opening HAVING total >= ?1 ORDER BY total DESC, opening",
+            (min_games, tournament),
+        )
+        return [OpeningStats(*row) for row in rows]
+
+    def phase_latency(
+        self, bot: Optional[str] = None, tournament: Optional[str] = None
+    ) -> List[PhaseLatency]:
+        """Move times and forfeits by bot and game phase."""
+        rows = self._query(
+            "SELECT bot, phase, SUM(moves), SUM(total_ms), MAX(max_ms), "
+            "SUM(forfeits) FROM phase_latency "
+            "WHERE (?1 IS NULL OR bot = ?1) AND (?2 IS NULL OR tournament = ?2) "
+            "GROUP BY bot, phase ORDER BY bot, phase",
+            (bot, tournament),
+        )
+        return [
+            PhaseLatency(name, phase, moves, total_ms / moves if moves else 0.0, *rest)
+            for name, phase, moves, total_ms, *rest in rows
+        ]
+
+    def games(
+        self, tournament: Optional[str] = None, bot: Optional[str] = None
+    ) -> Iterator[StoredGame]:
+        """
+        Read games back in the order they were written.
+
+        Args:
+            tournament: Only this tournament's games.
+            bot: Only games this bot played, with either color.
+        """
+        rows = self._execute(
+            "SELECT g.id, g.tournament, r.name, y.name, g.result, g.forfeited_by, "
+            "g.moves, g.move_times, g.played_at "
+            "FROM games g JOIN bots r ON r.id = g.red JOIN bots y ON y.id = g.yellow "
+            "WHERE (?1 IS NULL OR g.tournament = ?1) "
+            "AND (?2 IS NULL OR r.name = ?2 OR y.name = ?2) ORDER BY g.id",
+            (tournament, bot),
+        )
+        for game_id, event, red, yellow, result, forfeit, moves, times, at in rows:
+            yield StoredGame(
+                game_id,
+                event,
+                red,
+                yellow,
+                _WINNERS[result],
+                None if forfeit is None else _COLORS[forfeit],
+                moves,
+                None if times is None else _unpack_times(times),
+                at,
+            )
+
+    def export_pgn(self, file: IO[str], tournament: Optional[str] = None) -> int:
+        """
+        Write every game as PGN tag pairs for a rating calculator.
+
+        Red is written as White. The moves are kept in a ``Moves`` tag in
+        pingv4 notation, since Connect Four has no PGN movetext.
+
+        Args:
+            file: Text stream to write to.
+            tournament: Only export this tournament's games.
+
+        Returns:
+            The number of games written.
+        """
+        rows = self._execute(
+            "SELECT g.tournament, r.name, y.name, g.result, g.forfeited_by, g.moves "
+            "FROM games g JOIN bots r ON r.id = g.red JOIN bots y ON y.id = g.yellow "
+            "WHERE ?1 IS NULL OR g.tournament = ?1 ORDER BY g.id",
+            (tournament,),
+        )
+        escaped: Dict[str, str] = {}
+        count = 0
+        for event, red, yellow, result, forfeited_by, moves in rows:
+            # Names repeat on every game, so escape each one once
+            for name in (event, red, yellow):
+                if name not in escaped:
+                    escaped[name] = _pgn_escape(name)
+            pgn_result = _PGN_RESULTS[result]
+            file.write(
+                f'[Event "{escaped[event] or "?"}"]\n'
+                f'[White "{escaped[red]}"]\n'
+                f'[Black "{escaped[yellow]}"]\n'
+                f'[Result "{pgn_result}"]\n'
+                f'[Moves "{moves}"]\n'
+            )
+            if forfeited_by is not None:
+                file.write('[Termination "forfeit"]\n')
+            file.write(f"\n{pgn_result}\n\n")
+            count += 1
+        return count
+
+    def _query(self, sql: str, params: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        return self._execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...]) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db().execute(sql, params)
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+
+        db = self._db()
+        # Rows are built before taking the write lock, so other processes
+        # only wait for the inserts themselves
+        games, pairings, openings, phases = self._build_rows(db, self._pending)
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO games (tournament, red, yellow, result, forfeited_by, "
+                "opening, moves, num_moves, move_times, played_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                games,
+            )
+            db.executemany(_UPSERT_PAIRING, pairings)
+            db.executemany(_UPSERT_OPENING, openings)
+            db.executemany(_UPSERT_PHASE, phases)
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        self._pending = []
+
+    def _build_rows(
+        self, db: sqlite3.Connection, pending: List[_PendingGame]
+    ) -> Tuple[List[Tuple[Any, ...]], ...]:
+        """Game rows and this batch's totals for each stat table."""
+        games = []
+        pairings: DefaultDict[Tuple[str, int, int], List[int]] = defaultdict(
+            lambda: [0] * 6
+        )
+        openings: DefaultDict[Tuple[str, str], List[int]] = defaultdict(lambda: [0] * 4)
+        phases: DefaultDict[Tuple[str, int, str], List[float]] = defaultdict(
+            lambda: [0, 0.0, 0.0, 0]
+        )
+
+        for game in pending:
+            record = game.record
+            bot_ids = (self._bot_id(db, game.red), self._bot_id(db, game.yellow))
+
+            if record.winner is None:
+                result = 0
+            else:
+                result = 1 if record.winner == CellState.Red else -1
+            forfeited_by = None
+            if record.forfeited_by is not None:
+                forfeited_by = 0 if record.forfeited_by == CellState.Red else 1
+
+            move_string = format_moves(record.moves)
+            opening = move_string[: self.opening_plies]
+            times = record.move_times_ms
+            games.append(
+                (
+                    game.tournament,
+                    *bot_ids,
+                    result,
+                    forfeited_by,
+                    opening,
+                    move_string,
+                    len(record.moves),
+                    None if times is None else _pack_times(times),
+                    game.played_at,
+                )
+            )
+
+            pairing = pairings[(game.tournament, *bot_ids)]
+            pairing[0] += 1
+            pairing[2 - result] += 1
+            if forfeited_by is not None:
+                pairing[4 + forfeited_by] += 1
+
+            opening_totals = openings[(game.tournament, opening)]
+            opening_totals[0] += 1
+            opening_totals[2 - result] += 1
+
+            if times:
+                # Slicing by phase and color keeps the per-move work in C
+                for phase, start, stop in _PHASE_SPANS:
+                    for color, bot_id in enumerate(bot_ids):
+                        span = times[start + (color - start) % 2 : stop : 2]
+                        if span:
+                            totals = phases[(game.tournament, bot_id, phase)]
+                            totals[0] += len(span)
+                            totals[1] += sum(span)
+                            totals[2] = max(totals[2], max(span))
+            if forfeited_by is not None:
+                # The forfeit happened in the position after the last move
+                phase = phase_of_ply(len(record.moves))
+                phases[(game.tournament, bot_ids[forfeited_by], phase)][3] += 1
+
+        return (
+            games,
+            [key + tuple(value) for key, value in pairings.items()],
+            [key + tuple(value) for key, value in openings.items()],
+            [key + tuple(value) for key, value in phases.items()],
+        )
+
+    def _bot_id(self, db: sqlite3.Connection, bot: BotLike) -> int:
+        name = bot if isinstance(bot, str) else bot.strategy_name
+        bot_id = self._bot_ids.get(name)
+        if bot_id is None:
+            if isinstance(bot, str):
+                author = netid = ""
+            else:
+                author, netid = bot.author_name, bot.author_netid
+            db.execute(
+                "INSERT OR IGNORE INTO bots (name, author, netid) VALUES (?, ?, ?)",
+                (name, author, netid),
+            )
+            bot_id = db.execute(
+                "SELECT id FROM bots WHERE name = ?", (name,)
+            ).fetchone()[0]
+            self._bot_ids[name] = bot_id
+        return bot_id
+
+    def _db(self) -> sqlite3.Connection:
+        # A forked child must not reuse its parent's connection
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            # Autocommit mode; _write_pending manages its own transactions
+            conn = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._conn_pid = pid
+            self._bot_ids = {}
+        return self._conn
+
+
+def _pack_times(times: List[float]) -> bytes:
+    packed = array("f", times)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_times(blob: bytes) -> List[float]:
+    packed = array("f", blob)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _pgn_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
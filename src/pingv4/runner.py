@@ -0,0 +1,321 @@
+"""
+Headless game loop for bot-vs-bot play without pygame.
+
+``play_game`` plays one game. ``play_games`` plays many games of the same
+pairing in lockstep and hands each bot its pending positions in batches
+through ``AbstractBot.get_moves``.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+
+if TYPE_CHECKING:
+    from pingv4.telemetry import Telemetry
+
+
+class GameRecord(NamedTuple):
+    """Outcome of a finished headless game."""
+
+    moves: List[int]
+    winner: Optional[CellState]
+    # Color of the bot that raised during get_move, if the game ended that way
+    forfeited_by: Optional[CellState] = None
+    # get_move wall time of each move in ``moves``; in ``play_games``, each
+    # batch's wall time split evenly across its positions
+    move_times_ms: Optional[List[float]] = None
+
+
+class PonderThread:
+    """
+    Runs one bot's ``ponder`` on a background thread during the opponent's
+    turn. At most one bot ponders at a time.
+    """
+
+    def __init__(self) -> None:
+        self._bot: Optional[AbstractBot] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, bot: AbstractBot, board: ConnectFourBoard) -> None:
+        """Stop any running ponder, then let ``bot`` ponder on ``board``."""
+        self.stop()
+        if type(bot).ponder is AbstractBot.ponder:
+            return  # Bot doesn't ponder; don't spawn a thread for nothing
+
+        self._bot = bot
+        self._thread = threading.Thread(
+            target=self._run, args=(bot, board), name="pingv4-ponder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the pondering bot to stop and wait until it has."""
+        if self._thread is None:
+            return
+        if self._bot is not None:
+            self._bot.stop_pondering()
+        self._thread.join()
+        self._bot = None
+        self._thread = None
+
+    @staticmethod
+    def _run(bot: AbstractBot, board: ConnectFourBoard) -> None:
+        try:
+            bot.ponder(board)
+        except Exception:
+            # Pondering is best-effort; a broken bot fails in get_move instead
+            pass
+
+
+class BotRoster:
+    """
+    The bot instances of a match, reused across its games.
+
+    Each bot class gets one instance per color, created the first time it is
+    asked for and prepared right away, so ``AbstractBot.prepare`` runs once
+    per instance and never on a move's clock. Bots keep their caches from
+    game to game; ``play_game`` calls ``on_new_game`` before each game.
+    """
+
+    def __init__(self, prepare_time: float = 2.0) -> None:
+        """
+        Args:
+            prepare_time: Seconds each bot may spend in ``prepare``.
+        """
+        self.prepare_time = prepare_time
+        self._bots: Dict[Tuple[Type[AbstractBot], CellState], AbstractBot] = {}
+
+    def get(self, bot_cls: Type[AbstractBot], color: CellState) -> AbstractBot:
+        """The instance of ``bot_cls`` playing ``color``, prepared on first use."""
+        key = (bot_cls, color)
+        bot = self._bots.get(key)
+        if bot is None:
+            bot = bot_cls(color)
+            bot.prepare(self.prepare_time)
+            self._bots[key] = bot
+        return bot
+
+    def __iter__(self) -> Iterator[AbstractBot]:
+        return iter(list(self._bots.values()))
+
+    def __len__(self) -> int:
+        return len(self._bots)
+
+
+def play_game(
+    red: AbstractBot,
+    yellow: AbstractBot,
+    board: Optional[ConnectFourBoard] = None,
+    ponder: bool = False,
+    telemetry: Optional["Telemetry"] = None,
+    rng: Optional[random.Random] = None,
+) -> GameRecord:
+    """
+    Play a game between two bot instances until it finishes.
+
+    Mirrors the rules of ``Connect4Game``: an invalid column is replaced with
+    a random valid move, and a bot that raises forfeits the game. Both bots'
+    ``on_new_game`` is called first, so instances can be reused across games
+    (see ``BotRoster``).
+
+    Args:
+        red: Bot playing Red (moves first).
+        yellow: Bot playing Yellow.
+        board: Starting position. Defaults to the empty board.
+        ponder: Let each bot ponder on the opponent's time.
+        telemetry: Records each get_move call's latency if given.
+        rng: Source of the random moves that replace invalid ones. Defaults
+            to the ``random`` module.
+
+    Returns:
+        The moves played from the starting position, the winner and the
+        time each move took.
+    """
+    board = board if board is not None else ConnectFourBoard()
+    moves: List[int] = []
+    move_times_ms: List[float] = []
+    ponderer = PonderThread() if ponder else None
+    red.on_new_game()
+    yellow.on_new_game()
+
+    try:
+        while board.is_in_progress:
+            current = red if board.current_player == CellState.Red else yellow
+            if ponderer is not None:
+                ponderer.stop()
+
+            valid_moves = board.get_valid_moves()
+            start = time.perf_counter()
+            try:
+                if telemetry is not None:
+                    col = telemetry.timed_get_move(current, board)
+                else:
+                    col = current.get_move(board)
+            except Exception:
+                loser = board.current_player
+                winner = CellState.Yellow if loser == CellState.Red else CellState.Red
+                return GameRecord(moves, winner, loser, move_times_ms)
+            move_times_ms.append((time.perf_counter() - start) * 1000)
+
+            if col not in valid_moves:
+                col = (rng or random).choice(valid_moves)
+
+            board = board.make_move(col)
+            moves.append(col)
+
+            if ponderer is not None and board.is_in_progress:
+                ponderer.start(current, board)
+    finally:
+        if ponderer is not None:
+            ponderer.stop()
+
+    return GameRecord(moves, board.winner, move_times_ms=move_times_ms)
+
+
+def play_games(
+    red: AbstractBot,
+    yellow: AbstractBot,
+    games: Union[int, Sequence[ConnectFourBoard]],
+    max_batch_size: int = 64,
+    max_wait_ms: float = 50.0,
+    telemetry: Optional["Telemetry"] = None,
+    rng: Optional[random.Random] = None,
+) -> List[GameRecord]:
+    """
+    Play many games between the same two bot instances in lockstep.
+
+    Every game waits in its player's queue of pending positions, and each
+    bot receives its queue in batches through ``get_moves``, so a bot with
+    a fixed cost per call pays it once per batch rather than once per move.
+    A batch is sent once the queue holds ``max_batch_size`` positions or
+    its oldest position has waited ``max_wait_ms``. Otherwise the larger
+    queue goes first, since the moves it returns fill the other one.
+
+    The rules are those of ``play_game``: an invalid column is replaced with
+    a random valid move, and a bot whose ``get_moves`` raises, or returns
+    the wrong number of moves, forfeits every game in the batch. Both bots'
+    ``on_new_game`` is called once, before the games start. There is no
+    pondering.
+
+    Args:
+        red: Bot playing Red in every game.
+        yellow: Bot playing Yellow in every game.
+        games: Number of games from the empty board, or their starting
+            positions.
+        max_batch_size: Most positions passed to one ``get_moves`` call.
+        max_wait_ms: Longest a position waits for its batch to fill while
+            the other bot is served.
+        telemetry: Records each batch's latency, split across its moves, if
+            given.
+        rng: Source of the random moves that replace invalid ones. Defaults
+            to the ``random`` module.
+
+    Returns:
+        One record per game, in the order of ``games``.
+    """
+    if max_batch_size < 1:
+        raise ValueError("max_batch_size must be positive")
+
+    boards = [ConnectFourBoard()] * games if isinstance(games, int) else list(games)
+    moves: List[List[int]] = [[] for _ in boards]
+    move_times_ms: List[List[float]] = [[] for _ in boards]
+    records: Dict[int, GameRecord] = {}
+    # Games waiting for each color's move, with the time they started waiting
+    pending: Dict[CellState, Deque[Tuple[int, float]]] = {
+        CellState.Red: deque(),
+        CellState.Yellow: deque(),
+    }
+    bots = {CellState.Red: red, CellState.Yellow: yellow}
+    red.on_new_game()
+    yellow.on_new_game()
+
+    now = time.perf_counter()
+    for game_idx, board in enumerate(boards):
+        if board.is_in_progress:
+            pending[board.current_player].append((game_idx, now))
+        else:
+            records[game_idx] = GameRecord([], board.winner, move_times_ms=[])
+
+    while pending[CellState.Red] or pending[CellState.Yellow]:
+        color = _next_batch(pending, max_batch_size, max_wait_ms / 1000)
+        queue = pending[color]
+        batch = [queue.popleft()[0] for _ in range(min(len(queue), max_batch_size))]
+        bot = bots[color]
+
+        batch_boards = [boards[game_idx] for game_idx in batch]
+        start = time.perf_counter()
+        try:
+            if telemetry is not None:
+                cols = telemetry.timed_get_moves(bot, batch_boards)
+            else:
+                cols = bot.get_moves(batch_boards)
+            if len(cols) != len(batch):
+                raise ValueError(
+                    f"get_moves returned {len(cols)} moves for {len(batch)} boards"
+                )
+        except Exception:
+            winner = CellState.Yellow if color == CellState.Red else CellState.Red
+            for game_idx in batch:
+                records[game_idx] = GameRecord(
+                    moves[game_idx], winner, color, move_times_ms[game_idx]
+                )
+            continue
+        now = time.perf_counter()
+        move_ms = (now - start) * 1000 / len(batch)
+
+        for game_idx, col in zip(batch, cols):
+            board = boards[game_idx]
+            valid_moves = board.get_valid_moves()
+            if col not in valid_moves:
+                col = (rng or random).choice(valid_moves)
+
+            board = boards[game_idx] = board.make_move(col)
+            moves[game_idx].append(col)
+            move_times_ms[game_idx].append(move_ms)
+            if board.is_in_progress:
+                pending[board.current_player].append((game_idx, now))
+            else:
+                records[game_idx] = GameRecord(
+                    moves[game_idx], board.winner, move_times_ms=move_times_ms[game_idx]
+                )
+
+    return [records[game_idx] for game_idx in range(len(boards))]
+
+
+def _next_batch(
+    pending: Dict[CellState, Deque[Tuple[int, float]]],
+    max_batch_size: int,
+    max_wait: float,
+) -> CellState:
+    """The color whose queue ``play_games`` serves next."""
+    now = time.perf_counter()
+    ready = [
+        color
+        for color, queue in pending.items()
+        if queue and (len(queue) >= max_batch_size or now - queue[0][1] >= max_wait)
+    ]
+    if ready:
+        # Oldest first, so neither queue waits on the other indefinitely
+        return min(ready, key=lambda color: pending[color][0][1])
+    return max(pending, key=lambda color: len(pending[color]))
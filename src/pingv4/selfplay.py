@@ -0,0 +1,334 @@
+"""
+Parallel self-play data generation.
+
+Games between configurable bot pairings are played across a process pool. The
+parent process dedupes positions by ``board.hash`` with a fixed-size Bloom
+filter and streams ``(position, move, result)`` records into sharded files.
+At most ``max_pending`` batches of games are in flight at any time, so memory
+stays bounded however many games are generated.
+
+Each shard is a tab-separated text file with one record per line::
+
+    <move string>\\t<board hash>\\t<move>\\t<result>
+
+``result`` is from the perspective of the player to move in that position:
+1 if they went on to win, 0 for a draw and -1 for a loss.
+"""
+
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+from pingv4.notation import format_moves
+from pingv4.runner import play_game
+
+
+@dataclass(frozen=True)
+class Pairing:
+    """A pair of bot classes to play against each other."""
+
+    red: Type[AbstractBot]
+    yellow: Type[AbstractBot]
+
+
+class PositionRecord(NamedTuple):
+    """One training example: a position, the move played and the final result."""
+
+    position: str
+    hash: int
+    move: int
+    result: int
+
+
+class SelfPlayStats(NamedTuple):
+    """Summary returned by ``generate``."""
+
+    games: int
+    forfeits: int
+    positions: int
+    duplicates: int
+    shards: List[str]
+
+
+class _EpsilonBot(AbstractBot):
+    """Plays a uniformly random move with probability ``epsilon`` in the opening."""
+
+    def __init__(
+        self, bot: AbstractBot, random_plies: int, epsilon: float, rng: random.Random
+    ) -> None:
+        super().__init__(bot.player)
+        self._bot = bot
+        self._random_plies = random_plies
+        self._epsilon = epsilon
+        self._rng = rng
+
+    @property
+    def strategy_name(self) -> str:
+        return self._bot.strategy_name
+
+    @property
+    def author_name(self) -> str:
+        return self._bot.author_name
+
+    @property
+    def author_netid(self) -> str:
+        return self._bot.author_netid
+
+    def get_move(self, board: ConnectFourBoard) -> int:
+        ply = board.num_moves
+        if ply < self._random_plies and self._rng.random() < self._epsilon:
+            return self._rng.choice(board.get_valid_moves())
+        return self._bot.get_move(board)
+
+    def on_new_game(self) -> None:
+        self._bot.on_new_game()
+
+
+def play_selfplay_game(
+    pairing: Pairing, game_seed: int, random_plies: int = 8, epsilon: float = 0.25
+) -> Optional[List[PositionRecord]]:
+    """
+    Play one game and turn it into position records.
+
+    Args:
+        pairing: Bot classes for Red and Yellow.
+        game_seed: Seeds the opening randomization and the replacement of
+            invalid moves, so games between deterministic bots are
+            reproducible. The global ``random`` module is left untouched.
+        random_plies: Number of opening plies eligible for a random move.
+        epsilon: Probability of a random move during those plies.
+
+    Returns:
+        One record per ply, or None if a bot forfeited the game.
+    """
+    rng = random.Random(game_seed)
+    red = _EpsilonBot(pairing.red(CellState.Red), random_plies, epsilon, rng)
+    yellow = _EpsilonBot(pairing.yellow(CellState.Yellow), random_plies, epsilon, rng)
+
+    game = play_game(red, yellow, rng=rng)
+    if game.forfeited_by is not None:
+        return None
+
+    records = []
+    board = ConnectFourBoard()
+    for ply, move in enumerate(game.moves):
+        if game.winner is None:
+            result = 0
+        else:
+            result = 1 if game.winner == board.current_player else -1
+        records.append(
+            PositionRecord(format_moves(game.moves[:ply]), board.hash, move, result)
+        )
+        board = board.make_move(move)
+
+    return records
+
+
+def _play_games(
+    games: Sequence[Tuple[Pairing, int]], random_plies: int, epsilon: float
+) -> List[Optional[List[PositionRecord]]]:
+    # Worker entry point: a batch of games per task amortizes pickling overhead.
+    return [
+        play_selfplay_game(pairing, game_seed, random_plies, epsilon)
+        for pairing, game_seed in games
+    ]
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit integer keys.
+
+    Memory depends only on ``capacity`` and ``error_rate``. Once more than
+    ``capacity`` keys are added the false-positive rate rises above
+    ``error_rate``, but memory does not grow.
+    """
+
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and 0 < error_rate < 1")
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._num_bits = max(num_bits, 8)
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+
+    @classmethod
+    def _mix(cls, key: int) -> int:
+        # splitmix64 finalizer
+        key = (key + 0x9E3779B97F4A7C15) & cls._MASK
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & cls._MASK
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & cls._MASK
+        return key ^ (key >> 31)
+
+    def add(self, key: int) -> bool:
+        """
+        Add a key.
+
+        Returns:
+            True if the key was (probably) not present before.
+        """
+        h1 = self._mix(key)
+        h2 = self._mix(h1) | 1
+        added = False
+        for i in range(self._num_hashes):
+            bit = (h1 + i * h2) % self._num_bits
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                added = True
+        return added
+
+
+class ShardWriter:
+    """Writes records to ``<prefix>-00000.tsv``, ``<prefix>-00001.tsv``, ..."""
+
+    def __init__(
+        self, directory: str, prefix: str = "selfplay", shard_size: int = 100_000
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.paths: List[str] = []
+        self._file: Optional[IO[str]] = None
+        self._count = 0
+
+    def write(self, record: PositionRecord) -> None:
+        if self._file is None or self._count >= self.shard_size:
+            self._rotate()
+        assert self._file is not None
+        self._file.write(
+            f"{record.position}\t{record.hash}\t{record.move}\t{record.result}\n"
+        )
+        self._count += 1
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):05d}.tsv")
+        self._file = open(path, "w", encoding="ascii")
+        self.paths.append(path)
+        self._count = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def read_records(paths: Iterable[str]) -> Iterator[PositionRecord]:
+    """Stream records back out of shard files."""
+    for path in paths:
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                position, board_hash, move, result = line.rstrip("\n").split("\t")
+                yield PositionRecord(position, int(board_hash), int(move), int(result))
+
+
+def generate(
+    output_dir: str,
+    pairings: Sequence[Pairing],
+    num_games: int,
+    workers: Optional[int] = None,
+    games_per_task: int = 8,
+    max_pending: Optional[int] = None,
+    random_plies: int = 8,
+    epsilon: float = 0.25,
+    shard_size: int = 100_000,
+    dedupe_capacity: int = 10_000_000,
+    dedupe_error_rate: float = 0.001,
+    seed: int = 0,
+) -> SelfPlayStats:
+    """
+    Generate self-play positions into sharded files under ``output_dir``.
+
+    Games cycle through ``pairings`` in order.
+
+    Args:
+        output_dir: Directory for the shard files.
+        pairings: Bot pairings to play.
+        num_games: Total number of games.
+        workers: Worker process count. Defaults to ``os.cpu_count()``.
+        games_per_task: Games played per worker task.
+        max_pending: Maximum tasks in flight before the producer waits for
+            the writer to catch up. Defaults to twice the worker count.
+        random_plies: Opening plies eligible for a random move.
+        epsilon: Probability of a random move during those plies.
+        shard_size: Records per shard file.
+        dedupe_capacity: Expected number of unique positions, which sizes
+            the Bloom filter.
+        dedupe_error_rate: Target false-positive rate of the Bloom filter.
+        seed: Base seed; game ``i`` uses ``seed * num_games + i``.
+
+    Returns:
+        Summary statistics, including the shard paths.
+    """
+    if not pairings:
+        raise ValueError("at least one pairing is required")
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    seen = BloomFilter(dedupe_capacity, dedupe_error_rate)
+    games = forfeits = positions = duplicates = 0
+
+    def tasks() -> Iterator[List[Tuple[Pairing, int]]]:
+        for start in range(0, num_games, games_per_task):
+            stop = min(start + games_per_task, num_games)
+            yield [
+                (pairings[i % len(pairings)], seed * num_games + i)
+                for i in range(start, stop)
+            ]
+
+    with (
+        ProcessPoolExecutor(max_workers=workers) as pool,
+        ShardWriter(output_dir, shard_size=shard_size) as writer,
+    ):
+
+        def consume(done: Set["Future[List[Optional[List[PositionRecord]]]]"]) -> None:
+            nonlocal games, forfeits, positions, duplicates
+            for future in done:
+                for records in future.result():
+                    games += 1
+                    if records is None:
+                        forfeits += 1
+                        continue
+                    for record in records:
+                        if seen.add(record.hash):
+                            writer.write(record)
+                            positions += 1
+                        else:
+                            duplicates += 1
+
+        pending: Set["Future[List[Optional[List[PositionRecord]]]]"] = set()
+        for task in tasks():
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                consume(done)
+            pending.add(pool.submit(_play_games, task, random_plies, epsilon))
+
+        consume(wait(pending).done)
+
+    return SelfPlayStats(games, forfeits, positions, duplicates, writer.paths)
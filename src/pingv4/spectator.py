@@ -0,0 +1,467 @@
+"""
+Watch many bot games at once.
+
+``Spectator`` lays out a grid of boards, one per game, in a single window.
+The games are played headlessly in worker processes, which stream events
+to the window through a queue::
+
+    ("start", slot, red_name, yellow_name)
+    ("move", slot, col)
+    ("end", slot, winner, forfeit)    # winner is "red", "yellow" or None
+
+Every board is drawn from one shared pre-rendered board sprite and two
+piece sprites, and only boards whose state changed are redrawn. A board
+that receives moves faster than a drop animation can show them skips the
+animation, so 64 fast games still render at the target frame rate.
+"""
+
+import math
+import multiprocessing
+import os
+import queue
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import pygame
+from pydantic import BaseModel
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.runner import BotRoster
+from pingv4.selfplay import Pairing
+from pingv4.telemetry import Telemetry
+
+BOARD_ROWS = 6
+BOARD_COLS = 7
+
+WINNER_NAMES = {CellState.Red: "red", CellState.Yellow: "yellow"}
+
+# Longest a worker sleeps before checking that the window is still open
+_MAX_IDLE_S = 0.05
+
+
+class SpectatorConfig(BaseModel, frozen=True):
+    """Configuration options for Spectator."""
+
+    # Window
+    window_width: int = 1280
+    window_height: int = 720
+    fps: int = 60
+
+    # Pacing of the headless games. Zero lets bots play as fast as they can.
+    move_delay_seconds: float = 0.3
+    # How long a finished game stays on screen before the next one starts
+    restart_delay_seconds: float = 2.0
+    # Setup time each bot gets once, before its first game
+    prepare_time_seconds: float = 2.0
+
+    # Frames a dropping piece takes; 0 disables animation
+    animation_frames: int = 6
+
+    # Layout
+    tile_padding: int = 8
+    label_height: int = 16
+
+    # Colors
+    background_color: Tuple[int, int, int] = (30, 30, 40)
+    board_color: Tuple[int, int, int] = (0, 80, 180)
+    empty_color: Tuple[int, int, int] = (20, 20, 30)
+    red_color: Tuple[int, int, int] = (220, 50, 50)
+    yellow_color: Tuple[int, int, int] = (240, 220, 50)
+    text_color: Tuple[int, int, int] = (255, 255, 255)
+    win_highlight_color: Tuple[int, int, int] = (50, 255, 50)
+
+
+class _WorkerGame:
+    """One slot's game inside a worker process."""
+
+    def __init__(self, slot: int, pairing: Pairing, prepare_time: float) -> None:
+        self.slot = slot
+        self.pairing = pairing
+        # The slot's bots play all of its games
+        self.roster = BotRoster(prepare_time)
+        self.red = None
+        self.yellow = None
+        self.board: Optional[ConnectFourBoard] = None
+        self.next_time = 0.0
+        self.games_played = 0
+
+
+def _play_slots(
+    slots: Sequence[Tuple[int, Pairing]],
+    events: "multiprocessing.Queue[List[Tuple[Any, ...]]]",
+    move_delay: float,
+    restart_delay: float,
+    prepare_time: float,
+    games_per_slot: Optional[int],
+) -> None:
+    """
+    Worker entry point: play the given slots' games, one move per slot in
+    turn, and send each round's events to the window as a single batch.
+
+    Follows the rules of ``play_game``: an invalid column is replaced with a
+    random valid move, and a bot that raises forfeits the game. Runs until
+    the window process exits or every slot has played ``games_per_slot``.
+    """
+    # Don't block interpreter exit on events the window will never read
+    events.cancel_join_thread()
+    window = multiprocessing.parent_process()
+    games = [_WorkerGame(slot, pairing, prepare_time) for slot, pairing in slots]
+
+    while window is None or window.is_alive():
+        batch: List[Tuple[Any, ...]] = []
+        for game in games:
+            if time.monotonic() < game.next_time:
+                continue
+            if games_per_slot is not None and game.games_played >= games_per_slot:
+                continue
+
+            if game.board is None:
+                game.red = game.roster.get(game.pairing.red, CellState.Red)
+                game.yellow = game.roster.get(game.pairing.yellow, CellState.Yellow)
+                game.red.on_new_game()
+                game.yellow.on_new_game()
+                game.board = ConnectFourBoard()
+                batch.append(
+                    (
+                        "start",
+                        game.slot,
+                        game.red.strategy_name,
+                        game.yellow.strategy_name,
+                    )
+                )
+                game.next_time = time.monotonic() + move_delay
+                continue
+
+            board = game.board
+            current = game.red if board.current_player == CellState.Red else game.yellow
+            valid_moves = board.get_valid_moves()
+            try:
+                col = current.get_move(board)
+            except Exception:
+                winner = CellState.Yellow if current is game.red else CellState.Red
+                batch.append(("end", game.slot, WINNER_NAMES[winner], True))
+                game.board = None
+                game.games_played += 1
+                game.next_time = time.monotonic() + restart_delay
+                continue
+
+            if col not in valid_moves:
+                col = random.choice(valid_moves)
+            game.board = board.make_move(col)
+            batch.append(("move", game.slot, col))
+
+            if game.board.is_in_progress:
+                game.next_time = time.monotonic() + move_delay
+            else:
+                winner = game.board.winner if game.board.is_victory else None
+                batch.append(("end", game.slot, WINNER_NAMES.get(winner), False))
+                game.board = None
+                game.games_played += 1
+                game.next_time = time.monotonic() + restart_delay
+
+        if batch:
+            events.put(batch)
+
+        if games_per_slot is not None and all(
+            game.games_played >= games_per_slot for game in games
+        ):
+            return
+
+        wait = min(game.next_time for game in games) - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, _MAX_IDLE_S))
+
+
+class _Tile:
+    """The on-screen state of one game."""
+
+    def __init__(self, slot: int, rect: pygame.Rect) -> None:
+        self.slot = slot
+        self.rect = rect
+        self.board = ConnectFourBoard()
+        self.label: Optional[pygame.Surface] = None
+        self.pending: Deque[Tuple[Any, ...]] = deque()
+        self.dirty = True
+
+        # Falling piece: (column, target row, current y offset, target y offset)
+        self.drop: Optional[List[Any]] = None
+
+
+class Spectator:
+    """
+    A grid of boards showing bot games played by headless workers.
+
+    Example:
+        pairings = [Pairing(MinimaxBot, MCTSBot), Pairing(MCTSBot, MinimaxBot)] * 16
+        Spectator(pairings).run()
+    """
+
+    def __init__(
+        self,
+        pairings: Sequence[Pairing],
+        config: Optional[SpectatorConfig] = None,
+        workers: Optional[int] = None,
+        games_per_board: Optional[int] = None,
+        telemetry: Optional[Telemetry] = None,
+    ) -> None:
+        """
+        Initialize a spectator window.
+
+        Args:
+            pairings: One pairing per board. Bot classes must be importable
+                by the worker processes.
+            config: Display and pacing options. Uses defaults if not provided.
+            workers: Worker processes. Defaults to the CPU count, at most one
+                per board.
+            games_per_board: Games to play on each board before it stops.
+                Defaults to playing until the window is closed.
+            telemetry: Records frame times if given.
+        """
+        if not pairings:
+            raise ValueError("Spectator needs at least one pairing")
+
+        self.config = config or SpectatorConfig()
+        self.pairings = list(pairings)
+        self.workers = min(workers or os.cpu_count() or 1, len(self.pairings))
+        self.games_per_board = games_per_board
+        self.telemetry = telemetry or Telemetry(target_fps=self.config.fps)
+        self.games_finished = 0
+
+        self._tiles: List[_Tile] = []
+        self._cell_size = 0
+        self._board_sprite: Optional[pygame.Surface] = None
+        self._piece_sprites: Dict[CellState, pygame.Surface] = {}
+
+    def run(self) -> None:
+        """Start the workers and run the window until it is closed."""
+        # Start workers before pygame.init so they don't inherit a display
+        events = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_play_slots,
+                args=(
+                    [
+                        (slot, pairing)
+                        for slot, pairing in enumerate(self.pairings)
+                        if slot % self.workers == worker
+                    ],
+                    events,
+                    self.config.move_delay_seconds,
+                    self.config.restart_delay_seconds,
+                    self.config.prepare_time_seconds,
+                    self.games_per_board,
+                ),
+                name=f"pingv4-spectator-{worker}",
+                daemon=True,
+            )
+            for worker in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            self._run_window(events)
+        finally:
+            # Workers hold nothing worth cleaning up, so don't wait on a bot
+            # that is in the middle of a long search
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+    def _run_window(
+        self, events: "multiprocessing.Queue[List[Tuple[Any, ...]]]"
+    ) -> None:
+        cfg = self.config
+        pygame.init()
+        screen = pygame.display.set_mode((cfg.window_width, cfg.window_height))
+        clock = pygame.time.Clock()
+        font = pygame.font.Font(None, cfg.label_height + 4)
+        self._layout()
+
+        screen.fill(cfg.background_color)
+        pygame.display.flip()
+        caption_time = 0.0
+
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    running = False
+
+            self._drain(events)
+
+            dirty_rects = []
+            for tile in self._tiles:
+                self._update_tile(tile, font)
+                if tile.dirty:
+                    self._draw_tile(screen, tile)
+                    dirty_rects.append(tile.rect)
+                    tile.dirty = False
+
+            # Only the changed tiles are copied to the display
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            self.telemetry.record_frame(clock.tick(cfg.fps))
+
+            now = time.monotonic()
+            if now - caption_time >= 1.0:
+                caption_time = now
+                pygame.display.set_caption(
+                    f"Connect Four - {len(self._tiles)} boards, "
+                    f"{self.games_finished} games finished, {clock.get_fps():.0f} fps"
+                )
+
+        pygame.quit()
+
+    def _layout(self) -> None:
+        """Pick the grid that gives the largest boards and build the sprites."""
+        cfg = self.config
+        rows, cols = BOARD_ROWS, BOARD_COLS
+        n = len(self.pairings)
+
+        best = (0, 1)
+        for grid_cols in range(1, n + 1):
+            grid_rows = math.ceil(n / grid_cols)
+            tile_w = cfg.window_width // grid_cols
+            tile_h = cfg.window_height // grid_rows
+            cell = min(
+                (tile_w - cfg.tile_padding) // cols,
+                (tile_h - cfg.tile_padding - cfg.label_height) // rows,
+            )
+            if cell > best[0]:
+                best = (cell, grid_cols)
+        cell, grid_cols = best
+        if cell < 2:
+            raise ValueError(f"{n} boards do not fit in the window")
+
+        grid_rows = math.ceil(n / grid_cols)
+        tile_w = cfg.window_width // grid_cols
+        tile_h = cfg.window_height // grid_rows
+        self._cell_size = cell
+        self._tiles = [
+            _Tile(
+                slot,
+                pygame.Rect(
+                    (slot % grid_cols) * tile_w,
+                    (slot // grid_cols) * tile_h,
+                    tile_w,
+                    tile_h,
+                ),
+            )
+            for slot in range(n)
+        ]
+
+        # One board sprite and one sprite per color, shared by every tile
+        radius = max(cell // 2 - max(cell // 10, 1), 1)
+        board = pygame.Surface((cols * cell, rows * cell))
+        board.fill(cfg.board_color)
+        for col in range(cols):
+            for row in range(rows):
+                center = (col * cell + cell // 2, row * cell + cell // 2)
+                pygame.draw.circle(board, cfg.empty_color, center, radius)
+        self._board_sprite = board.convert()
+
+        for color, rgb in (
+            (CellState.Red, cfg.red_color),
+            (CellState.Yellow, cfg.yellow_color),
+        ):
+            piece = pygame.Surface((cell, cell), pygame.SRCALPHA)
+            pygame.draw.circle(piece, rgb, (cell // 2, cell // 2), radius)
+            self._piece_sprites[color] = piece.convert_alpha()
+
+    def _drain(self, events: "multiprocessing.Queue[List[Tuple[Any, ...]]]") -> None:
+        """Hand every queued event to its tile without blocking."""
+        while True:
+            try:
+                batch = events.get_nowait()
+            except queue.Empty:
+                return
+            for event in batch:
+                self._tiles[event[1]].pending.append(event)
+
+    def _update_tile(self, tile: _Tile, font: pygame.font.Font) -> None:
+        """Advance a tile's animation and apply its pending events."""
+        cfg = self.config
+        if tile.drop is not None:
+            if tile.pending:
+                # More moves are waiting: this board outpaces the animation
+                self._finish_drop(tile)
+            else:
+                tile.drop[2] += tile.drop[3] / cfg.animation_frames
+                if tile.drop[2] >= tile.drop[3]:
+                    self._finish_drop(tile)
+                tile.dirty = True
+                return
+
+        while tile.pending:
+            event = tile.pending.popleft()
+            kind = event[0]
+            if kind == "move":
+                col = event[2]
+                if cfg.animation_frames > 0 and not tile.pending:
+                    row = tile.board.column_heights[col]
+                    target = (BOARD_ROWS - 1 - row) * self._cell_size
+                    tile.drop = [col, row, 0.0, float(target)]
+                    if target <= 0:
+                        self._finish_drop(tile)
+                else:
+                    tile.board = tile.board.make_move(col)
+            elif kind == "start":
+                tile.board = ConnectFourBoard()
+                tile.label = font.render(
+                    f"{event[2]} vs {event[3]}", True, cfg.text_color
+                )
+            elif kind == "end":
+                winner, forfeit = event[2], event[3]
+                text = "draw" if winner is None else f"{winner} wins"
+                if forfeit:
+                    text += " (forfeit)"
+                tile.label = font.render(text, True, cfg.win_highlight_color)
+                self.games_finished += 1
+            tile.dirty = True
+
+    def _finish_drop(self, tile: _Tile) -> None:
+        tile.board = tile.board.make_move(tile.drop[0])
+        tile.drop = None
+        tile.dirty = True
+
+    def _draw_tile(self, screen: pygame.Surface, tile: _Tile) -> None:
+        cfg = self.config
+        cell = self._cell_size
+        screen.fill(cfg.background_color, tile.rect)
+
+        board_w, board_h = BOARD_COLS * cell, BOARD_ROWS * cell
+        x0 = tile.rect.x + (tile.rect.width - board_w) // 2
+        y0 = (
+            tile.rect.y
+            + cfg.label_height
+            + (tile.rect.height - cfg.label_height - board_h) // 2
+        )
+
+        if tile.label is not None:
+            screen.blit(
+                tile.label,
+                tile.label.get_rect(midtop=(tile.rect.centerx, tile.rect.y + 2)),
+            )
+        screen.blit(self._board_sprite, (x0, y0))
+
+        for col, column in enumerate(tile.board.cell_states):
+            for row, cell_state in enumerate(column):
+                if cell_state is None:
+                    break  # pieces stack from the bottom
+                screen.blit(
+                    self._piece_sprites[cell_state],
+                    (x0 + col * cell, y0 + (BOARD_ROWS - 1 - row) * cell),
+                )
+
+        if tile.drop is not None:
+            col, _, y, _ = tile.drop
+            screen.blit(
+                self._piece_sprites[tile.board.current_player],
+                (x0 + col * cell, y0 + int(y)),
+            )
@@ -0,0 +1,278 @@
+"""
+Frame-time and bot-latency metrics for game sessions.
+
+``Telemetry`` keeps fixed-size histograms, so a long-running session uses
+constant memory. Snapshots export as JSON lines or Prometheus text.
+"""
+
+import json
+import time
+from bisect import bisect_left
+from typing import IO, Dict, Iterator, List, Sequence, Tuple
+
+from pingv4._core import CellState, ConnectFourBoard
+from pingv4.bot.base import AbstractBot
+
+# Histogram bucket upper bounds in milliseconds: 0.1ms to ~90s, four buckets
+# per doubling, so interpolated quantiles are within ~19% of the true value.
+BUCKET_BOUNDS_MS: Tuple[float, ...] = tuple(0.1 * 2 ** (i / 4) for i in range(80))
+
+# Every fourth bound (the powers of two) is exported to Prometheus
+_EXPORT_BUCKETS = range(0, len(BUCKET_BOUNDS_MS), 4)
+
+PHASE_OPENING = "opening"
+PHASE_MIDDLEGAME = "middlegame"
+PHASE_ENDGAME = "endgame"
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def game_phase(board: ConnectFourBoard) -> str:
+    """Classify a position by the number of pieces on the board."""
+    return phase_of_ply(board.num_moves, board.num_rows * board.num_cols)
+
+
+def phase_of_ply(pieces: int, cells: int = 42) -> str:
+    """Classify a position with ``pieces`` pieces on a board of ``cells`` cells."""
+    if pieces < cells // 3:
+        return PHASE_OPENING
+    if pieces < 2 * cells // 3:
+        return PHASE_MIDDLEGAME
+    return PHASE_ENDGAME
+
+
+def bot_label(bot: AbstractBot) -> str:
+    """
+    Name a bot in metrics by its strategy and color, so two bots with the
+    same strategy (such as a self-play match) are kept apart.
+    """
+    color = "red" if bot.player == CellState.Red else "yellow"
+    return f"{bot.strategy_name} ({color})"
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in milliseconds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        # One extra bucket for values above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                low = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                high = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max
+                value = low + (high - low) * (rank - seen) / bucket_count
+                return min(value, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        summary = {"count": self.count, "mean_ms": self.mean}
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}_ms"] = self.quantile(q)
+        summary["max_ms"] = self.max
+        return summary
+
+
+class Telemetry:
+    """
+    Metrics for one or more game sessions.
+
+    Frame times come from the render loop; a frame that overruns the
+    ``target_fps`` budget counts the frames it displaced as dropped.
+    ``get_move`` latency is kept per bot and per game phase.
+
+    Example::
+
+        telemetry = Telemetry()
+        Connect4Game(player2=MinimaxBot, telemetry=telemetry).run()
+        print(telemetry.to_prometheus())
+    """
+
+    def __init__(self, target_fps: int = 60) -> None:
+        self.target_fps = target_fps
+        self.frame_budget_ms = 1000 / target_fps
+        self.frames = LatencyHistogram()
+        self.dropped_frames = 0
+        self.move_errors: Dict[str, int] = {}
+        # (bot, phase) -> get_move latency
+        self._moves: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record_frame(self, frame_ms: float) -> None:
+        self.frames.observe(frame_ms)
+        if frame_ms > self.frame_budget_ms:
+            self.dropped_frames += int(frame_ms / self.frame_budget_ms) - 1
+
+    def record_move(self, bot: str, phase: str, latency_ms: float) -> None:
+        key = (bot, phase)
+        histogram = self._moves.get(key)
+        if histogram is None:
+            histogram = self._moves[key] = LatencyHistogram()
+        histogram.observe(latency_ms)
+
+    def timed_get_move(self, bot: AbstractBot, board: ConnectFourBoard) -> int:
+        """
+        Call ``bot.get_move(board)`` and record its latency.
+
+        The call is recorded under ``bot_label(bot)``. Failed calls are counted
+        per bot and their latency is still recorded; the exception propagates
+        to the caller.
+        """
+        name = bot_label(bot)
+        phase = game_phase(board)
+        start = time.perf_counter()
+        try:
+            return bot.get_move(board)
+        except Exception:
+            self.move_errors[name] = self.move_errors.get(name, 0) + 1
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.record_move(name, phase, latency_ms)
+
+    def timed_get_moves(
+        self, bot: AbstractBot, boards: Sequence[ConnectFourBoard]
+    ) -> List[int]:
+        """
+        Call ``bot.get_moves(boards)`` and record the batch's latency as an
+        equal share per board, so batched moves stay comparable with single
+        ones. Failures are counted as in ``timed_get_move``.
+        """
+        name = bot_label(bot)
+        start = time.perf_counter()
+        try:
+            return bot.get_moves(boards)
+        except Exception:
+            self.move_errors[name] = self.move_errors.get(name, 0) + 1
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000 / max(len(boards), 1)
+            for board in boards:
+                self.record_move(name, game_phase(board), latency_ms)
+
+    def move_latency(self, bot: str, phase: str) -> LatencyHistogram:
+        """Latency histogram for one bot and phase (empty if never recorded)."""
+        return self._moves.get((bot, phase), LatencyHistogram())
+
+    def bot_latency(self, bot: str) -> LatencyHistogram:
+        """Latency histogram for one bot across all phases."""
+        merged = LatencyHistogram()
+        for (name, _), histogram in self._moves.items():
+            if name != bot:
+                continue
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+        return merged
+
+    @property
+    def bots(self) -> List[str]:
+        return sorted({name for name, _ in self._moves})
+
+    def snapshot(self) -> Iterator[Dict[str, object]]:
+        """One record for the frame metrics, then one per (bot, phase)."""
+        frames = self.frames.summary()
+        frames.update(
+            metric="frame_time",
+            target_fps=self.target_fps,
+            dropped_frames=self.dropped_frames,
+        )
+        yield frames
+
+        for (bot, phase), histogram in sorted(self._moves.items()):
+            record = histogram.summary()
+            record.update(
+                metric="get_move_latency",
+                bot=bot,
+                phase=phase,
+                errors=self.move_errors.get(bot, 0),
+            )
+            yield record
+
+    def write_json_lines(self, file: IO[str]) -> None:
+        """Write the snapshot as JSON lines, tagged with a Unix timestamp."""
+        timestamp = time.time()
+        for record in self.snapshot():
+            record["timestamp"] = timestamp
+            file.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP pingv4_frame_seconds Render loop frame time.",
+            "# TYPE pingv4_frame_seconds histogram",
+        ]
+        lines.extend(_prometheus_histogram("pingv4_frame_seconds", {}, self.frames))
+        lines += [
+            "# HELP pingv4_dropped_frames_total Frames lost to overrunning the target frame rate.",
+            "# TYPE pingv4_dropped_frames_total counter",
+            f"pingv4_dropped_frames_total {self.dropped_frames}",
+            "# HELP pingv4_get_move_seconds Bot get_move latency by game phase.",
+            "# TYPE pingv4_get_move_seconds histogram",
+        ]
+        for (bot, phase), histogram in sorted(self._moves.items()):
+            labels = {"bot": bot, "phase": phase}
+            lines.extend(
+                _prometheus_histogram("pingv4_get_move_seconds", labels, histogram)
+            )
+        lines += [
+            "# HELP pingv4_get_move_errors_total get_move calls that raised.",
+            "# TYPE pingv4_get_move_errors_total counter",
+        ]
+        for bot, errors in sorted(self.move_errors.items()):
+            lines.append(
+                f"pingv4_get_move_errors_total{_format_labels({'bot': bot})} {errors}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _prometheus_histogram(
+    name: str, labels: Dict[str, str], histogram: LatencyHistogram
+) -> Iterator[str]:
+    cumulative = 0
+    exported = iter(_EXPORT_BUCKETS)
+    next_export = next(exported, None)
+    for i, bound in enumerate(BUCKET_BOUNDS_MS):
+        cumulative += histogram.counts[i]
+        if i == next_export:
+            bucket_labels = dict(labels, le=f"{bound / 1000:.6g}")
+            yield f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+            next_export = next(exported, None)
+
+    yield f"{name}_bucket{_format_labels(dict(labels, le='+Inf'))} {histogram.count}"
+    yield f"{name}_sum{_format_labels(labels)} {histogram.total / 1000:.6f}"
+    yield f"{name}_count{_format_labels(labels)} {histogram.count}"
@@ -0,0 +1,209 @@
+"""
+Texel-style tuning of ``MinimaxBot``'s evaluation weights.
+
+Every labeled position is reduced to the evaluation's feature counts in one
+native pass (``pingv4._core.window_features``). After that, evaluating the
+whole dataset is a single matrix product. With the current weights, the tuner
+first finds the scale ``k`` at which ``sigmoid(k * eval)`` best predicts the
+game results. It then fits the weights by gradient descent on the logistic
+loss, holding ``k`` fixed, so the tuned weights stay on the evaluation's scale
+and remain comparable with its win score and aspiration window.
+
+Positions and results come from self-play shards (see ``pingv4.selfplay``).
+Their results are from the perspective of the player to move, like the
+features. Requires numpy (``pip install pingv4[numpy]``).
+
+The fit is an approximation of how the weights are used. It weights the
+opponent's threes by ``block`` relative to the player to move, but
+``MinimaxBot`` scores positions for its own color and weights the threes of
+its opponent, whoever is to move. At search leaves where the bot is to move
+the two agree. Where the opponent is to move, the search sees the mirror
+image: the mover's own threes carry the ``block`` factor and the other
+side's do not. The two forms coincide when ``block`` is 1, so a tuned
+``block`` far from 1 is only accurate for half of the leaves.
+
+Example::
+
+    hashes, results = load_positions(glob.glob("selfplay/*.tsv"))
+    tuned = tune(hashes, results)
+    tuned.weights.save("weights.json")
+    MinimaxBot(CellState.Red, weights="weights.json")
+"""
+
+import math
+from typing import Iterable, NamedTuple, Tuple
+
+import numpy as np
+
+from pingv4._core import window_features
+from pingv4.bot.minimax import EvalWeights
+from pingv4.selfplay import read_records
+
+# Columns of window_features
+OWN_FOUR, OWN_THREE, OWN_TWO, OPP_FOUR, OPP_THREE, OPP_TWO, CENTER = range(7)
+
+
+class TuningResult(NamedTuple):
+    """Outcome of ``tune``."""
+
+    weights: EvalWeights
+    # Scale from evaluation units to the logit of the expected result
+    k: float
+    # Mean logistic loss on the validation positions, before and after
+    loss_before: float
+    loss_after: float
+    # Positions used for fitting and for validation
+    train_positions: int
+    validation_positions: int
+
+
+def load_positions(paths: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the positions of self-play shards.
+
+    Args:
+        paths: Shard files written by ``pingv4.selfplay.generate``.
+
+    Returns:
+        ``board.hash`` of every position as uint64, and the result for the
+        player to move as float32: 1 for a win, 0.5 for a draw, 0 for a loss.
+    """
+    hashes = []
+    results = []
+    for record in read_records(paths):
+        hashes.append(record.hash)
+        results.append(record.result)
+    return (
+        np.array(hashes, dtype=np.uint64),
+        (np.array(results, dtype=np.float32) + 1) / 2,
+    )
+
+
+def design_matrix(features: np.ndarray) -> np.ndarray:
+    """
+    Turn ``window_features`` counts into the terms the weights multiply.
+
+    The evaluation is ``X @ [three, -three * block, two, center]`` plus the
+    win score for completed fours, where the columns of ``X`` are the
+    player's threes, the opponent's threes, the player's twos minus the
+    opponent's, and the center difference.
+    """
+    return np.stack(
+        [
+            features[:, OWN_THREE],
+            features[:, OPP_THREE],
+            features[:, OWN_TWO] - features[:, OPP_TWO],
+            features[:, CENTER],
+        ],
+        axis=1,
+    ).astype(np.float32)
+
+
+def weight_vector(weights: EvalWeights) -> np.ndarray:
+    """The coefficients of ``design_matrix`` columns for ``weights``."""
+    return np.array(
+        [weights.three, -weights.three * weights.block, weights.two, weights.center],
+        dtype=np.float64,
+    )
+
+
+def log_loss(evals: np.ndarray, results: np.ndarray, k: float) -> float:
+    """Mean logistic loss of predicting ``results`` with ``sigmoid(k * evals)``."""
+    z = k * evals
+    # log(1 + e^z) - y * z, which is stable for large |z|
+    return float(np.mean(np.logaddexp(0.0, z) - results * z))
+
+
+def fit_scale(evals: np.ndarray, results: np.ndarray) -> float:
+    """
+    Find the ``k`` that minimizes ``log_loss`` by golden-section search on
+    ``log k``, which the loss is unimodal in.
+    """
+    lo, hi = math.log(1e-6), math.log(1.0)
+    ratio = (math.sqrt(5) - 1) / 2
+    a = hi - ratio * (hi - lo)
+    b = lo + ratio * (hi - lo)
+    loss_a = log_loss(evals, results, math.exp(a))
+    loss_b = log_loss(evals, results, math.exp(b))
+    for _ in range(60):
+        if loss_a < loss_b:
+            hi, b, loss_b = b, a, loss_a
+            a = hi - ratio * (hi - lo)
+            loss_a = log_loss(evals, results, math.exp(a))
+        else:
+            lo, a, loss_a = a, b, loss_b
+            b = lo + ratio * (hi - lo)
+            loss_b = log_loss(evals, results, math.exp(b))
+    return math.exp((lo + hi) / 2)
+
+
+def tune(
+    hashes: np.ndarray,
+    results: np.ndarray,
+    initial: EvalWeights = EvalWeights(),
+    epochs: int = 500,
+    validation_fraction: float = 0.1,
+    seed: int = 0,
+) -> TuningResult:
+    """
+    Fit evaluation weights to game results.
+
+    Positions with a completed four are left out, since the evaluation
+    scores them as wins whatever the weights.
+
+    Args:
+        hashes: ``board.hash`` of every position.
+        results: Result for the player to move, from 0 (loss) to 1 (win).
+        initial: Starting weights, which also set the scale ``k``.
+        epochs: Full-batch gradient steps.
+        validation_fraction: Share of positions held out to measure the loss.
+        seed: Seed for the validation split.
+
+    Returns:
+        The tuned weights and the validation loss before and after.
+    """
+    features = window_features(hashes)
+    open_positions = (features[:, OWN_FOUR] == 0) & (features[:, OPP_FOUR] == 0)
+    x = design_matrix(features[open_positions])
+    y = np.asarray(results, dtype=np.float32)[open_positions]
+    if len(y) < 2:
+        raise ValueError("need at least two positions without a completed four")
+
+    order = np.random.default_rng(seed).permutation(len(y))
+    num_validation = min(max(1, int(len(y) * validation_fraction)), len(y) - 1)
+    val, train = order[:num_validation], order[num_validation:]
+    x_train, y_train = x[train], y[train]
+
+    theta = weight_vector(initial)
+    k = fit_scale(x_train @ theta, y_train)
+    loss_before = log_loss(x[val] @ theta, y[val], k)
+
+    # Descend in standardized coordinates, where one step size suits every
+    # weight. The loss is smooth with its curvature bounded by k^2 / 4 times
+    # the largest eigenvalue of z'z / n, and 1 / that bound is a safe step.
+    scale = np.sqrt(np.mean(x_train.astype(np.float64) ** 2, axis=0))
+    scale[scale == 0] = 1.0
+    z = x_train / scale.astype(np.float32)
+    beta = theta * scale
+    curvature = k * k / 4 * np.linalg.eigvalsh(z.T.astype(np.float64) @ z / len(z))[-1]
+    step = 1.0 / curvature
+    for _ in range(epochs):
+        predicted = 1.0 / (1.0 + np.exp(-k * (z @ beta)))
+        beta -= step * k * (z.T @ (predicted - y_train)) / len(z)
+    theta = beta / scale
+
+    three, opp_three, two, center = (float(value) for value in theta)
+    weights = EvalWeights(
+        three=three,
+        two=two,
+        block=-opp_three / three if three else initial.block,
+        center=center,
+    )
+    return TuningResult(
+        weights,
+        k,
+        loss_before,
+        log_loss(x[val] @ theta, y[val], k),
+        len(train),
+        len(val),
+    )
@@ -0,0 +1,140 @@
+use numpy::{
+    AllowTypeChange, PyArray1, PyArray2, PyArray3, PyArrayLike1, PyArrayMethods,
+    PyUntypedArrayMethods,
+};
+use pyo3::exceptions::{PyIndexError, PyValueError};
+use pyo3::prelude::*;
+
+use super::{game_wrapper::GameWrapper, ConnectFourBoard, C, R};
+use crate::core::game::BoardBatch as CoreBatch;
+
+type Observations = Py<PyArray3<i8>>;
+
+/// N games stepped in lockstep for reinforcement learning.
+///
+/// The observation, reward, done and mask arrays are allocated once and
+/// rewritten in place, so every call returns the same numpy objects.
+#[pyclass]
+pub struct BoardBatch {
+    inner: CoreBatch<R, C>,
+    obs: Observations,
+    rewards: Py<PyArray1<f32>>,
+    dones: Py<PyArray1<bool>>,
+    mask: Py<PyArray2<bool>>,
+}
+
+#[pymethods]
+impl BoardBatch {
+    #[new]
+    fn new(py: Python<'_>, n: usize) -> PyResult<Self> {
+        if n == 0 {
+            return Err(PyValueError::new_err("batch size must be positive"));
+        }
+
+        Ok(BoardBatch {
+            inner: CoreBatch::new(n),
+            // all zeros is the empty board, which is where every game starts
+            obs: PyArray3::zeros(py, [n, C, R], false).unbind(),
+            rewards: PyArray1::zeros(py, n, false).unbind(),
+            dones: PyArray1::zeros(py, n, false).unbind(),
+            mask: PyArray2::zeros(py, [n, C], false).unbind(),
+        })
+    }
+
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    #[getter]
+    fn obs(&self, py: Python<'_>) -> Observations {
+        self.obs.clone_ref(py)
+    }
+
+    fn reset(&mut self, py: Python<'_>) -> PyResult<Observations> {
+        self.inner.reset();
+        self.write_observations(py)?;
+        Ok(self.obs.clone_ref(py))
+    }
+
+    fn step<'py>(
+        &mut self,
+        py: Python<'py>,
+        actions: PyArrayLike1<'py, i64, AllowTypeChange>,
+    ) -> PyResult<(Observations, Py<PyArray1<f32>>, Py<PyArray1<bool>>)> {
+        if actions.len() != self.inner.len() {
+            return Err(PyValueError::new_err(format!(
+                "expected {} actions, got {}",
+                self.inner.len(),
+                actions.len()
+            )));
+        }
+
+        // strided input (e.g. a column of a larger array) needs one copy
+        let view = actions.as_array();
+        let copied: Vec<i64>;
+        let actions = match view.as_slice() {
+            Some(slice) => slice,
+            None => {
+                copied = view.iter().copied().collect();
+                &copied
+            }
+        };
+
+        let rewards = self.rewards.bind(py);
+        let dones = self.dones.bind(py);
+        let obs = self.obs.bind(py);
+        let mut rewards = rewards.try_readwrite()?;
+        let mut dones = dones.try_readwrite()?;
+        let mut obs = obs.try_readwrite()?;
+        let (rewards, dones, obs) = (
+            rewards.as_slice_mut()?,
+            dones.as_slice_mut()?,
+            obs.as_slice_mut()?,
+        );
+
+        // the arrays stay borrowed, so other threads can't step this batch
+        // while the games are played without the GIL
+        let inner = &mut self.inner;
+        py.allow_threads(|| {
+            inner.step(actions, rewards, dones)?;
+            inner.write_observations(obs);
+            Ok(())
+        })
+        .map_err(|(idx, e)| PyValueError::new_err(format!("game {}: {}", idx, e)))?;
+
+        Ok((
+            self.obs.clone_ref(py),
+            self.rewards.clone_ref(py),
+            self.dones.clone_ref(py),
+        ))
+    }
+
+    fn legal_mask(&self, py: Python<'_>) -> PyResult<Py<PyArray2<bool>>> {
+        let mask = self.mask.bind(py);
+        self.inner
+            .write_legal_mask(mask.try_readwrite()?.as_slice_mut()?);
+        Ok(self.mask.clone_ref(py))
+    }
+
+    fn hashes<'py>(&self, py: Python<'py>) -> Bound<'py, PyArray1<u64>> {
+        PyArray1::from_iter(py, self.inner.boards().iter().map(|b| b.hash()))
+    }
+
+    fn board(&self, idx: usize) -> PyResult<ConnectFourBoard> {
+        match self.inner.boards().get(idx) {
+            Some(board) => Ok(ConnectFourBoard::from_inner(GameWrapper::InProgress(
+                board.clone(),
+            ))),
+            None => Err(PyIndexError::new_err("game index out of range")),
+        }
+    }
+}
+
+impl BoardBatch {
+    fn write_observations(&self, py: Python<'_>) -> PyResult<()> {
+        let obs = self.obs.bind(py);
+        self.inner
+            .write_observations(obs.try_readwrite()?.as_slice_mut()?);
+        Ok(())
+    }
+}
@@ -0,0 +1,49 @@
+use numpy::{AllowTypeChange, PyArray1, PyArray2, PyArrayLike1, PyArrayMethods};
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+use super::{C, R};
+use crate::core::game::{window_features as board_features, NUM_FEATURES};
+
+/// Evaluation features of many positions given by `board.hash`, as an
+/// `[n, 7]` int16 array. The work runs without the GIL.
+#[pyfunction]
+pub fn window_features<'py>(
+    py: Python<'py>,
+    hashes: PyArrayLike1<'py, u64, AllowTypeChange>,
+) -> PyResult<Bound<'py, PyArray2<i16>>> {
+    // strided input (e.g. a column of a larger array) needs one copy
+    let view = hashes.as_array();
+    let copied: Vec<u64>;
+    let hashes = match view.as_slice() {
+        Some(slice) => slice,
+        None => {
+            copied = view.iter().copied().collect();
+            &copied
+        }
+    };
+
+    let mut features = vec![0i16; hashes.len() * NUM_FEATURES];
+    py.allow_threads(|| {
+        for (idx, (&hash, row)) in hashes
+            .iter()
+            .zip(features.chunks_exact_mut(NUM_FEATURES))
+            .enumerate()
+        {
+            let counts = board_features::<R, C>(hash).ok_or(idx)?;
+            // at most 69 windows on a 6x7 board, so every count fits
+            for (out, count) in row.iter_mut().zip(counts) {
+                *out = count as i16;
+            }
+        }
+        Ok(())
+    })
+    .map_err(|idx: usize| {
+        PyValueError::new_err(format!(
+            "hash {} at index {} is not a board",
+            hashes[idx], idx
+        ))
+    })?;
+
+    PyArray1::from_vec(py, features).reshape([hashes.len(), NUM_FEATURES])
+}
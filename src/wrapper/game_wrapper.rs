@@ -1,6 +1,7 @@
 use pyo3::prelude::*;
+use pyo3::sync::GILOnceCell;
 
-use crate::core::game::{state, Board, CellState, GameplayError, TurnResult};
+use crate::core::game::{state, Board, CellState, GameplayError, PlayoutStats, TurnResult};
 
 pub enum GameWrapper<const R: usize, const C: usize> {
     InProgress(Board<R, C, state::InProgress>),
@@ -36,6 +37,33 @@ impl<const R: usize, const C: usize> GameWrapper<R, C> {
         }
     }
 
+    #[inline]
+    pub fn num_moves(&self) -> usize {
+        match self {
+            Self::InProgress(b) => b.num_moves(),
+            Self::Victory(b) => b.num_moves(),
+            Self::Draw(b) => b.num_moves(),
+        }
+    }
+
+    #[inline]
+    pub fn player_mask(&self, player: CellState) -> u64 {
+        match self {
+            Self::InProgress(b) => b.player_mask(player),
+            Self::Victory(b) => b.player_mask(player),
+            Self::Draw(b) => b.player_mask(player),
+        }
+    }
+
+    #[inline]
+    pub fn occupied_mask(&self) -> u64 {
+        match self {
+            Self::InProgress(b) => b.occupied_mask(),
+            Self::Victory(b) => b.occupied_mask(),
+            Self::Draw(b) => b.occupied_mask(),
+        }
+    }
+
     #[inline]
     pub fn get_cell(&self, col: usize, row: usize) -> Option<CellState> {
         let cell_states = self.get_cell_states();
@@ -60,6 +88,35 @@ impl<const R: usize, const C: usize> GameWrapper<R, C> {
             _ => vec![],
         }
     }
+
+    // a finished game has no moves, so only the empty sequence is counted
+    pub fn perft(&self, depth: u32) -> u64 {
+        match self {
+            Self::InProgress(b) => b.perft(depth),
+            _ => u64::from(depth == 0),
+        }
+    }
+
+    // finished games need no simulation: every playout ends the same way
+    pub fn random_playouts(&self, n: u64, seed: u64, threads: usize) -> PlayoutStats {
+        match self {
+            Self::InProgress(b) => b.random_playouts_parallel(n, seed, threads),
+            Self::Victory(b) => match b.winner() {
+                CellState::Red => PlayoutStats {
+                    red_wins: n,
+                    ..PlayoutStats::default()
+                },
+                CellState::Yellow => PlayoutStats {
+                    yellow_wins: n,
+                    ..PlayoutStats::default()
+                },
+            },
+            Self::Draw(_) => PlayoutStats {
+                draws: n,
+                ..PlayoutStats::default()
+            },
+        }
+    }
 }
 
 impl<const R: usize, const C: usize> From<TurnResult<R, C>> for GameWrapper<R, C> {
@@ -73,8 +130,9 @@ impl<const R: usize, const C: usize> From<TurnResult<R, C>> for GameWrapper<R, C
     }
 }
 
-#[pyclass(name = "CellState", eq, eq_int)]
-#[derive(Clone, PartialEq, Eq)]
+// Hashable so colors can key dicts; pyo3's `eq` alone sets __hash__ to None
+#[pyclass(name = "CellState", eq, eq_int, frozen, hash)]
+#[derive(Clone, PartialEq, Eq, Hash)]
 pub enum PyCellState {
     Yellow = 0,
     Red = 1,
@@ -90,6 +148,30 @@ impl From<CellState> for PyCellState {
     }
 }
 
+impl From<&PyCellState> for CellState {
+    #[inline]
+    fn from(value: &PyCellState) -> Self {
+        match value {
+            PyCellState::Red => CellState::Red,
+            PyCellState::Yellow => CellState::Yellow,
+        }
+    }
+}
+
+// One Python object per color, shared by every board, so reading cells
+// never allocates
+static RED: GILOnceCell<Py<PyCellState>> = GILOnceCell::new();
+static YELLOW: GILOnceCell<Py<PyCellState>> = GILOnceCell::new();
+
+pub fn interned_cell_state(py: Python<'_>, value: CellState) -> PyResult<Py<PyCellState>> {
+    let (cell, py_value) = match value {
+        CellState::Red => (&RED, PyCellState::Red),
+        CellState::Yellow => (&YELLOW, PyCellState::Yellow),
+    };
+    cell.get_or_try_init(py, || Py::new(py, py_value))
+        .map(|obj| obj.clone_ref(py))
+}
+
 #[derive(Debug)]
 pub enum WrapperError {
     GameNotInProgress,
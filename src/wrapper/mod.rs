@@ -1,27 +1,61 @@
+mod batch;
+pub use batch::BoardBatch;
+
+mod features;
+pub use features::window_features;
+
 mod game_wrapper;
-use game_wrapper::GameWrapper;
 pub use game_wrapper::PyCellState;
+use game_wrapper::{interned_cell_state, GameWrapper};
 
-use pyo3::exceptions::PyValueError;
+use pyo3::exceptions::{PyIndexError, PyValueError};
 use pyo3::prelude::*;
+use pyo3::sync::GILOnceCell;
+use pyo3::types::{PyBytes, PyTuple};
 
 use crate::core::game::{Board, CellState};
 
 const R: usize = 6;
 const C: usize = 7;
 
-#[pyclass]
+// frozen: boards are immutable, so threads can share them without locking
+#[pyclass(frozen)]
 pub struct ConnectFourBoard {
     inner: GameWrapper<R, C>,
+    // built on first access and reused; a board never changes, so neither do they
+    heights_tuple: GILOnceCell<Py<PyTuple>>,
+    cells_tuple: GILOnceCell<Py<PyTuple>>,
+}
+
+impl ConnectFourBoard {
+    pub(crate) fn from_inner(inner: GameWrapper<R, C>) -> Self {
+        ConnectFourBoard {
+            inner,
+            heights_tuple: GILOnceCell::new(),
+            cells_tuple: GILOnceCell::new(),
+        }
+    }
+}
+
+// Cell codes used by `column` and `row`
+const EMPTY_CODE: u8 = 0;
+const RED_CODE: u8 = 1;
+const YELLOW_CODE: u8 = 2;
+
+#[inline]
+const fn cell_code(cell: Option<CellState>) -> u8 {
+    match cell {
+        None => EMPTY_CODE,
+        Some(CellState::Red) => RED_CODE,
+        Some(CellState::Yellow) => YELLOW_CODE,
+    }
 }
 
 #[pymethods]
 impl ConnectFourBoard {
     #[new]
     fn new() -> Self {
-        ConnectFourBoard {
-            inner: GameWrapper::InProgress(Board::default()),
-        }
+        ConnectFourBoard::from_inner(GameWrapper::InProgress(Board::default()))
     }
 
     #[getter]
@@ -35,8 +69,16 @@ impl ConnectFourBoard {
     }
 
     #[getter]
-    fn column_heights(&self) -> [usize; C] {
-        self.inner.column_heights().clone()
+    fn column_heights<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyTuple>> {
+        let heights = self.heights_tuple.get_or_try_init(py, || {
+            PyTuple::new(py, self.inner.column_heights()).map(Bound::unbind)
+        })?;
+        Ok(heights.bind(py).clone())
+    }
+
+    #[getter]
+    fn num_moves(&self) -> usize {
+        self.inner.num_moves()
     }
 
     #[getter]
@@ -53,10 +95,10 @@ impl ConnectFourBoard {
     }
 
     #[getter]
-    fn current_player(&self) -> Option<PyCellState> {
+    fn current_player(&self, py: Python<'_>) -> PyResult<Option<Py<PyCellState>>> {
         match &self.inner {
-            GameWrapper::InProgress(b) => Some(PyCellState::from(b.player())),
-            _ => None,
+            GameWrapper::InProgress(b) => interned_cell_state(py, b.player()).map(Some),
+            _ => Ok(None),
         }
     }
 
@@ -69,10 +111,10 @@ impl ConnectFourBoard {
     }
 
     #[getter]
-    fn winner(&self) -> Option<PyCellState> {
+    fn winner(&self, py: Python<'_>) -> PyResult<Option<Py<PyCellState>>> {
         match &self.inner {
-            GameWrapper::Victory(b) => Some(PyCellState::from(b.winner())),
-            _ => None,
+            GameWrapper::Victory(b) => interned_cell_state(py, b.winner()).map(Some),
+            _ => Ok(None),
         }
     }
 
@@ -86,7 +128,7 @@ impl ConnectFourBoard {
 
     fn make_move(&self, col_idx: usize) -> PyResult<ConnectFourBoard> {
         match self.inner.make_move(col_idx) {
-            Ok(new_state) => Ok(ConnectFourBoard { inner: new_state }),
+            Ok(new_state) => Ok(ConnectFourBoard::from_inner(new_state)),
             Err(e) => Err(PyValueError::new_err(e.to_string())),
         }
     }
@@ -95,17 +137,91 @@ impl ConnectFourBoard {
         self.inner.get_valid_moves()
     }
 
+    #[pyo3(signature = (n, seed, threads = 1))]
+    fn random_playouts(
+        &self,
+        py: Python<'_>,
+        n: u64,
+        seed: u64,
+        threads: usize,
+    ) -> (u64, u64, u64) {
+        let inner = &self.inner;
+        let stats = py.allow_threads(|| inner.random_playouts(n, seed, threads));
+        (stats.red_wins, stats.yellow_wins, stats.draws)
+    }
+
+    fn perft(&self, py: Python<'_>, depth: u32) -> u64 {
+        let inner = &self.inner;
+        py.allow_threads(|| inner.perft(depth))
+    }
+
     #[getter]
-    fn cell_states(&self) -> [[Option<PyCellState>; R]; C] {
+    fn cell_states<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyTuple>> {
+        let cell_states = self.cells_tuple.get_or_try_init(py, || {
+            let red = interned_cell_state(py, CellState::Red)?;
+            let yellow = interned_cell_state(py, CellState::Yellow)?;
+            let columns = self
+                .inner
+                .get_cell_states()
+                .iter()
+                .map(|column| {
+                    PyTuple::new(
+                        py,
+                        column.iter().map(|cell| match cell {
+                            Some(CellState::Red) => Some(red.clone_ref(py)),
+                            Some(CellState::Yellow) => Some(yellow.clone_ref(py)),
+                            None => None,
+                        }),
+                    )
+                })
+                .collect::<PyResult<Vec<_>>>()?;
+            PyTuple::new(py, columns).map(Bound::unbind)
+        })?;
+        Ok(cell_states.bind(py).clone())
+    }
+
+    fn __getitem__(
+        &self,
+        py: Python<'_>,
+        idx: (usize, usize),
+    ) -> PyResult<Option<Py<PyCellState>>> {
+        let (col, row) = idx;
         self.inner
+            .get_cell(col, row)
+            .map(|c| interned_cell_state(py, c))
+            .transpose()
+    }
+
+    fn column<'py>(&self, py: Python<'py>, col_idx: usize) -> PyResult<Bound<'py, PyBytes>> {
+        let column = self
+            .inner
             .get_cell_states()
-            .clone()
-            .map(|col| col.map(|c| c.map(PyCellState::from)))
+            .get(col_idx)
+            .ok_or_else(|| PyIndexError::new_err("column index out of range"))?;
+        Ok(PyBytes::new(py, &column.map(cell_code)))
     }
 
-    fn __getitem__(&self, idx: (usize, usize)) -> Option<PyCellState> {
-        let (col, row) = idx;
-        self.inner.get_cell(col, row).map(|c| c.into())
+    fn row<'py>(&self, py: Python<'py>, row_idx: usize) -> PyResult<Bound<'py, PyBytes>> {
+        if row_idx >= R {
+            return Err(PyIndexError::new_err("row index out of range"));
+        }
+        let cell_states = self.inner.get_cell_states();
+        let row: [u8; C] = std::array::from_fn(|col| cell_code(cell_states[col][row_idx]));
+        Ok(PyBytes::new(py, &row))
+    }
+
+    #[pyo3(signature = (player = None))]
+    fn mask(&self, player: Option<PyCellState>) -> u64 {
+        match player {
+            Some(player) => self.inner.player_mask(CellState::from(&player)),
+            None => self.inner.occupied_mask(),
+        }
+    }
+
+    fn count(&self, player: PyCellState) -> u32 {
+        self.inner
+            .player_mask(CellState::from(&player))
+            .count_ones()
     }
 
     const fn __hash__(&self) -> u64 {
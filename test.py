@@ -1,4 +1,15 @@
 from pingv4._core import ConnectFourBoard, CellState
+from pingv4.bot.base import AbstractBot
+
+
+class LowestColumnBot(AbstractBot):
+    """Deterministic test bot: always plays the lowest valid column."""
+
+    deterministic = True
+    strategy_name = author_name = author_netid = "test"
+
+    def get_move(self, board):
+        return board.get_valid_moves()[0]
 
 
 def test_initial_board():
@@ -6,7 +17,7 @@ def test_initial_board():
     board = ConnectFourBoard()
     assert board.num_rows == 6
     assert board.num_cols == 7
-    assert board.column_heights == [0, 0, 0, 0, 0, 0, 0]
+    assert board.column_heights == (0, 0, 0, 0, 0, 0, 0)
     assert board.hash == 0
     # All cells should be empty
     # Access is column-major: board[col, row]
@@ -114,6 +125,38 @@ def test_cell_state_enum():
     assert cell != CellState.Yellow
 
 
+def test_cell_state_hashable():
+    """Test CellState works as a dict key, as the runners use it."""
+    names = {CellState.Red: "red", CellState.Yellow: "yellow"}
+    board = ConnectFourBoard().make_move(0)
+    assert names[board[0, 0]] == "red"
+    assert names[board.current_player] == "yellow"
+    assert hash(CellState.Red) != hash(CellState.Yellow)
+    assert int(CellState.Red) == 1 and int(CellState.Yellow) == 0
+
+
+def test_bot_roster():
+    """Test BotRoster creates and prepares one bot per class and color."""
+    from pingv4.bot.base import RandomBot
+    from pingv4.runner import BotRoster, play_game
+
+    class CountingBot(RandomBot):
+        prepared = 0
+
+        def prepare(self, time_budget):
+            CountingBot.prepared += 1
+
+    roster = BotRoster(prepare_time=0.1)
+    red = roster.get(CountingBot, CellState.Red)
+    assert roster.get(CountingBot, CellState.Red) is red
+    yellow = roster.get(CountingBot, CellState.Yellow)
+    assert yellow is not red and yellow.player == CellState.Yellow
+    assert len(roster) == 2 and CountingBot.prepared == 2
+
+    record = play_game(red, yellow)
+    assert record.moves and len(record.move_times_ms) == len(record.moves)
+
+
 def test_getitem_bounds():
     """Test __getitem__ with various indices."""
     board = ConnectFourBoard()
@@ -132,13 +175,13 @@ def test_column_heights_tracking():
     board = ConnectFourBoard()
 
     board = board.make_move(0)
-    assert board.column_heights == [1, 0, 0, 0, 0, 0, 0]
+    assert board.column_heights == (1, 0, 0, 0, 0, 0, 0)
 
     board = board.make_move(0)
-    assert board.column_heights == [2, 0, 0, 0, 0, 0, 0]
+    assert board.column_heights == (2, 0, 0, 0, 0, 0, 0)
 
     board = board.make_move(3)
-    assert board.column_heights == [2, 0, 0, 1, 0, 0, 0]
+    assert board.column_heights == (2, 0, 0, 1, 0, 0, 0)
 
 
 def test_game_not_in_progress_error():
@@ -190,6 +233,612 @@ def test_draw_game_error():
         )
 
 
+def test_random_playouts():
+    """Test native random playouts."""
+    board = ConnectFourBoard()
+
+    red_wins, yellow_wins, draws = board.random_playouts(500, 1)
+    assert red_wins + yellow_wins + draws == 500
+
+    # Same seed, same results; threads split the work but keep the total
+    assert board.random_playouts(500, 1) == (red_wins, yellow_wins, draws)
+    assert sum(board.random_playouts(500, 1, threads=4)) == 500
+
+    # A finished game always ends the same way
+    for move in [0, 0, 1, 1, 2, 2, 3]:
+        board = board.make_move(move)
+    assert board.random_playouts(10, 1) == (10, 0, 0)
+
+
+def test_bulk_accessors():
+    """Test interned cell states, cached tuples, bytes and bitboards."""
+    board = ConnectFourBoard()
+    for move in [3, 3, 4]:
+        board = board.make_move(move)
+
+    # Cells are shared objects and tuples are cached per board
+    assert board[3, 0] is board[4, 0]
+    assert board.cell_states[3][1] is board[3, 1]
+    assert board.cell_states is board.cell_states
+    assert board.column_heights is board.column_heights
+
+    # Bytes: 0 empty, 1 Red, 2 Yellow
+    assert board.column(3) == bytes([1, 2, 0, 0, 0, 0])
+    assert board.row(0) == bytes([0, 0, 0, 1, 1, 0, 0])
+
+    # Bitboards: bit col * 7 + row
+    assert board.mask(CellState.Red) == (1 << 21) | (1 << 28)
+    assert board.mask(CellState.Yellow) == 1 << 22
+    assert board.mask() == board.mask(CellState.Red) | board.mask(CellState.Yellow)
+
+    assert board.num_moves == 3
+    assert board.count(CellState.Red) == 2
+    assert board.count(CellState.Yellow) == 1
+
+
+def test_notation_round_trip():
+    """Test move strings replay to boards and back."""
+    from pingv4.notation import board_from_moves, format_moves, moves_from_board
+
+    board = board_from_moves("3342")
+    assert board.num_moves == 4 and board[3, 1] == CellState.Yellow
+    assert board_from_moves(moves_from_board(board)).hash == board.hash
+    assert format_moves([3, 3, 4, 2]) == "3342"
+
+
+def test_endgame_table():
+    """Test an endgame table's probes match exhaustive solving."""
+    import os
+    import tempfile
+
+    from pingv4.endgame import EndgameTable, build_endgame_table, solve_position
+    from pingv4.notation import board_from_moves
+
+    seed = "203154263065544102132635406100112243345560"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "endgame.bin")
+        count = build_endgame_table(path, [seed], max_empty=7, workers=1)
+        with EndgameTable(path) as table:
+            assert len(table) == count > 0
+            assert table.max_empty == 7
+            # Every in-progress position of the seed inside the table's range
+            for ply in range(42 - 7, 42):
+                board = board_from_moves(seed[:ply])
+                assert table.probe(board) == solve_position(board)
+            assert table.probe(board_from_moves(seed[:30])) is None
+
+
+def test_selfplay():
+    """Test self-play games are reproducible and leave the global RNG alone."""
+    import os
+    import random
+    import tempfile
+
+    from pingv4.bot.base import RandomBot
+    from pingv4.selfplay import Pairing, generate, play_selfplay_game, read_records
+
+    pairing = Pairing(RandomBot, RandomBot)
+    state = random.getstate()
+    first = play_selfplay_game(Pairing(LowestColumnBot, LowestColumnBot), 7)
+    assert random.getstate() == state
+    assert first == play_selfplay_game(Pairing(LowestColumnBot, LowestColumnBot), 7)
+    assert first[0].position == "" and first[0].hash == 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats = generate(tmp_dir, [pairing], num_games=20, workers=1)
+        assert stats.games == 20 and stats.forfeits == 0
+        assert all(os.path.exists(shard) for shard in stats.shards)
+        records = list(read_records(stats.shards))
+        assert len(records) == stats.positions
+        assert len({r.hash for r in records}) == len(records)
+        assert all(r.result in (-1, 0, 1) for r in records)
+
+
+def test_mcts_bot():
+    """Test MCTSBot finds a win, counts one visit per expansion and checks its args."""
+    from pingv4.bot.mcts import MCTSBot
+
+    # Red to move with three in a row on the bottom
+    board = ConnectFourBoard()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board = board.make_move(move)
+    bot = MCTSBot(
+        CellState.Red,
+        time_limit_ms=10_000,
+        playouts_per_leaf=16,
+        max_iterations=300,
+        seed=1,
+    )
+    assert bot.get_move(board) == 3
+
+    # The chosen child became the new root; its parent's visits were one
+    # per iteration, so the child's can't exceed them
+    assert 0 < bot._root.visits <= 300
+    assert 0.0 <= bot._root.wins <= bot._root.visits
+
+    for arg in ("playouts_per_leaf", "threads"):
+        try:
+            MCTSBot(CellState.Red, **{arg: 0})
+            assert False, "Expected ValueError"
+        except ValueError as e:
+            assert f"{arg} must be positive" in str(e)
+
+
+def test_cli_solve_finished_game():
+    """Test pingv4 solve reports the winner of a finished game."""
+    import contextlib
+    import io
+
+    from pingv4.cli import main
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        assert main(["solve", "0101010"]) == 0
+    assert out.getvalue().splitlines()[-1] == "winner: red"
+
+
+def test_pondering():
+    """Test pondering is opt-in and stopped before every move."""
+    import threading
+
+    from pingv4.game import GameConfig
+    from pingv4.runner import play_game
+
+    assert GameConfig().enable_pondering is False
+
+    class PonderingBot(LowestColumnBot):
+        def __init__(self, player):
+            super().__init__(player)
+            self.stop = threading.Event()
+            self.ponders = 0
+            self.pondering = False
+
+        def get_move(self, board):
+            assert not self.pondering
+            self.stop.clear()
+            return super().get_move(board)
+
+        def ponder(self, board):
+            self.pondering = True
+            self.ponders += 1
+            self.stop.wait(5)
+            self.pondering = False
+
+        def stop_pondering(self):
+            self.stop.set()
+
+    red, yellow = PonderingBot(CellState.Red), PonderingBot(CellState.Yellow)
+    record = play_game(red, yellow, ponder=True)
+    assert red.ponders > 0 and yellow.ponders > 0
+    assert not red.pondering and not yellow.pondering
+    assert play_game(red, yellow).moves == record.moves
+
+
+def test_telemetry_bot_labels():
+    """Test telemetry keeps same-named bots of different colors apart."""
+    from pingv4.telemetry import Telemetry
+
+    telemetry = Telemetry()
+    board = ConnectFourBoard()
+    for bot in (LowestColumnBot(CellState.Red), LowestColumnBot(CellState.Yellow)):
+        board = board.make_move(telemetry.timed_get_move(bot, board))
+
+    assert telemetry.bots == ["test (red)", "test (yellow)"]
+    assert telemetry.bot_latency("test (red)").count == 1
+    assert telemetry.bot_latency("test (yellow)").count == 1
+
+
+def test_engine_protocol():
+    """Test serve on a scripted session and an EngineBot round trip."""
+    import io
+    import sys
+
+    from pingv4.bot.base import RandomBot
+    from pingv4.engine import EngineBot, serve
+    from pingv4.runner import play_game
+
+    script = ["init yellow", "prepare 100", "newgame", "go 1000 3", "go 1000 33"]
+    script += ["bogus", "quit", "go 1000 3"]
+    out = io.StringIO()
+    serve(LowestColumnBot, io.StringIO("\n".join(script) + "\n"), out)
+    assert out.getvalue().splitlines() == [
+        "id name test",
+        "id author test",
+        "id netid test",
+        "ready",
+        "ready",
+        "bestmove 0",
+        "bestmove 0",
+        "error ValueError: unknown command 'bogus'",
+    ]
+
+    command = [sys.executable, "-m", "pingv4", "engine", "random"]
+    Engine = EngineBot.for_command(command)
+    with Engine(CellState.Red) as engine:
+        assert engine.strategy_name == "RandomBot"
+        record = play_game(engine, RandomBot(CellState.Yellow))
+        assert record.forfeited_by is None and record.moves
+
+
+def test_native_threads():
+    """Test GIL-free native calls running on several threads at once."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    from pingv4 import BoardBatch
+
+    board = ConnectFourBoard().make_move(3)
+
+    def work(seed):
+        # One batch per thread; boards are shared
+        batch = BoardBatch(3)
+        for step in range(60):
+            # Each game plays the first legal column from its own offset
+            mask = batch.legal_mask()
+            offsets = (np.arange(3) + step * 2) % 7
+            shifted = [np.roll(mask[i], -offsets[i]) for i in range(3)]
+            actions = [(offsets[i] + np.argmax(shifted[i])) % 7 for i in range(3)]
+            obs, rewards, dones = batch.step(np.array(actions))
+        return (
+            board.random_playouts(200, seed),
+            board.perft(3),
+            ConnectFourBoard().perft(4),
+            obs.copy(),
+            batch.hashes().copy(),
+        )
+
+    expected = [work(seed) for seed in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(work, range(8)))
+
+    for (playouts, perft, perft_empty, obs, hashes), want in zip(results, expected):
+        assert playouts == want[0] and sum(playouts) == 200
+        assert perft == want[1] == 343
+        assert perft_empty == want[2] == 2401
+        assert np.array_equal(obs, want[3])
+        assert np.array_equal(hashes, want[4])
+
+
+def test_spectator():
+    """Test a spectator worker's events and drawing them headlessly."""
+    import multiprocessing
+    import os
+    import queue
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from pingv4.selfplay import Pairing
+    from pingv4.spectator import Spectator, SpectatorConfig, _play_slots
+
+    pairings = [Pairing(LowestColumnBot, LowestColumnBot)] * 2
+    events = multiprocessing.Queue()
+    _play_slots(list(enumerate(pairings)), events, 0.0, 0.0, 0.0, 1)
+
+    batches = []
+    while sum(event[0] == "end" for batch in batches for event in batch) < 2:
+        batches.append(events.get(timeout=5))
+    slot_events = [e for batch in batches for e in batch if e[1] == 0]
+    assert slot_events[0] == ("start", 0, "test", "test")
+    assert slot_events[-1] == ("end", 0, "red", False)
+    moves = [e[2] for e in slot_events if e[0] == "move"]
+    assert moves[:7] == [0, 0, 0, 0, 0, 0, 1]
+
+    config = SpectatorConfig(window_width=320, window_height=240, animation_frames=0)
+    spectator = Spectator(pairings, config)
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((config.window_width, config.window_height))
+        font = pygame.font.Font(None, 20)
+        spectator._layout()
+        window_events = queue.Queue()
+        for batch in batches:
+            window_events.put(batch)
+        spectator._drain(window_events)
+        for tile in spectator._tiles:
+            spectator._update_tile(tile, font)
+            spectator._draw_tile(screen, tile)
+            assert tile.board.num_moves == len(moves)
+            assert tile.board.winner == CellState.Red
+        assert spectator.games_finished == 2
+    finally:
+        pygame.quit()
+
+
+def test_memoized_bot():
+    """Test memoized moves are cached, fingerprinted and history-independent."""
+    import os
+    import pickle
+    import random
+    import tempfile
+
+    from pingv4.bot.memo import MoveCache, memoize
+    from pingv4.bot.minimax import MinimaxBot
+    from pingv4.endgame import EndgameTable, build_endgame_table
+
+    # A random game whose later moves depend on the transposition table
+    # left by earlier searches unless it is reset
+    rng = random.Random(0)
+    positions = [ConnectFourBoard()]
+    for _ in range(10):
+        board = positions[-1]
+        positions.append(board.make_move(rng.choice(board.get_valid_moves())))
+
+    cache = MoveCache()
+    Bot = memoize(MinimaxBot, cache, max_depth=3)
+    bots = {color: Bot(color) for color in (CellState.Red, CellState.Yellow)}
+    for board in positions:
+        fresh = MinimaxBot(board.current_player, max_depth=3)
+        assert bots[board.current_player].get_move(board) == fresh.get_move(board)
+    assert cache.stats().misses == len(positions)
+    bots[positions[4].current_player].get_move(positions[4])
+    assert cache.stats().hits == 1
+
+    # The class pickles, e.g. for a Pairing, with a copy of the cache
+    Unpickled = pickle.loads(pickle.dumps(Bot))
+    red = Unpickled(CellState.Red)
+    assert Unpickled.__name__ == "MemoizedMinimaxBot" and red.bot.max_depth == 3
+    assert red.cache is not cache and len(red.cache) == len(cache)
+    assert red.get_move(positions[0]) == bots[CellState.Red].get_move(positions[0])
+    assert red.cache.stats().hits == 2
+
+    class CountingBot(LowestColumnBot):
+        batches = []
+        resets = 0
+
+        def get_moves(self, boards):
+            CountingBot.batches.append(len(boards))
+            return super().get_moves(boards)
+
+        def reset_search_state(self):
+            CountingBot.resets += 1
+
+    bot = memoize(CountingBot)(CellState.Red)
+    assert bot.get_moves(positions[::2][:4]) == [0, 0, 0, 0]
+    assert bot.get_moves(positions[::2][:5]) == [0] * 5
+    # Only the new position was forwarded, after one reset per batch
+    assert CountingBot.batches == [4, 1]
+    assert CountingBot.resets == 2
+
+    # Tables are fingerprinted by content: the two seeds give tables with
+    # the same max_empty and size but different positions
+    seeds = [
+        "203154263065544102132635406100112243345560",
+        "203154263065544102132635406100112243345560",
+        "426331152166023136246023243004651044551055",
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"{name}.bin") for name in "abc"]
+        for path, seed in zip(paths, seeds):
+            assert build_endgame_table(path, [seed], max_empty=4, workers=1) == 13
+        tables = [EndgameTable(path) for path in paths]
+        try:
+            prints = [
+                MinimaxBot(CellState.Red, endgame_table=t).config_fingerprint()
+                for t in tables
+            ]
+            assert prints[0] == prints[1] != prints[2]
+            assert tables[0].digest in prints[0]
+        finally:
+            for table in tables:
+                table.close()
+
+
+def test_results_store():
+    """Test a results store's batching, aggregates and round trip."""
+    import io
+    import os
+    import tempfile
+
+    from pingv4.results import ResultsStore, Standing
+    from pingv4.runner import GameRecord
+
+    win = GameRecord([0, 1, 0, 1, 0, 1, 0], CellState.Red, None, [1.0] * 7)
+    forfeit = GameRecord([3], CellState.Yellow, CellState.Red, [2.0])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "results.sqlite")
+        store = ResultsStore(path, batch_size=2, opening_plies=2)
+        store.add("a", "b", win, tournament="t1")
+        assert store.num_games() == 0
+        # The second game fills the batch
+        store.add("b", "a", forfeit, tournament="t1")
+        assert store.num_games() == 2
+        store.add("a", "c", win._replace(move_times_ms=None), tournament="t2")
+        store.flush()
+        assert store.num_games() == 3
+        store.close()
+
+        with ResultsStore(path) as store:
+            assert store.num_games("t1") == 2
+            assert store.standings("t1") == [
+                Standing("a", 2, 2, 0, 0, 0),
+                Standing("b", 2, 0, 0, 2, 1),
+            ]
+            assert [s.bot for s in store.standings()] == ["a", "b", "c"]
+            assert [(h.opponent, h.color, h.wins) for h in store.head_to_head("a")] == [
+                ("b", "red", 1),
+                ("b", "yellow", 1),
+                ("c", "red", 1),
+            ]
+            assert [(o.opening, o.games) for o in store.openings()] == [
+                ("01", 2),
+                ("3", 1),
+            ]
+
+            games = list(store.games(tournament="t1"))
+            assert [(g.red, g.yellow, g.moves) for g in games] == [
+                ("a", "b", "0101010"),
+                ("b", "a", "3"),
+            ]
+            assert games[0].winner == CellState.Red and games[0].forfeited_by is None
+            assert games[0].move_times_ms == [1.0] * 7
+            assert games[1].forfeited_by == CellState.Red
+            assert next(store.games(tournament="t2")).move_times_ms is None
+
+            pgn = io.StringIO()
+            assert store.export_pgn(pgn, "t1") == 2
+            assert '[Result "0-1"]\n[Moves "3"]\n[Termination "forfeit"]' in (
+                pgn.getvalue()
+            )
+
+
+def test_pns_bot():
+    """Test PNSBot's proofs against exhaustive solving."""
+    from pingv4.bot.pns import PNSBot
+    from pingv4.endgame import Outcome, solve_position
+    from pingv4.notation import board_from_moves
+
+    seed = "426331152166023136246023243004651044551055"
+    for ply in range(27, 42):
+        board = board_from_moves(seed[:ply])
+        bot = PNSBot(board.current_player)
+        wins = solve_position(board).outcome == Outcome.WIN
+        assert bot.prove(board) == wins
+        if wins:
+            # The proven move keeps the win
+            child = board.make_move(bot.get_move(board))
+            assert child.is_victory or solve_position(child).outcome == Outcome.LOSS
+
+    # Out of budget, and too many empty cells to try a proof at all
+    board = board_from_moves(seed[:24])
+    assert PNSBot(board.current_player, node_budget=10).prove(board) is None
+    bot = PNSBot(board.current_player, max_empty=10, fallback_depth=2)
+    assert bot.get_move(board) in board.get_valid_moves()
+    assert bot.proved is None
+
+
+def test_explorer_index():
+    """Test explorer counts, the ply limit and building through spilled runs."""
+    import os
+    import tempfile
+
+    from pingv4.explorer import ExplorerIndex, build_explorer_index
+    from pingv4.notation import board_from_moves
+    from pingv4.runner import GameRecord
+
+    # A Red win, a game cut short (scored as a draw) and a Yellow forfeit win
+    games = ["0101010", "3", GameRecord([3, 3], CellState.Yellow, CellState.Red)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "explorer.bin")
+        spilled_path = os.path.join(tmp_dir, "spilled.bin")
+        count = build_explorer_index(path, games, max_plies=4)
+        build_explorer_index(spilled_path, games, max_plies=4, max_entries_in_memory=2)
+
+        with ExplorerIndex(path) as index, ExplorerIndex(spilled_path) as spilled:
+            assert len(index) == count == 7
+            assert index.num_games == 3 and index.max_plies == 4
+            assert spilled.digest == index.digest
+
+            start = index.probe(ConnectFourBoard())
+            assert (start.red_wins, start.yellow_wins, start.draws) == (1, 1, 1)
+            assert start.move_counts == (1, 0, 0, 2, 0, 0, 0)
+            assert start.top_moves() == [(3, 2), (0, 1)]
+
+            center = index.probe(board_from_moves("3"))
+            assert center.games == 2 and center.top_moves() == [(3, 1)]
+            assert index.probe(board_from_moves("0101")).red_wins == 1
+            assert index.probe(board_from_moves("01010")) is None
+            assert index.probe(board_from_moves("6")) is None
+
+
+def test_tuning():
+    """Test tuning on self-play data lowers the loss and weights round-trip."""
+    import dataclasses
+    import math
+    import os
+    import tempfile
+
+    from pingv4.bot.base import RandomBot
+    from pingv4.bot.minimax import EvalWeights
+    from pingv4.selfplay import Pairing, generate
+    from pingv4.tuning import load_positions, tune
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Every move comes from generate's seeded RNG, so the data is fixed
+        pairing = Pairing(RandomBot, RandomBot)
+        stats = generate(
+            tmp_dir, [pairing], num_games=200, workers=1, random_plies=42, epsilon=1.0
+        )
+        hashes, results = load_positions(stats.shards)
+        assert len(hashes) == len(results) == stats.positions
+        assert set(results.tolist()) <= {0.0, 0.5, 1.0}
+
+        tuned = tune(hashes, results, epochs=200)
+        assert tuned.loss_after <= tuned.loss_before
+        assert tuned.k > 0 and tuned.validation_positions > 0
+        weights = dataclasses.astuple(tuned.weights)
+        assert all(math.isfinite(value) for value in weights)
+
+        path = os.path.join(tmp_dir, "weights.json")
+        tuned.weights.save(path)
+        assert EvalWeights.load(path) == tuned.weights
+
+
+def test_play_games():
+    """Test lockstep games match sequential ones, with forfeits and fallbacks."""
+    import random
+
+    from pingv4.notation import board_from_moves
+    from pingv4.runner import play_game, play_games
+    from pingv4.telemetry import Telemetry
+
+    class HashBot(LowestColumnBot):
+        """Stateless but varied: picks a valid move from the board's hash."""
+
+        batches = []
+
+        def get_move(self, board):
+            valid_moves = board.get_valid_moves()
+            return valid_moves[board.hash * 7919 % 10007 % len(valid_moves)]
+
+        def get_moves(self, boards):
+            HashBot.batches.append(len(boards))
+            return super().get_moves(boards)
+
+    class ShortBot(LowestColumnBot):
+        def get_moves(self, boards):
+            return super().get_moves(boards)[:-1]
+
+    class OffBoardBot(LowestColumnBot):
+        def get_move(self, board):
+            return 9
+
+    starts = [ConnectFourBoard(), board_from_moves("3"), board_from_moves("0101010")]
+    starts += [board_from_moves(str(col)) for col in range(7)]
+    red, yellow = HashBot(CellState.Red), HashBot(CellState.Yellow)
+    records = play_games(red, yellow, starts, max_batch_size=3)
+    assert max(HashBot.batches) == 3
+    for start, record in zip(starts, records):
+        expected = play_game(red, yellow, start)
+        assert (record.moves, record.winner) == (expected.moves, expected.winner)
+        assert record.forfeited_by is None
+        assert len(record.move_times_ms) == len(record.moves)
+    assert records[2].moves == [] and records[2].winner == CellState.Red
+
+    # A wrong number of moves forfeits every game in the batch
+    records = play_games(ShortBot(CellState.Red), yellow, 4)
+    assert all(r.forfeited_by == CellState.Red for r in records)
+    assert all(r.winner == CellState.Yellow and r.moves == [] for r in records)
+
+    # Invalid columns are replaced with valid moves, drawn from rng if given
+    off_board = OffBoardBot(CellState.Red)
+    records = play_games(off_board, yellow, 3, rng=random.Random(5))
+    for record in records:
+        board = ConnectFourBoard()
+        for col in record.moves:
+            board = board.make_move(col)
+        assert not board.is_in_progress and record.forfeited_by is None
+    again = play_games(off_board, yellow, 3, rng=random.Random(5))
+    assert [r.moves for r in again] == [r.moves for r in records]
+
+    # Batched latency is labelled per color like single moves
+    telemetry = Telemetry()
+    play_games(red, yellow, 2, telemetry=telemetry)
+    assert telemetry.bots == ["test (red)", "test (yellow)"]
+
+
 def run_all_tests():
     """Run all tests and report results."""
     tests = [
@@ -201,9 +850,29 @@ def run_all_tests():
         test_column_out_of_bounds_error,
         test_hash_changes_with_moves,
         test_cell_state_enum,
+        test_cell_state_hashable,
+        test_bot_roster,
         test_getitem_bounds,
         test_column_heights_tracking,
         test_game_not_in_progress_error,
+        test_random_playouts,
+        test_bulk_accessors,
+        test_notation_round_trip,
+        test_endgame_table,
+        test_selfplay,
+        test_mcts_bot,
+        test_cli_solve_finished_game,
+        test_pondering,
+        test_telemetry_bot_labels,
+        test_engine_protocol,
+        test_native_threads,
+        test_spectator,
+        test_memoized_bot,
+        test_results_store,
+        test_pns_bot,
+        test_explorer_index,
+        test_tuning,
+        test_play_games,
         # test_draw_game_error,
     ]
 